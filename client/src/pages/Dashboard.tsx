@@ -10,30 +10,26 @@ import {
   Button,
 } from '@mui/material';
 import { Layout } from '../components/layout/Layout';
-import { CourseService, Course, CourseProgress } from '../services/course';
+import { CourseService, Course, CourseProgressOverview } from '../services/course';
 
 export const Dashboard: React.FC = () => {
   const [courses, setCourses] = useState<Course[]>([]);
-  const [courseProgress, setCourseProgress] = useState<Record<number, CourseProgress>>({});
+  const [courseProgress, setCourseProgress] = useState<Record<number, CourseProgressOverview>>({});
   const [isLoading, setIsLoading] = useState(true);
   const [error, setError] = useState<string>('');
 
   useEffect(() => {
     const fetchCourses = async () => {
       try {
-        const fetchedCourses = await CourseService.getCourses();
+        const [fetchedCourses, progress] = await Promise.all([
+          CourseService.getCourses(),
+          CourseService.getMyProgress(),
+        ]);
         setCourses(fetchedCourses);
 
-        // Fetch progress for each course
-        const progressPromises = fetchedCourses.map(course =>
-          CourseService.getCourseProgress(course.id)
-            .then(progress => ({ [course.id]: progress }))
-            .catch(() => ({ [course.id]: null }))
-        );
-
-        const progressResults = await Promise.all(progressPromises);
-        const progressMap = progressResults.reduce(
-          (acc, curr) => ({ ...acc, ...curr }),
+        // One request returns progress for every started course
+        const progressMap = progress.reduce<Record<number, CourseProgressOverview>>(
+          (acc, item) => ({ ...acc, [item.course_id]: item }),
           {}
         );
 
@@ -50,13 +46,7 @@ export const Dashboard: React.FC = () => {
 
   const calculateProgress = (course: Course): number => {
     const progress = courseProgress[course.id];
-    if (!progress) return 0;
-
-    const totalLessons = course.modules.reduce(
-      (total, module) => total + module.lessons.length,
-      0
-    );
-    return (progress.completed_lessons.length / totalLessons) * 100;
+    return progress ? progress.percent : 0;
   };
 
   return (
@@ -24,9 +24,10 @@ import {
   CheckCircle as CheckCircleIcon,
 } from '@mui/icons-material';
 import { Layout } from '../components/layout/Layout';
-import CourseService, { Lesson, Course } from '../services/course';
+import CourseService, { LessonContent, Course } from '../services/course';
 import { LessonViewSkeleton } from '../components/skeletons/LessonViewSkeleton';
 import { AiTutor } from '../components/AiTutor/AiTutor';
+import '../styles/codeHighlight.css';
 
 export const LessonView: React.FC = () => {
   const { courseId, lessonId } = useParams<{ courseId: string; lessonId: string }>();
@@ -34,7 +35,7 @@ export const LessonView: React.FC = () => {
   const theme = useTheme();
 
   const [course, setCourse] = useState<Course | null>(null);
-  const [lesson, setLesson] = useState<Lesson | null>(null);
+  const [lesson, setLesson] = useState<LessonContent | null>(null);
   const [isLoading, setIsLoading] = useState(true);
   const [error, setError] = useState<string>('');
   const [fontSize, setFontSize] = useState(16);
@@ -117,7 +118,8 @@ export const LessonView: React.FC = () => {
       speechSynthesis.cancel();
       setIsSpeaking(false);
     } else {
-      const utterance = new SpeechSynthesisUtterance(lesson.content);
+      const text = new DOMParser().parseFromString(lesson.content_html, 'text/html').body.textContent ?? '';
+      const utterance = new SpeechSynthesisUtterance(text);
       utterance.onend = () => setIsSpeaking(false);
       speechSynthesis.speak(utterance);
       setIsSpeaking(true);
@@ -237,10 +239,11 @@ export const LessonView: React.FC = () => {
               '& p': { mb: 2 },
               '& h2': { mt: 4, mb: 2 },
               '& ul, & ol': { mb: 2, pl: 3 },
+              '& pre': { p: 2, mb: 2, borderRadius: 1, overflowX: 'auto' },
             }}
-          >
-            {lesson.content}
-          </Typography>
+            // Sanitized on the server when the lesson is saved
+            dangerouslySetInnerHTML={{ __html: lesson.content_html }}
+          />
 
           {lesson.video_url && (
             <Box sx={{ mt: 4 }}>
@@ -39,6 +39,13 @@ export interface UserPreferences {
   disable_autoplay: boolean;
 }
 
+/** Flags that pick the lesson variant served (simplified, chunked, large code) */
+export interface AccessibilitySettings {
+  simplified_language: boolean;
+  chunked_steps: boolean;
+  large_code_font: boolean;
+}
+
 export interface AuthTokens {
   access_token: string;
   token_type: string;
@@ -120,6 +127,30 @@ export const AuthService = {
     }
   },
   
+  /**
+   * Get accessibility settings
+   */
+  async getAccessibilitySettings(): Promise<AccessibilitySettings> {
+    try {
+      const response = await apiClient.get<AccessibilitySettings>('/preferences/me/accessibility');
+      return response.data;
+    } catch (error) {
+      throw new Error(handleApiError(error));
+    }
+  },
+  
+  /**
+   * Update accessibility settings
+   */
+  async updateAccessibilitySettings(settings: AccessibilitySettings): Promise<AccessibilitySettings> {
+    try {
+      const response = await apiClient.put<AccessibilitySettings>('/preferences/me/accessibility', settings);
+      return response.data;
+    } catch (error) {
+      throw new Error(handleApiError(error));
+    }
+  },
+  
   /**
    * Logout user
    */
@@ -16,6 +16,21 @@ export interface Lesson {
   module_id: number;
 }
 
+/**
+ * A lesson as shown to learners: the content arrives as sanitized,
+ * syntax-highlighted HTML rendered on the server
+ */
+export interface LessonContent {
+  id: number;
+  title: string;
+  video_url?: string;
+  order: number;
+  module_id: number;
+  content_html: string;
+  // Accessibility variant picked from the learner's settings, if any
+  variant?: string | null;
+}
+
 export interface Module {
   id: number;
   title: string;
@@ -46,6 +61,53 @@ export interface CourseProgress {
   last_accessed: string;
 }
 
+export interface CourseProgressOverview {
+  id: number;
+  course_id: number;
+  course_title: string;
+  started_at: string;
+  last_accessed: string;
+  completed_at: string | null;
+  completed_lessons: number;
+  total_lessons: number;
+  percent: number;
+  last_lesson_id: number | null;
+  last_lesson_title: string | null;
+  last_lesson_completed_at: string | null;
+}
+
+export interface LessonCompletionResult {
+  lesson_id: number;
+  status: 'completed' | 'already_completed' | 'lesson_not_found' | 'course_not_started';
+  completion_id: number | null;
+  completed_at: string | null;
+}
+
+export interface CourseRecommendation {
+  course_id: number;
+  title: string;
+  rank: number;
+  score: number;
+  generated_at: string;
+}
+
+export interface UnlockedCourses {
+  completed_course_ids: number[];
+  /** Not yet completed, with every prerequisite completed; prerequisites first */
+  unlocked_course_ids: number[];
+}
+
+export interface SearchHit {
+  kind: 'course' | 'module' | 'lesson';
+  id: number;
+  course_id: number | null;
+  course_title: string | null;
+  title: string;
+  /** HTML-escaped text with matches wrapped in <mark> tags */
+  snippet: string;
+  rank: number;
+}
+
 export interface CourseFilter {
   category_id?: number;
   skip?: number;
@@ -87,6 +149,16 @@ class CourseService {
     return response.data;
   }
 
+  /**
+   * Search course, module and lesson text, best match first
+   */
+  async search(q: string, kind?: SearchHit['kind'], limit: number = 20): Promise<SearchHit[]> {
+    const response = await axios.get(`${this.baseUrl}/courses/search`, {
+      params: { q, kind, limit },
+    });
+    return response.data;
+  }
+
   /**
    * Get a single course by ID
    */
@@ -109,6 +181,18 @@ class CourseService {
     await axios.post(`${this.baseUrl}/courses/lessons/${lessonId}/complete`);
   }
 
+  /**
+   * Complete several lessons in one request, e.g. after working offline
+   */
+  async completeLessons(
+    completions: { lesson_id: number; completed_at?: string }[]
+  ): Promise<LessonCompletionResult[]> {
+    const response = await axios.post(`${this.baseUrl}/courses/lessons/complete`, {
+      completions,
+    });
+    return response.data.results;
+  }
+
   /**
    * Get course progress for current user
    */
@@ -117,7 +201,33 @@ class CourseService {
     return response.data;
   }
 
-  async getLesson(lessonId: number): Promise<Lesson> {
+  /**
+   * Get progress on every course the current user has started
+   */
+  async getMyProgress(): Promise<CourseProgressOverview[]> {
+    const response = await axios.get(`${this.baseUrl}/courses/progress/me`);
+    return response.data;
+  }
+
+  /**
+   * Get suggested next courses for the current user, best first
+   */
+  async getRecommendedCourses(limit: number = 10): Promise<CourseRecommendation[]> {
+    const response = await axios.get(`${this.baseUrl}/courses/recommended/me`, {
+      params: { limit },
+    });
+    return response.data;
+  }
+
+  /**
+   * Get the courses the current user has completed and can take next
+   */
+  async getUnlockedCourses(): Promise<UnlockedCourses> {
+    const response = await axios.get(`${this.baseUrl}/courses/unlocked/me`);
+    return response.data;
+  }
+
+  async getLesson(lessonId: number): Promise<LessonContent> {
     const response = await axios.get(`${this.baseUrl}/courses/lessons/${lessonId}`);
     return response.data;
   }
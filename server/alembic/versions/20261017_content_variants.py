@@ -0,0 +1,41 @@
+"""Accessibility content variants
+
+Revision ID: 20261017_content_variants
+Revises: 20261017_lesson_content_html
+Create Date: 2026-10-17 23:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '20261017_content_variants'
+down_revision = '20261017_lesson_content_html'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'content_variants',
+        sa.Column('lesson_id', sa.Integer(), nullable=False),
+        sa.Column('variant_key', sa.String(length=64), nullable=False),
+        sa.Column('source_hash', sa.String(length=64), nullable=False),
+        sa.Column('version', sa.String(length=16), nullable=False),
+        sa.Column('content_html', sa.Text(), nullable=False),
+        sa.Column('generated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['lesson_id'], ['lessons.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('lesson_id', 'variant_key')
+    )
+
+    # The initial revision predates UserPreference.accessibility_settings,
+    # which picks the variant a learner is served
+    columns = {column['name'] for column in sa.inspect(op.get_bind()).get_columns('user_preferences')}
+    if 'accessibility_settings' not in columns:
+        op.add_column('user_preferences', sa.Column('accessibility_settings', sa.JSON(), nullable=True))
+
+
+def downgrade():
+    # accessibility_settings is left in place: databases created from the
+    # models had it before this revision
+    op.drop_table('content_variants')
@@ -0,0 +1,57 @@
+"""Conversation context: recent-message index, token counts and rolling summaries
+
+Revision ID: 20261017_conversation_context
+Revises: 20261017_lookup_indexes
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '20261017_conversation_context'
+down_revision = '20261017_lookup_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # (user_id, lesson_id) is a prefix of the new index, so it replaces it
+    op.drop_index(op.f('ix_messages_user_id_lesson_id'), table_name='messages')
+    op.create_index(
+        op.f('ix_messages_user_id_lesson_id_created_at'),
+        'messages',
+        ['user_id', 'lesson_id', 'created_at'],
+        unique=False
+    )
+    with op.batch_alter_table('messages') as batch_op:
+        batch_op.add_column(sa.Column('token_count', sa.Integer(), nullable=True))
+
+    op.create_table(
+        'conversation_summaries',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('conversation_id', sa.String(), nullable=False),
+        sa.Column('summary', sa.Text(), nullable=False),
+        sa.Column('token_count', sa.Integer(), nullable=False),
+        sa.Column('summarized_through_id', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('user_id', 'conversation_id', name='uq_conversation_summaries_user_id_conversation_id')
+    )
+    op.create_index(op.f('ix_conversation_summaries_id'), 'conversation_summaries', ['id'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_conversation_summaries_id'), table_name='conversation_summaries')
+    op.drop_table('conversation_summaries')
+    with op.batch_alter_table('messages') as batch_op:
+        batch_op.drop_column('token_count')
+    op.drop_index(op.f('ix_messages_user_id_lesson_id_created_at'), table_name='messages')
+    op.create_index(
+        op.f('ix_messages_user_id_lesson_id'),
+        'messages',
+        ['user_id', 'lesson_id'],
+        unique=False
+    )
@@ -0,0 +1,32 @@
+"""Composite indexes for keyset pagination of courses
+
+Revision ID: 20261017_keyset
+Revises: 20230601_initial
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '20261017_keyset'
+down_revision = '20230601_initial'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # list_courses pages on (created_at, id)
+    op.create_index(op.f('ix_courses_created_at_id'), 'courses', ['created_at', 'id'], unique=False)
+    # Category filter on list_courses walks course_category by category_id
+    op.create_index(
+        op.f('ix_course_category_category_id_course_id'),
+        'course_category',
+        ['category_id', 'course_id'],
+        unique=False
+    )
+
+
+def downgrade():
+    op.drop_index(op.f('ix_course_category_category_id_course_id'), table_name='course_category')
+    op.drop_index(op.f('ix_courses_created_at_id'), table_name='courses')
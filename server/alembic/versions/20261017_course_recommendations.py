@@ -0,0 +1,40 @@
+"""Precomputed course recommendations
+
+Revision ID: 20261017_course_recommendations
+Revises: 20261017_search
+Create Date: 2026-10-17 20:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '20261017_course_recommendations'
+down_revision = '20261017_search'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'course_recommendations',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('course_id', sa.Integer(), nullable=False),
+        sa.Column('rank', sa.Integer(), nullable=False),
+        sa.Column('score', sa.Float(), nullable=False),
+        sa.Column('generated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['course_id'], ['courses.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id', 'course_id')
+    )
+    op.create_index(
+        'ix_course_recommendations_user_id_rank',
+        'course_recommendations',
+        ['user_id', 'rank'],
+        unique=True
+    )
+
+
+def downgrade():
+    op.drop_index('ix_course_recommendations_user_id_rank', table_name='course_recommendations')
+    op.drop_table('course_recommendations')
@@ -0,0 +1,29 @@
+"""Pre-rendered lesson HTML
+
+Revision ID: 20261017_lesson_content_html
+Revises: 20261017_course_recommendations
+Create Date: 2026-10-17 21:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '20261017_lesson_content_html'
+down_revision = '20261017_course_recommendations'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Existing lessons are rendered on first view, or up front with
+    # scripts/render_lessons.py
+    op.add_column('lessons', sa.Column('content_html', sa.Text(), nullable=True))
+    op.add_column('lessons', sa.Column('content_hash', sa.String(length=64), nullable=True))
+
+
+def downgrade():
+    # Not a batch operation: on SQLite that would rebuild the lessons table,
+    # which the full-text search triggers on it do not survive
+    op.drop_column('lessons', 'content_hash')
+    op.drop_column('lessons', 'content_html')
@@ -0,0 +1,36 @@
+"""Order conversation messages by id
+
+Revision ID: 20261017_message_id_order
+Revises: 20261017_content_variants
+Create Date: 2026-10-17 23:30:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '20261017_message_id_order'
+down_revision = '20261017_content_variants'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # The rolling summary's watermark is a message id, so conversations are
+    # read in id order; this index serves that order without a sort
+    op.drop_index(op.f('ix_messages_user_id_lesson_id_created_at'), table_name='messages')
+    op.create_index(
+        op.f('ix_messages_user_id_lesson_id_id'),
+        'messages',
+        ['user_id', 'lesson_id', 'id'],
+        unique=False
+    )
+
+
+def downgrade():
+    op.drop_index(op.f('ix_messages_user_id_lesson_id_id'), table_name='messages')
+    op.create_index(
+        op.f('ix_messages_user_id_lesson_id_created_at'),
+        'messages',
+        ['user_id', 'lesson_id', 'created_at'],
+        unique=False
+    )
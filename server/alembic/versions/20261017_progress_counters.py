@@ -0,0 +1,58 @@
+"""Maintained lesson counters and percentage on course progress
+
+Revision ID: 20261017_progress_counters
+Revises: 20261017_tutor_logs
+Create Date: 2026-10-17 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '20261017_progress_counters'
+down_revision = '20261017_tutor_logs'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('course_progresses') as batch_op:
+        batch_op.add_column(sa.Column('completed_lessons', sa.Integer(), nullable=False, server_default='0'))
+        batch_op.add_column(sa.Column('total_lessons', sa.Integer(), nullable=False, server_default='0'))
+        batch_op.add_column(sa.Column('percent', sa.Float(), nullable=False, server_default='0'))
+    op.create_index(
+        op.f('ix_lesson_completions_course_progress_id'),
+        'lesson_completions',
+        ['course_progress_id'],
+        unique=False
+    )
+
+    # Fill the counters for existing rows; scripts/backfill_course_progress.py
+    # does the same later, e.g. after lessons are added to a course
+    op.execute("""
+        UPDATE course_progresses SET
+            completed_lessons = (
+                SELECT count(*) FROM lesson_completions
+                WHERE lesson_completions.course_progress_id = course_progresses.id
+            ),
+            total_lessons = (
+                SELECT count(lessons.id) FROM lessons
+                JOIN modules ON lessons.module_id = modules.id
+                WHERE modules.course_id = course_progresses.course_id
+            )
+    """)
+    op.execute("""
+        UPDATE course_progresses SET
+            percent = CASE WHEN total_lessons > 0
+                THEN completed_lessons * 100.0 / total_lessons ELSE 0 END,
+            completed_at = CASE WHEN total_lessons > 0 AND completed_lessons >= total_lessons
+                THEN COALESCE(completed_at, CURRENT_TIMESTAMP) ELSE completed_at END
+    """)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_lesson_completions_course_progress_id'), table_name='lesson_completions')
+    with op.batch_alter_table('course_progresses') as batch_op:
+        batch_op.drop_column('percent')
+        batch_op.drop_column('total_lessons')
+        batch_op.drop_column('completed_lessons')
@@ -0,0 +1,78 @@
+"""Lookup and uniqueness indexes for progress, completions and messages
+
+Revision ID: 20261017_lookup_indexes
+Revises: 20261017_keyset
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '20261017_lookup_indexes'
+down_revision = '20261017_keyset'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Collapse duplicate progress rows onto the oldest one before making the
+    # pairs unique, re-pointing any completions that referenced a duplicate
+    op.execute("""
+        UPDATE lesson_completions SET course_progress_id = (
+            SELECT MIN(keep.id)
+            FROM course_progresses keep
+            JOIN course_progresses dup
+              ON keep.user_id = dup.user_id AND keep.course_id = dup.course_id
+            WHERE dup.id = lesson_completions.course_progress_id
+        )
+        WHERE course_progress_id IS NOT NULL
+    """)
+    op.execute("""
+        DELETE FROM course_progresses WHERE id NOT IN (
+            SELECT MIN(id) FROM course_progresses GROUP BY user_id, course_id
+        )
+    """)
+    op.execute("""
+        DELETE FROM lesson_completions WHERE id NOT IN (
+            SELECT MIN(id) FROM lesson_completions GROUP BY user_id, lesson_id
+        )
+    """)
+
+    op.create_index(
+        op.f('ix_course_progresses_user_id_course_id'),
+        'course_progresses',
+        ['user_id', 'course_id'],
+        unique=True
+    )
+    op.create_index(
+        op.f('ix_lesson_completions_user_id_lesson_id'),
+        'lesson_completions',
+        ['user_id', 'lesson_id'],
+        unique=True
+    )
+    op.create_index(op.f('ix_modules_course_id'), 'modules', ['course_id'], unique=False)
+    op.create_index(op.f('ix_lessons_module_id'), 'lessons', ['module_id'], unique=False)
+
+    # The initial revision predates Message.lesson_id and Message.role
+    columns = {column['name'] for column in sa.inspect(op.get_bind()).get_columns('messages')}
+    with op.batch_alter_table('messages') as batch_op:
+        if 'lesson_id' not in columns:
+            batch_op.add_column(sa.Column('lesson_id', sa.Integer(), nullable=True))
+            batch_op.create_foreign_key('fk_messages_lesson_id_lessons', 'lessons', ['lesson_id'], ['id'])
+        if 'role' not in columns:
+            batch_op.add_column(sa.Column('role', sa.String(), nullable=False, server_default='user'))
+    op.create_index(
+        op.f('ix_messages_user_id_lesson_id'),
+        'messages',
+        ['user_id', 'lesson_id'],
+        unique=False
+    )
+
+
+def downgrade():
+    op.drop_index(op.f('ix_messages_user_id_lesson_id'), table_name='messages')
+    op.drop_index(op.f('ix_lessons_module_id'), table_name='lessons')
+    op.drop_index(op.f('ix_modules_course_id'), table_name='modules')
+    op.drop_index(op.f('ix_lesson_completions_user_id_lesson_id'), table_name='lesson_completions')
+    op.drop_index(op.f('ix_course_progresses_user_id_course_id'), table_name='course_progresses')
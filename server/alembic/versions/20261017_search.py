@@ -0,0 +1,104 @@
+"""Full-text search over courses, modules and lessons
+
+Revision ID: 20261017_search
+Revises: 20261017_progress_counters
+Create Date: 2026-10-17 19:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '20261017_search'
+down_revision = '20261017_progress_counters'
+branch_labels = None
+depends_on = None
+
+# The tsvector expression and FTS5 mirror below are a frozen copy of
+# app/db/search.py as of this revision, on purpose: a migration must keep
+# doing what it did when it shipped, so later changes there need a revision
+# of their own. tests/test_search.py checks that a database migrated to head
+# and one built from the models index the same text.
+
+# (table, title column, body column, kind, kind code, course id expression)
+SEARCHABLE = [
+    ('courses', 'title', 'description', 'course', 1, 'new.id'),
+    ('modules', 'title', 'description', 'module', 2, 'new.course_id'),
+    ('lessons', 'title', 'content', 'lesson', 3, '(SELECT course_id FROM modules WHERE id = new.module_id)'),
+]
+
+
+def weighted_tsvector(title_column, body_column):
+    return (
+        f"setweight(to_tsvector('english', coalesce({title_column}, '')), 'A') || "
+        f"setweight(to_tsvector('english', coalesce({body_column}, '')), 'B')"
+    )
+
+
+def upgrade_postgresql():
+    for table, title, body, _, _, _ in SEARCHABLE:
+        op.add_column(table, sa.Column(
+            'search_vector',
+            postgresql.TSVECTOR(),
+            sa.Computed(weighted_tsvector(title, body), persisted=True),
+        ))
+        op.create_index(
+            f'ix_{table}_search_vector', table, ['search_vector'], postgresql_using='gin'
+        )
+
+
+def upgrade_sqlite():
+    # SQLite has no tsvector: mirror the text into an FTS5 table kept in sync
+    # by triggers, keyed by id * 4 + kind code
+    op.execute("""
+        CREATE VIRTUAL TABLE search_index USING fts5(
+            title, body, kind UNINDEXED, entity_id UNINDEXED, course_id UNINDEXED,
+            tokenize = 'porter unicode61'
+        )
+    """)
+    for table, title, body, kind, code, course_id in SEARCHABLE:
+        insert = f"""
+            INSERT INTO search_index (rowid, title, body, kind, entity_id, course_id)
+            VALUES (new.id * 4 + {code}, new.{title}, coalesce(new.{body}, ''), '{kind}', new.id, {course_id});
+        """
+        moved = ', module_id' if table == 'lessons' else ', course_id' if table == 'modules' else ''
+        cascade = """
+            UPDATE search_index SET course_id = new.course_id
+            WHERE new.course_id IS NOT old.course_id
+              AND rowid IN (SELECT id * 4 + 3 FROM lessons WHERE module_id = new.id);
+        """ if table == 'modules' else ''
+        op.execute(f"CREATE TRIGGER {table}_search_insert AFTER INSERT ON {table} BEGIN {insert} END")
+        op.execute(
+            f"CREATE TRIGGER {table}_search_update AFTER UPDATE OF {title}, {body}{moved} ON {table} BEGIN "
+            f"DELETE FROM search_index WHERE rowid = old.id * 4 + {code}; {insert} {cascade} END"
+        )
+        op.execute(
+            f"CREATE TRIGGER {table}_search_delete AFTER DELETE ON {table} BEGIN "
+            f"DELETE FROM search_index WHERE rowid = old.id * 4 + {code}; END"
+        )
+        op.execute(f"""
+            INSERT INTO search_index (rowid, title, body, kind, entity_id, course_id)
+            SELECT id * 4 + {code}, {title}, coalesce({body}, ''), '{kind}', id,
+                   {course_id.replace('new.', f'{table}.')}
+            FROM {table}
+        """)
+
+
+def upgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        upgrade_postgresql()
+    elif op.get_bind().dialect.name == 'sqlite':
+        upgrade_sqlite()
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        for table, *_ in reversed(SEARCHABLE):
+            op.drop_index(f'ix_{table}_search_vector', table_name=table)
+            op.drop_column(table, 'search_vector')
+    elif op.get_bind().dialect.name == 'sqlite':
+        for table, *_ in reversed(SEARCHABLE):
+            for action in ('delete', 'update', 'insert'):
+                op.execute(f"DROP TRIGGER IF EXISTS {table}_search_{action}")
+        op.execute("DROP TABLE IF EXISTS search_index")
@@ -0,0 +1,42 @@
+"""Tutor analytics log
+
+Revision ID: 20261017_tutor_logs
+Revises: 20261017_conversation_context
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '20261017_tutor_logs'
+down_revision = '20261017_conversation_context'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'tutor_logs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=True),
+        sa.Column('session_id', sa.String(), nullable=False),
+        sa.Column('kind', sa.String(), nullable=False),
+        sa.Column('context', sa.JSON(), nullable=True),
+        sa.Column('user_message', sa.Text(), nullable=False),
+        sa.Column('ai_response', sa.Text(), nullable=False),
+        sa.Column('feedback_rating', sa.Integer(), nullable=True),
+        sa.Column('feedback_comment', sa.Text(), nullable=True),
+        sa.Column('latency_ms', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_tutor_logs_id'), 'tutor_logs', ['id'], unique=False)
+    op.create_index(op.f('ix_tutor_logs_user_id'), 'tutor_logs', ['user_id'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_tutor_logs_user_id'), table_name='tutor_logs')
+    op.drop_index(op.f('ix_tutor_logs_id'), table_name='tutor_logs')
+    op.drop_table('tutor_logs')
@@ -1,18 +1,25 @@
-from typing import Generator, Annotated
+from typing import AsyncGenerator, Generator, Annotated, Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import jwt, JWTError
+from jose import JWTError
 from pydantic import ValidationError
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core import security
 from app.core.config import settings
-from app.db.session import SessionLocal
+from app.core.user_cache import user_cache
+from app.db.session import AsyncSessionLocal, SessionLocal
 from app.models import User
 from app.schemas.auth import TokenPayload
 
 reusable_oauth2 = OAuth2PasswordBearer(
     tokenUrl=f"{settings.API_V1_STR}/auth/login"
 )
+# For endpoints that anonymous visitors may call too
+optional_oauth2 = OAuth2PasswordBearer(
+    tokenUrl=f"{settings.API_V1_STR}/auth/login", auto_error=False
+)
 
 def get_db() -> Generator:
     try:
@@ -21,27 +28,44 @@ def get_db() -> Generator:
     finally:
         db.close()
 
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    async with AsyncSessionLocal() as db:
+        yield db
+
 async def get_current_user(
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_async_db)],
     token: Annotated[str, Depends(reusable_oauth2)]
 ) -> User:
     try:
-        payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=["HS256"]
-        )
+        payload = security.decode_access_token(token)
         token_data = TokenPayload(**payload)
     except (JWTError, ValidationError):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Could not validate credentials",
         )
-    user = db.query(User).filter(User.id == int(token_data.sub)).first()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
+    user_id = int(token_data.sub)
+    user = await user_cache.get(user_id)
+    if user is None:
+        user = await db.scalar(select(User).where(User.id == user_id))
+        if not user:
+            raise HTTPException(status_code=404, detail="User not found")
+        await user_cache.set(user)
     if not user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
     return user
 
+async def get_optional_user(
+    db: Annotated[AsyncSession, Depends(get_async_db)],
+    token: Annotated[Optional[str], Depends(optional_oauth2)]
+) -> Optional[User]:
+    """
+    The current user, or None without a token; a bad token is still rejected
+    """
+    if token is None:
+        return None
+    return await get_current_user(db, token)
+
 async def get_current_active_superuser(
     current_user: Annotated[User, Depends(get_current_user)],
 ) -> User:
@@ -1,8 +1,10 @@
 from fastapi import APIRouter
 
-from app.api.v1.endpoints import auth, courses, sample_content
+from app.api.v1.endpoints import auth, courses, preferences, sample_content, tutor
 
 api_router = APIRouter()
 api_router.include_router(auth.router, prefix="/auth", tags=["auth"])
 api_router.include_router(courses.router, prefix="/courses", tags=["courses"])
-api_router.include_router(sample_content.router, prefix="/samples", tags=["samples"]) 
\ No newline at end of file
+api_router.include_router(preferences.router, prefix="/preferences", tags=["preferences"])
+api_router.include_router(sample_content.router, prefix="/samples", tags=["samples"])
+api_router.include_router(tutor.router, prefix="/tutor", tags=["tutor"])
@@ -2,26 +2,41 @@ from datetime import timedelta
 from typing import Annotated
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api import deps
 from app.core import security
 from app.core.config import settings
+from app.core.hashing import PasswordHashPoolFull
 from app.models import User
 from app.schemas.auth import Token, User as UserSchema, UserCreate
 
 router = APIRouter()
 
+def password_hash_pool_full() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many sign-in requests, please try again shortly",
+        headers={"Retry-After": "1"},
+    )
+
 @router.post("/login", response_model=Token)
 async def login(
-    db: Annotated[Session, Depends(deps.get_db)],
+    db: Annotated[AsyncSession, Depends(deps.get_async_db)],
     form_data: Annotated[OAuth2PasswordRequestForm, Depends()]
 ) -> Token:
     """
     OAuth2 compatible token login, get an access token for future requests.
     """
-    user = db.query(User).filter(User.email == form_data.username).first()
-    if not user or not security.verify_password(form_data.password, user.hashed_password):
+    user = await db.scalar(select(User).where(User.email == form_data.username))
+    try:
+        password_ok = user is not None and await security.verify_password_async(
+            form_data.password, user.hashed_password
+        )
+    except PasswordHashPoolFull:
+        raise password_hash_pool_full()
+    if not password_ok:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -42,29 +57,34 @@ async def login(
 @router.post("/register", response_model=UserSchema)
 async def register(
     *,
-    db: Annotated[Session, Depends(deps.get_db)],
+    db: Annotated[AsyncSession, Depends(deps.get_async_db)],
     user_in: UserCreate,
 ) -> User:
     """
     Create new user.
     """
-    user = db.query(User).filter(User.email == user_in.email).first()
+    user = await db.scalar(select(User).where(User.email == user_in.email))
     if user:
         raise HTTPException(
             status_code=400,
             detail="A user with this email already exists.",
         )
     
+    try:
+        hashed_password = await security.get_password_hash_async(user_in.password)
+    except PasswordHashPoolFull:
+        raise password_hash_pool_full()
+
     user = User(
         email=user_in.email,
-        hashed_password=security.get_password_hash(user_in.password),
+        hashed_password=hashed_password,
         full_name=user_in.full_name,
         is_active=True,
         is_superuser=False,
     )
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
     return user
 
 @router.get("/me", response_model=UserSchema)
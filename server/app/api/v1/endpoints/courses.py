@@ -1,59 +1,199 @@
-from typing import List, Annotated
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from typing import Any, Dict, List, Optional, Annotated, Literal
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api import deps
+from app.core.pagination import (
+    NEXT_CURSOR_HEADER,
+    InvalidCursor,
+    decode_created_at_cursor,
+    decode_id_cursor,
+    encode_cursor,
+)
+from app.repositories import course as course_repo
+from app.repositories import prerequisites as prerequisite_repo
+from app.repositories import progress as progress_repo
+from app.repositories import recommendations as recommendation_repo
+from app.repositories import search as search_repo
 from app.models import User, Course, Category, Module, Lesson, CourseProgress, LessonCompletion
 from app.schemas.course import (
     Course as CourseSchema,
     CourseCreate,
+    CoursePrerequisites,
+    CoursePrerequisitesUpdate,
+    CourseRecommendation,
+    CourseSummary,
     CourseUpdate,
     Category as CategorySchema,
     Module as ModuleSchema,
     Lesson as LessonSchema,
     CourseProgress as CourseProgressSchema,
-    LessonCompletion as LessonCompletionSchema
+    CourseProgressOverview,
+    LessonCompletion as LessonCompletionSchema,
+    LessonCompletionBatch,
+    LessonCompletionBatchResult,
+    LessonView,
+    SearchHit,
+    UnlockedCourses
 )
+from app.services.content_variants import variant_preferences
+from app.services.prerequisites import prerequisite_graph
 
 router = APIRouter()
 
+# Relationships a client may opt into on GET /courses/{course_id}
+COURSE_INCLUDES = {"modules", "lessons"}
+
+def decode_cursor_param(decoder, cursor: str | None):
+    if cursor is None:
+        return None
+    try:
+        return decoder(cursor)
+    except InvalidCursor:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def set_next_cursor(response: Response, items: list, limit: int, key) -> None:
+    """
+    Advertise the cursor for the following page when this page is full
+    """
+    if items and len(items) == limit:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(*key(items[-1]))
+
 @router.get("/categories", response_model=List[CategorySchema])
 async def list_categories(
-    db: Annotated[Session, Depends(deps.get_db)],
+    response: Response,
+    db: Annotated[AsyncSession, Depends(deps.get_async_db)],
     skip: int = 0,
-    limit: int = 100
+    limit: int = 100,
+    cursor: str | None = None
 ) -> List[Category]:
     """
     Retrieve categories.
+
+    Pass the ``X-Next-Cursor`` header of a page as ``cursor`` to fetch the next one.
     """
-    return db.query(Category).offset(skip).limit(limit).all()
+    categories = await course_repo.list_categories(
+        db, skip=skip, limit=limit, after=decode_cursor_param(decode_id_cursor, cursor)
+    )
+    set_next_cursor(response, categories, limit, lambda category: (category.id,))
+    return categories
 
 @router.get("/", response_model=List[CourseSchema])
 async def list_courses(
-    db: Annotated[Session, Depends(deps.get_db)],
+    response: Response,
+    db: Annotated[AsyncSession, Depends(deps.get_async_db)],
     skip: int = 0,
     limit: int = 100,
-    category_id: int | None = None
+    category_id: int | None = None,
+    cursor: str | None = None
 ) -> List[Course]:
     """
     Retrieve courses.
+
+    Pass the ``X-Next-Cursor`` header of a page as ``cursor`` to fetch the next one.
     """
-    query = db.query(Course)
-    if category_id:
-        query = query.filter(Course.categories.any(Category.id == category_id))
-    return query.offset(skip).limit(limit).all()
+    courses = await course_repo.list_courses(
+        db,
+        skip=skip,
+        limit=limit,
+        category_id=category_id,
+        after=decode_cursor_param(decode_created_at_cursor, cursor)
+    )
+    set_next_cursor(response, courses, limit, lambda course: (course.created_at, course.id))
+    return courses
+
+@router.get("/summary", response_model=List[CourseSummary])
+async def list_course_summaries(
+    response: Response,
+    db: Annotated[AsyncSession, Depends(deps.get_async_db)],
+    skip: int = 0,
+    limit: int = 100,
+    category_id: int | None = None,
+    cursor: str | None = None
+) -> List[CourseSummary]:
+    """
+    Retrieve lightweight course summaries for the catalogue.
+
+    Pass the ``X-Next-Cursor`` header of a page as ``cursor`` to fetch the next one.
+    """
+    summaries = await course_repo.list_course_summaries(
+        db,
+        skip=skip,
+        limit=limit,
+        category_id=category_id,
+        after=decode_cursor_param(decode_created_at_cursor, cursor)
+    )
+    set_next_cursor(response, summaries, limit, lambda summary: (summary.created_at, summary.id))
+    return summaries
+
+@router.get("/search", response_model=List[SearchHit])
+async def search_catalogue(
+    db: Annotated[AsyncSession, Depends(deps.get_async_db)],
+    q: Annotated[str, Query(min_length=1, max_length=200)],
+    limit: Annotated[int, Query(ge=1, le=50)] = 20,
+    kind: Literal["course", "module", "lesson"] | None = None
+) -> List[SearchHit]:
+    """
+    Search course, module and lesson text, best match first.
+
+    Every word must match; the last one also matches as a prefix. Matched
+    words in ``snippet`` are wrapped in ``<mark>`` tags and the rest is
+    HTML-escaped.
+    """
+    kinds = (kind,) if kind else search_repo.SEARCH_KINDS
+    return await search_repo.search_catalogue(db, q, limit=limit, kinds=kinds)
+
+@router.get("/progress/me", response_model=List[CourseProgressOverview])
+async def list_my_progress(
+    db: Annotated[AsyncSession, Depends(deps.get_async_db)],
+    current_user: Annotated[User, Depends(deps.get_current_user)]
+) -> List[CourseProgressOverview]:
+    """
+    Progress on every course the current user has started, for the dashboard.
+    """
+    return await progress_repo.list_user_progress(db, user_id=current_user.id)
+
+@router.get("/recommended/me", response_model=List[CourseRecommendation])
+async def list_my_recommendations(
+    db: Annotated[AsyncSession, Depends(deps.get_async_db)],
+    current_user: Annotated[User, Depends(deps.get_current_user)],
+    limit: Annotated[int, Query(ge=1, le=50)] = 10
+) -> List[CourseRecommendation]:
+    """
+    Suggested next courses for the current user, best first.
+
+    Read from suggestions precomputed from everyone's lesson completions;
+    learners with no completions yet get an empty list.
+    """
+    return await recommendation_repo.list_recommendations(db, user_id=current_user.id, limit=limit)
+
+@router.get("/unlocked/me", response_model=UnlockedCourses)
+async def list_my_unlocked_courses(
+    db: Annotated[AsyncSession, Depends(deps.get_async_db)],
+    current_user: Annotated[User, Depends(deps.get_current_user)]
+) -> UnlockedCourses:
+    """
+    Courses the current user has completed, and those they can take next
+    because every prerequisite (direct or indirect) is completed.
+    """
+    graph = await prerequisite_graph.get(db)
+    completed = await progress_repo.completed_course_ids(db, user_id=current_user.id)
+    return UnlockedCourses(
+        completed_course_ids=sorted(completed),
+        unlocked_course_ids=graph.unlocked(completed),
+    )
 
 @router.post("/", response_model=CourseSchema)
 async def create_course(
     *,
-    db: Annotated[Session, Depends(deps.get_db)],
+    db: Annotated[AsyncSession, Depends(deps.get_async_db)],
     course_in: CourseCreate,
     current_user: Annotated[User, Depends(deps.get_current_active_superuser)]
 ) -> Course:
     """
     Create new course.
     """
-    categories = db.query(Category).filter(Category.id.in_(course_in.category_ids)).all()
+    categories = await course_repo.get_categories(db, course_in.category_ids)
     if len(categories) != len(course_in.category_ids):
         raise HTTPException(
             status_code=400,
@@ -70,40 +210,70 @@ async def create_course(
         categories=categories
     )
     db.add(course)
-    db.commit()
-    db.refresh(course)
-    return course
+    await db.commit()
+    prerequisite_graph.update(lambda graph: graph.add_course(course.id))
+    return await course_repo.get_course(db, course.id)
 
-@router.get("/{course_id}", response_model=CourseSchema)
+@router.get("/{course_id}", response_model=CourseSchema, response_model_exclude_unset=True)
 async def get_course(
     course_id: int,
-    db: Annotated[Session, Depends(deps.get_db)]
-) -> Course:
+    db: Annotated[AsyncSession, Depends(deps.get_async_db)],
+    include: str = "modules,lessons"
+) -> Dict[str, Any]:
     """
     Get course by ID.
+
+    ``include`` is a comma-separated list of ``modules`` and ``lessons``;
+    pass an empty value for the course alone. ``lessons`` implies ``modules``.
     """
-    course = db.query(Course).filter(Course.id == course_id).first()
+    includes = {part.strip() for part in include.split(",") if part.strip()}
+    unknown = includes - COURSE_INCLUDES
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown include value(s): {', '.join(sorted(unknown))}"
+        )
+    with_lessons = "lessons" in includes
+    with_modules = with_lessons or "modules" in includes
+
+    course = await course_repo.get_course(
+        db, course_id, modules=with_modules, lessons=with_lessons
+    )
     if not course:
         raise HTTPException(status_code=404, detail="Course not found")
-    return course
+
+    # Only keys present here are serialized, so omitted relationships are left
+    # out of the response rather than reported as empty lists
+    response = {
+        field: getattr(course, field)
+        for field in CourseSchema.__fields__ if field != "modules"
+    }
+    if with_lessons:
+        response["modules"] = course.modules
+    elif with_modules:
+        response["modules"] = [
+            {field: getattr(module, field) for field in ModuleSchema.__fields__ if field != "lessons"}
+            for module in course.modules
+        ]
+    return response
 
 @router.put("/{course_id}", response_model=CourseSchema)
 async def update_course(
     *,
     course_id: int,
     course_in: CourseUpdate,
-    db: Annotated[Session, Depends(deps.get_db)],
+    db: Annotated[AsyncSession, Depends(deps.get_async_db)],
     current_user: Annotated[User, Depends(deps.get_current_active_superuser)]
 ) -> Course:
     """
     Update course.
     """
-    course = db.query(Course).filter(Course.id == course_id).first()
+    course = await course_repo.get_course(db, course_id)
     if not course:
         raise HTTPException(status_code=404, detail="Course not found")
     
     if course_in.category_ids is not None:
-        categories = db.query(Category).filter(Category.id.in_(course_in.category_ids)).all()
+        categories = await course_repo.get_categories(db, course_in.category_ids)
         if len(categories) != len(course_in.category_ids):
             raise HTTPException(
                 status_code=400,
@@ -114,100 +284,157 @@ async def update_course(
     for field, value in course_in.dict(exclude={'category_ids'}).items():
         setattr(course, field, value)
     
-    db.commit()
-    db.refresh(course)
-    return course
+    await db.commit()
+    return await course_repo.get_course(db, course_id)
 
 @router.delete("/{course_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_course(
     course_id: int,
-    db: Annotated[Session, Depends(deps.get_db)],
+    db: Annotated[AsyncSession, Depends(deps.get_async_db)],
     current_user: Annotated[User, Depends(deps.get_current_active_superuser)]
 ) -> None:
     """
     Delete course.
     """
-    course = db.query(Course).filter(Course.id == course_id).first()
+    course = await db.get(Course, course_id)
     if not course:
         raise HTTPException(status_code=404, detail="Course not found")
-    db.delete(course)
-    db.commit()
+    await prerequisite_repo.delete_course_edges(db, course_id)
+    await db.delete(course)
+    await db.commit()
+    prerequisite_graph.update(lambda graph: graph.remove_course(course_id))
+
+@router.get("/{course_id}/prerequisites", response_model=CoursePrerequisites)
+async def get_course_prerequisites(
+    course_id: int,
+    db: Annotated[AsyncSession, Depends(deps.get_async_db)]
+) -> CoursePrerequisites:
+    """
+    Direct prerequisites of a course, and all of them in an order they can be taken.
+    """
+    graph = await prerequisite_graph.get(db)
+    if course_id not in graph:
+        # Possibly created by another worker since the graph was loaded
+        graph = await prerequisite_graph.get(db, reload=True)
+        if course_id not in graph:
+            raise HTTPException(status_code=404, detail="Course not found")
+    return CoursePrerequisites(
+        course_id=course_id,
+        prerequisite_ids=graph.prerequisites(course_id),
+        all_prerequisite_ids=graph.all_prerequisites(course_id),
+    )
+
+@router.put("/{course_id}/prerequisites", response_model=CoursePrerequisites)
+async def set_course_prerequisites(
+    course_id: int,
+    prerequisites_in: CoursePrerequisitesUpdate,
+    db: Annotated[AsyncSession, Depends(deps.get_async_db)],
+    current_user: Annotated[User, Depends(deps.get_current_active_superuser)]
+) -> CoursePrerequisites:
+    """
+    Replace the direct prerequisites of a course. Changes that would make a
+    course require itself, directly or through other courses, are refused.
+    """
+    prerequisite_ids = set(prerequisites_in.prerequisite_ids)
+    found = await prerequisite_repo.existing_course_ids(db, prerequisite_ids | {course_id})
+    if course_id not in found:
+        raise HTTPException(status_code=404, detail="Course not found")
+    if len(found) != len(prerequisite_ids | {course_id}):
+        raise HTTPException(
+            status_code=400,
+            detail="One or more prerequisite course IDs are invalid"
+        )
+    # Concurrent writes could otherwise each pass the check and together
+    # commit a cycle; inside the lock the graph is reloaded from the database
+    async with prerequisite_graph.writing(db) as graph:
+        cycle = graph.find_cycle(course_id, prerequisite_ids)
+        if cycle is not None:
+            # Ends the transaction, releasing the lock for other workers
+            await db.rollback()
+            raise HTTPException(
+                status_code=409,
+                detail=f"Prerequisites would form a cycle: {' -> '.join(map(str, cycle))}"
+            )
+        await prerequisite_repo.replace_prerequisites(db, course_id, prerequisite_ids)
+        await db.commit()
+        prerequisite_graph.update(lambda graph: graph.set_prerequisites(course_id, prerequisite_ids))
+    graph = await prerequisite_graph.get(db)
+    return CoursePrerequisites(
+        course_id=course_id,
+        prerequisite_ids=graph.prerequisites(course_id),
+        all_prerequisite_ids=graph.all_prerequisites(course_id),
+    )
 
 @router.post("/{course_id}/start", response_model=CourseProgressSchema)
 async def start_course(
     course_id: int,
-    db: Annotated[Session, Depends(deps.get_db)],
+    db: Annotated[AsyncSession, Depends(deps.get_async_db)],
     current_user: Annotated[User, Depends(deps.get_current_user)]
 ) -> CourseProgress:
     """
     Start a course for the current user.
     """
-    # Check if course exists
-    course = db.query(Course).filter(Course.id == course_id).first()
-    if not course:
+    try:
+        return await progress_repo.start_course(
+            db, user_id=current_user.id, course_id=course_id
+        )
+    except progress_repo.CourseNotFound:
         raise HTTPException(status_code=404, detail="Course not found")
-    
-    # Check if user already started this course
-    progress = db.query(CourseProgress).filter(
-        CourseProgress.user_id == current_user.id,
-        CourseProgress.course_id == course_id
-    ).first()
-    
-    if progress:
-        return progress
-    
-    # Create new progress
-    progress = CourseProgress(
+
+@router.post("/lessons/complete", response_model=LessonCompletionBatchResult)
+async def complete_lessons(
+    batch: LessonCompletionBatch,
+    db: Annotated[AsyncSession, Depends(deps.get_async_db)],
+    current_user: Annotated[User, Depends(deps.get_current_user)]
+) -> LessonCompletionBatchResult:
+    """
+    Mark several lessons as completed at once, e.g. when an offline client
+    reconnects. Each submitted completion gets its own result, in order; one
+    failing lesson does not stop the others.
+    """
+    results = await progress_repo.complete_lessons(
+        db,
         user_id=current_user.id,
-        course_id=course_id
+        items=[(item.lesson_id, item.completed_at) for item in batch.completions],
     )
-    db.add(progress)
-    db.commit()
-    db.refresh(progress)
-    return progress
+    return LessonCompletionBatchResult(results=results)
+
+@router.get("/lessons/{lesson_id}", response_model=LessonView)
+async def get_lesson(
+    lesson_id: int,
+    db: Annotated[AsyncSession, Depends(deps.get_async_db)],
+    current_user: Annotated[Optional[User], Depends(deps.get_optional_user)]
+) -> LessonView:
+    """
+    Get a lesson for viewing, with its content rendered to HTML on the server.
+    Signed-in learners get the pre-generated variant their accessibility
+    settings ask for, when there is one.
+    """
+    variant_key = None
+    if current_user is not None:
+        variant_key = await variant_preferences.get(db, current_user.id)
+    lesson = await course_repo.get_lesson_view(db, lesson_id, variant_key=variant_key)
+    if lesson is None:
+        raise HTTPException(status_code=404, detail="Lesson not found")
+    return lesson
 
 @router.post("/lessons/{lesson_id}/complete", response_model=LessonCompletionSchema)
 async def complete_lesson(
     lesson_id: int,
-    db: Annotated[Session, Depends(deps.get_db)],
+    db: Annotated[AsyncSession, Depends(deps.get_async_db)],
     current_user: Annotated[User, Depends(deps.get_current_user)]
 ) -> LessonCompletion:
     """
     Mark a lesson as completed for the current user.
     """
-    # Check if lesson exists
-    lesson = db.query(Lesson).filter(Lesson.id == lesson_id).first()
-    if not lesson:
+    try:
+        return await progress_repo.complete_lesson(
+            db, user_id=current_user.id, lesson_id=lesson_id
+        )
+    except progress_repo.LessonNotFound:
         raise HTTPException(status_code=404, detail="Lesson not found")
-    
-    # Get course progress
-    progress = db.query(CourseProgress).filter(
-        CourseProgress.user_id == current_user.id,
-        CourseProgress.course_id == lesson.module.course_id
-    ).first()
-    
-    if not progress:
+    except progress_repo.CourseNotStarted:
         raise HTTPException(
             status_code=400,
             detail="You must start the course before completing lessons"
         )
-    
-    # Check if lesson is already completed
-    completion = db.query(LessonCompletion).filter(
-        LessonCompletion.user_id == current_user.id,
-        LessonCompletion.lesson_id == lesson_id
-    ).first()
-    
-    if completion:
-        return completion
-    
-    # Create new completion
-    completion = LessonCompletion(
-        user_id=current_user.id,
-        lesson_id=lesson_id,
-        course_progress_id=progress.id
-    )
-    db.add(completion)
-    db.commit()
-    db.refresh(completion)
-    return completion 
\ No newline at end of file
@@ -0,0 +1,39 @@
+from typing import Annotated
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api import deps
+from app.models import User
+from app.repositories import content_variants as variant_repo
+from app.schemas.preferences import AccessibilitySettings
+from app.services.content_variants import variant_preferences
+
+router = APIRouter()
+
+@router.get("/me/accessibility", response_model=AccessibilitySettings)
+async def get_accessibility_settings(
+    db: Annotated[AsyncSession, Depends(deps.get_async_db)],
+    current_user: Annotated[User, Depends(deps.get_current_user)]
+) -> AccessibilitySettings:
+    """
+    Get the current user's accessibility settings.
+    """
+    stored = await variant_repo.accessibility_settings(db, current_user.id)
+    return AccessibilitySettings.parse_obj(stored if isinstance(stored, dict) else {})
+
+@router.put("/me/accessibility", response_model=AccessibilitySettings)
+async def update_accessibility_settings(
+    settings_in: AccessibilitySettings,
+    db: Annotated[AsyncSession, Depends(deps.get_async_db)],
+    current_user: Annotated[User, Depends(deps.get_current_user)]
+) -> AccessibilitySettings:
+    """
+    Set the current user's accessibility settings, which pick the lesson
+    variant they are served.
+    """
+    stored = await variant_repo.accessibility_settings(db, current_user.id)
+    settings = {**(stored if isinstance(stored, dict) else {}), **settings_in.dict()}
+    await variant_repo.set_accessibility_settings(db, current_user.id, settings)
+    # Written without the ORM, so the flush listener doesn't see it
+    variant_preferences.invalidate(current_user.id)
+    return settings_in
@@ -1,27 +1,24 @@
-from fastapi import APIRouter, HTTPException
-from app.data.sample_courses.web_development_intro import sample_courses
+from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from app.data.sample_courses import sample_course_registry
+from app.services.sample_catalogue import SampleCatalogue, catalogue_response
 
 router = APIRouter()
 
+# Entries are built on first request; the first build of a course may import
+# and validate its module, so it runs off the event loop
+sample_catalogue = SampleCatalogue(sample_course_registry)
+
 @router.get("/courses/{course_id}")
-async def get_sample_course(course_id: str):
+async def get_sample_course(course_id: str, request: Request) -> Response:
     """Get a sample course by ID."""
-    if course_id not in sample_courses:
+    entry = await run_in_threadpool(sample_catalogue.get, course_id)
+    if entry is None:
         raise HTTPException(status_code=404, detail="Sample course not found")
-    return sample_courses[course_id]
+    return catalogue_response(entry, request)
 
 @router.get("/courses")
-async def list_sample_courses():
+async def list_sample_courses(request: Request) -> Response:
     """List all available sample courses."""
-    return {
-        "courses": [
-            {
-                "id": course_id,
-                "title": course.title,
-                "description": course.description,
-                "difficulty_level": course.difficulty_level,
-                "estimated_duration": course.estimated_duration,
-            }
-            for course_id, course in sample_courses.items()
-        ]
-    } 
\ No newline at end of file
+    entry = await run_in_threadpool(sample_catalogue.listing)
+    return catalogue_response(entry, request)
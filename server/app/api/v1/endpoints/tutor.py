@@ -0,0 +1,231 @@
+import logging
+from typing import Annotated, AsyncIterator
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api import deps
+from app.models import User
+from app.repositories import course as course_repo
+from app.schemas.tutor import (
+    ChatContext,
+    ChatRequest,
+    Conversation,
+    ConversationMessage,
+    ExplainRequest,
+    FeedbackRequest,
+    TutorResponse,
+)
+from app.services import tutor as tutor_service
+from app.services import tutor_log
+from app.services.explain_cache import explanation_cache, explanation_key
+from app.services.llm import LLMProvider, ProviderBusy, get_llm_provider
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+# Sent with streamed responses so proxies pass each event on immediately
+STREAM_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+TUTOR_BUSY = "The tutor is busy, please try again shortly"
+
+def wants_stream(request: Request) -> bool:
+    return "text/event-stream" in request.headers.get("accept", "")
+
+async def sse_stream(turn: tutor_service.TutorTurn, conversation_id: str) -> AsyncIterator[str]:
+    """
+    One ``data`` event per chunk, then a ``done`` event once the answer is saved
+    """
+    try:
+        async for chunk in turn.stream():
+            yield tutor_service.sse_event({"content": chunk})
+    except ProviderBusy:
+        yield tutor_service.sse_event({"detail": TUTOR_BUSY, "retry_after": 1}, event="error")
+        return
+    except Exception:
+        logger.exception("Tutor stream failed")
+        yield tutor_service.sse_event(
+            {"detail": "The tutor is unavailable, please try again"}, event="error"
+        )
+        return
+    yield tutor_service.sse_event(
+        {"conversation_id": conversation_id, "message_id": turn.message_id}, event="done"
+    )
+
+async def respond(request: Request, turn: tutor_service.TutorTurn, conversation_id: str):
+    """
+    Stream as Server-Sent Events when the client accepts them, otherwise
+    answer with the whole reply as JSON
+    """
+    if wants_stream(request):
+        return StreamingResponse(
+            sse_stream(turn, conversation_id),
+            media_type="text/event-stream",
+            headers=STREAM_HEADERS,
+        )
+    try:
+        message = await turn.complete()
+    except ProviderBusy:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=TUTOR_BUSY,
+            headers={"Retry-After": "1"},
+        )
+    except Exception:
+        logger.exception("Tutor request failed")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="The tutor is unavailable, please try again",
+        )
+    return TutorResponse(message=message, conversation_id=conversation_id)
+
+def respond_cached(request: Request, response: Response, message: str, conversation_id: str):
+    """
+    Send a stored answer in the same shape as a freshly generated one
+    """
+    if wants_stream(request):
+        events = [
+            tutor_service.sse_event({"content": message}),
+            tutor_service.sse_event({"conversation_id": conversation_id, "message_id": None}, event="done"),
+        ]
+        return StreamingResponse(
+            iter(events), media_type="text/event-stream", headers={**STREAM_HEADERS, "X-Cache": "HIT"}
+        )
+    response.headers["X-Cache"] = "HIT"
+    return TutorResponse(message=message, conversation_id=conversation_id)
+
+@router.post("/chat", response_model=TutorResponse)
+async def chat(
+    request: Request,
+    chat_in: ChatRequest,
+    db: Annotated[AsyncSession, Depends(deps.get_async_db)],
+    provider: Annotated[LLMProvider, Depends(get_llm_provider)],
+    current_user: Annotated[User, Depends(deps.get_current_user)]
+):
+    """
+    Ask the AI tutor a question.
+
+    Send ``Accept: text/event-stream`` to receive the answer as it is generated.
+    """
+    # Checked up front: the exchange is only saved after the reply has
+    # streamed, too late to report an unknown lesson
+    lesson_id = chat_in.context.lesson_id
+    if lesson_id is not None and not await course_repo.lesson_exists(db, lesson_id):
+        raise HTTPException(status_code=404, detail="Lesson not found")
+    turn = await tutor_service.start_chat(
+        db,
+        provider,
+        user_id=current_user.id,
+        question=chat_in.message,
+        context=chat_in.context,
+        preferences=chat_in.preferences,
+    )
+    # Return the connection to the pool before waiting on the model
+    await db.close()
+    return await respond(request, turn, tutor_service.conversation_id(chat_in.context.lesson_id))
+
+@router.get("/conversations/{conversation_id}", response_model=Conversation)
+async def get_conversation(
+    conversation_id: str,
+    db: Annotated[AsyncSession, Depends(deps.get_async_db)],
+    current_user: Annotated[User, Depends(deps.get_current_user)],
+    limit: int = 50
+) -> Conversation:
+    """
+    The latest messages of a conversation: ``lesson-<lesson_id>`` or ``general``
+    """
+    try:
+        lesson_id = tutor_service.parse_conversation_id(conversation_id)
+    except ValueError:
+        raise HTTPException(status_code=404, detail="Conversation not found")
+    messages = await tutor_service.load_history(
+        db, user_id=current_user.id, lesson_id=lesson_id, limit=limit
+    )
+    return Conversation(
+        id=conversation_id,
+        messages=[
+            ConversationMessage(
+                id=message.id, role=message.role, content=message.content, timestamp=message.created_at
+            )
+            for message in messages
+        ],
+        context=ChatContext(lesson_id=lesson_id),
+    )
+
+@router.post("/explain", response_model=TutorResponse)
+async def explain(
+    request: Request,
+    response: Response,
+    explain_in: ExplainRequest,
+    provider: Annotated[LLMProvider, Depends(get_llm_provider)],
+    current_user: Annotated[User, Depends(deps.get_current_user)]
+):
+    """
+    Explain a key concept from the sample courses.
+
+    Many learners ask the same templated question about the same concept, so
+    answers are cached by question, concept, lesson and preferences. Cached
+    answers carry an ``X-Cache: HIT`` header.
+    """
+    # The first lookup imports the sample courses, so keep it off the event loop
+    concept = await run_in_threadpool(tutor_service.concept_index.get, explain_in.concept_id)
+    if concept is None:
+        raise HTTPException(status_code=404, detail="Concept not found")
+    question = tutor_service.explain_prompt(concept, explain_in.style)
+    conversation_id = tutor_service.conversation_id(explain_in.lesson_id)
+    key = explanation_key(
+        question,
+        concept_id=concept.id,
+        lesson_id=explain_in.lesson_id,
+        preferences=explain_in.preferences,
+        model=tutor_service.model_name(),
+    )
+    log_context = {"concept_id": concept.id, "style": explain_in.style}
+    cached = await explanation_cache.get(key)
+    if cached is not None:
+        tutor_log.record(
+            user_id=current_user.id,
+            session_id=conversation_id,
+            kind="explain",
+            context={**log_context, "cached": True},
+            user_message=question,
+            ai_response=cached,
+            latency_ms=0,
+        )
+        return respond_cached(request, response, cached, conversation_id)
+
+    context = ChatContext(lesson_id=explain_in.lesson_id)
+    prompt = [
+        {"role": "system", "content": tutor_service.system_prompt(explain_in.preferences, context)},
+        {"role": "user", "content": question},
+    ]
+    turn = tutor_service.TutorTurn(
+        provider,
+        user_id=current_user.id,
+        lesson_id=explain_in.lesson_id,
+        question=question,
+        prompt=prompt,
+        persist=False,
+        on_complete=lambda message: explanation_cache.set(key, message),
+        kind="explain",
+        log_context=log_context,
+    )
+    return await respond(request, turn, conversation_id)
+
+@router.post("/feedback", status_code=status.HTTP_204_NO_CONTENT)
+async def feedback(
+    feedback_in: FeedbackRequest,
+    current_user: Annotated[User, Depends(deps.get_current_user)]
+) -> Response:
+    """
+    Record how well a lesson's explanations worked for the learner
+    """
+    tutor_log.record(
+        user_id=current_user.id,
+        session_id=tutor_service.conversation_id(feedback_in.lesson_id),
+        kind="feedback",
+        context=feedback_in.feedback.dict(),
+        feedback_rating=tutor_log.UNDERSTANDING_RATINGS.get(feedback_in.feedback.understanding),
+        feedback_comment=feedback_in.feedback.comments,
+    )
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
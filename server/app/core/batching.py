@@ -0,0 +1,111 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+class BatchBuffer:
+    """
+    Bounded in-process buffer that hands records to ``flush`` in batches.
+
+    ``add`` never blocks or touches I/O, so it is safe in the request path.
+    A background task flushes once ``flush_size`` records are waiting or
+    ``flush_seconds`` have passed, whichever comes first. When ``max_size``
+    records are already waiting new ones are dropped and counted rather than
+    letting memory grow; a failed flush drops its batch the same way.
+    ``stop`` lets a flush in progress finish, then flushes whatever is left.
+    """
+
+    def __init__(
+        self,
+        flush: Callable[[List[Dict[str, Any]]], Awaitable[None]],
+        *,
+        max_size: int,
+        flush_size: int,
+        flush_seconds: float,
+    ) -> None:
+        self.flush = flush
+        self.max_size = max_size
+        self.flush_size = flush_size
+        self.flush_seconds = flush_seconds
+        self._records: Deque[Dict[str, Any]] = deque()
+        self._ready = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+        self._added = 0
+        self._dropped = 0
+        self._failed = 0
+        self._written = 0
+        self._flushes = 0
+        self._flush_time_total = 0.0
+
+    def add(self, record: Dict[str, Any]) -> bool:
+        if len(self._records) >= self.max_size:
+            self._dropped += 1
+            return False
+        self._records.append(record)
+        self._added += 1
+        if len(self._records) >= self.flush_size:
+            self._ready.set()
+        return True
+
+    def start(self) -> None:
+        if self._task is None:
+            self._stopping = False
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            # Wake the loop and let it exit rather than cancel it mid-flush
+            self._stopping = True
+            self._ready.set()
+            await self._task
+            self._task = None
+        while self._records:
+            await self._flush_batch()
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout=self.flush_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._ready.clear()
+            while self._records and not self._stopping:
+                await self._flush_batch()
+                if len(self._records) < self.flush_size:
+                    break
+
+    async def _flush_batch(self) -> None:
+        batch = [self._records.popleft() for _ in range(min(self.flush_size, len(self._records)))]
+        started = time.perf_counter()
+        try:
+            await self.flush(batch)
+        except asyncio.CancelledError:
+            # Cancelled from outside (e.g. the loop shutting down): keep the
+            # batch for the next flush instead of losing it uncounted
+            self._records.extendleft(reversed(batch))
+            raise
+        except Exception:
+            self._failed += len(batch)
+            logger.exception("Dropped %d buffered records after a failed flush", len(batch))
+            return
+        self._written += len(batch)
+        self._flushes += 1
+        self._flush_time_total += time.perf_counter() - started
+
+    def stats(self) -> Dict[str, Any]:
+        flushes = self._flushes or 1
+        return {
+            "max_size": self.max_size,
+            "flush_size": self.flush_size,
+            "pending": len(self._records),
+            "added": self._added,
+            "written": self._written,
+            "dropped": self._dropped,
+            "failed": self._failed,
+            "flushes": self._flushes,
+            "avg_flush_ms": round(self._flush_time_total / flushes * 1000, 3),
+        }
@@ -0,0 +1,199 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+class TTLCache:
+    """
+    In-process LRU cache with a per-entry time-to-live.
+
+    Holds at most ``max_size`` entries, evicting the least recently used one
+    when full; expired entries are dropped when they are next read. Safe to
+    share between threads.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float) -> None:
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+class RedisCache:
+    """
+    Shared cache tier on any Redis-compatible asyncio client.
+
+    Only ``get``, ``set(..., ex=)`` and ``delete`` are used, so
+    ``redis.asyncio.Redis`` or a local stand-in with the same methods (for
+    example ``fakeredis.aioredis.FakeRedis``) can be passed in. Values are
+    stored as JSON.
+    """
+
+    def __init__(self, client: Any, prefix: str, ttl_seconds: int) -> None:
+        self.client = client
+        self.prefix = prefix
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+
+    def _key(self, key: Hashable) -> str:
+        return f"{self.prefix}:{key}"
+
+    async def get(self, key: Hashable) -> Any:
+        raw = await self.client.get(self._key(key))
+        if raw is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(raw)
+
+    async def set(self, key: Hashable, value: Any) -> None:
+        await self.client.set(self._key(key), json.dumps(value), ex=self.ttl_seconds)
+
+    async def delete(self, key: Hashable) -> None:
+        await self.client.delete(self._key(key))
+
+    def stats(self) -> Dict[str, Any]:
+        return {"hits": self.hits, "misses": self.misses}
+
+class SQLiteCache:
+    """
+    Persistent cache tier in a local SQLite file, shared by the workers of one
+    host and kept across restarts.
+
+    Values are stored as JSON with an absolute expiry. Once more than
+    ``max_entries`` rows exist the least recently read ones are removed. The
+    methods block on disk I/O, so call them from a thread (``asyncio.to_thread``)
+    rather than on the event loop.
+    """
+
+    def __init__(self, path: str, ttl_seconds: float, max_entries: int) -> None:
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA busy_timeout=5000")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS cache_entries ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+            "expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS ix_cache_entries_accessed_at ON cache_entries (accessed_at)"
+        )
+
+    def get(self, key: str) -> Any:
+        now = time.time()
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT value, expires_at FROM cache_entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or row[1] < now:
+                if row is not None:
+                    self._connection.execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+                self.misses += 1
+                return None
+            self._connection.execute(
+                "UPDATE cache_entries SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+            self.hits += 1
+            return json.loads(row[0])
+
+    def set(self, key: str, value: Any) -> None:
+        now = time.time()
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO cache_entries (key, value, expires_at, accessed_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value), now + self.ttl_seconds, now),
+            )
+            (count,) = self._connection.execute("SELECT count(*) FROM cache_entries").fetchone()
+            if count > self.max_entries:
+                self._connection.execute(
+                    "DELETE FROM cache_entries WHERE key IN ("
+                    "SELECT key FROM cache_entries ORDER BY accessed_at LIMIT ?)",
+                    (count - self.max_entries,),
+                )
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._connection.execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+def redis_client_from_url(url: str) -> Any:
+    """
+    Build a ``redis.asyncio`` client; redis is an optional dependency
+    """
+    try:
+        from redis import asyncio as redis_asyncio
+    except ImportError:
+        raise RuntimeError(f"The redis package is required to use the Redis cache at {url}")
+    return redis_asyncio.from_url(url)
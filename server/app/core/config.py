@@ -15,6 +15,14 @@ class Settings(BaseSettings):
     SECRET_KEY: str = secrets.token_urlsafe(32)
     # 60 minutes * 24 hours * 7 days = 7 days
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 7
+    # Shared JWT signing keys so every worker accepts every other worker's tokens.
+    # JWT_KEYS_FILE is a JSON file {"active_kid": "...", "keys": {"<kid>": "<secret>"}};
+    # JWT_KEYS is the same as "kid:secret,kid:secret" with JWT_ACTIVE_KID picking
+    # the signing key (default: the first). SECRET_KEY is used when neither is set.
+    JWT_KEYS_FILE: Optional[str] = None
+    JWT_KEYS: Optional[str] = None
+    JWT_ACTIVE_KID: Optional[str] = None
+    JWT_KEYS_RELOAD_SECONDS: int = 30
     SERVER_NAME: str = "Autism Pathways Academy"
     SERVER_HOST: str = "localhost"
     
@@ -54,10 +62,65 @@ class Settings(BaseSettings):
         except Exception:
             # Fallback to SQLite for development
             return "sqlite:///./test.db"
-    
+
+    # Connection pool sizing for the async engine (ignored for SQLite)
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    # Connections each worker opens at startup
+    DB_POOL_WARM_CONNECTIONS: int = 2
+
+    # Password hashing pool: bcrypt runs on these threads instead of the event loop
+    PASSWORD_HASH_WORKERS: int = os.cpu_count() or 1
+    PASSWORD_HASH_MAX_QUEUE: int = 256
+
+    # Authenticated-user cache used by get_current_user
+    USER_CACHE_TTL_SECONDS: int = 30
+    USER_CACHE_MAX_SIZE: int = 10_000
+    # Optional shared tier, e.g. redis://localhost:6379/0
+    USER_CACHE_REDIS_URL: Optional[str] = None
+
     # OpenAI API or Anthropic API settings
     OPENAI_API_KEY: Optional[str] = None
     AI_MODEL: str = "gpt-4"  # or "claude-2" if using Anthropic
+    # "openai", or "fake" for the local provider used in development and tests
+    AI_PROVIDER: str = "openai"
+    AI_TEMPERATURE: float = 0.7
+    AI_MAX_TOKENS: int = 1000
+    # OpenAI-compatible endpoint; point it at a local stub server in tests
+    AI_BASE_URL: str = "https://api.openai.com/v1"
+    AI_TIMEOUT_SECONDS: float = 30
+    # Prompts sent to the provider at once per worker, and how many may wait
+    AI_MAX_CONCURRENCY: int = 16
+    AI_MAX_QUEUE: int = 64
+    AI_MAX_RETRIES: int = 2
+    AI_RETRY_BASE_SECONDS: float = 0.5
+    # Earlier messages of the conversation sent to the model with each turn
+    TUTOR_HISTORY_MESSAGES: int = 10
+    # Prompt size limit per turn; older turns live on in a rolling summary
+    TUTOR_CONTEXT_TOKEN_BUDGET: int = 3000
+    TUTOR_SUMMARY_MAX_TOKENS: int = 500
+    # Cache of /tutor/explain answers; the disk tier is used when a path is set
+    EXPLAIN_CACHE_TTL_SECONDS: int = 60 * 60 * 24 * 7
+    EXPLAIN_CACHE_MAX_SIZE: int = 1_000
+    EXPLAIN_CACHE_PATH: Optional[str] = None
+    EXPLAIN_CACHE_DISK_MAX_ENTRIES: int = 100_000
+    # Tutor analytics are buffered in memory and written in batches
+    TUTOR_LOG_BUFFER_SIZE: int = 10_000
+    TUTOR_LOG_FLUSH_SIZE: int = 500
+    TUTOR_LOG_FLUSH_SECONDS: float = 2.0
+    # Workers reload the in-memory prerequisite graph when it is older than this
+    PREREQUISITE_GRAPH_TTL_SECONDS: int = 60
+    # "Next course" suggestions kept per learner
+    RECOMMENDATION_TOP_K: int = 10
+    # Refresh them in the API process this often (0 = never; run
+    # scripts/refresh_recommendations.py instead when there are several workers)
+    RECOMMENDATION_REFRESH_SECONDS: int = 0
+    # Refreshes only recompute learners with new completions; a full rebuild
+    # at this interval folds in deletions and similarity drift for everyone
+    RECOMMENDATION_FULL_REFRESH_SECONDS: int = 60 * 60 * 24
+    # Learners' lesson variant (from their accessibility settings), cached per worker
+    CONTENT_VARIANT_PREFERENCE_TTL_SECONDS: int = 60
+    CONTENT_VARIANT_PREFERENCE_MAX_SIZE: int = 10_000
     
     # First superuser
     FIRST_SUPERUSER_EMAIL: str = "admin@example.com"
@@ -0,0 +1,88 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, TypeVar
+
+T = TypeVar("T")
+
+class PasswordHashPoolFull(Exception):
+    """
+    Raised when more hashing jobs are waiting than the pool is allowed to queue
+    """
+
+class PasswordHashPool:
+    """
+    Bounded worker pool that keeps bcrypt hashing off the event loop.
+
+    bcrypt releases the GIL while hashing, so plain threads scale with the
+    number of cores without the pickling and start-up cost of processes.
+    ``max_workers`` caps how many hashes run at once and ``max_queue`` caps
+    how many may wait behind them before callers are turned away.
+    """
+
+    def __init__(self, max_workers: int, max_queue: int) -> None:
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="password-hash"
+        )
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._running = 0
+        self._max_queue_depth = 0
+        self._completed = 0
+        self._rejected = 0
+        self._queue_wait_total = 0.0
+        self._run_time_total = 0.0
+
+    @property
+    def queue_depth(self) -> int:
+        return self._pending - self._running
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        """
+        Run ``fn(*args)`` on a pool thread and await its result
+        """
+        with self._lock:
+            if self._pending >= self.max_workers + self.max_queue:
+                self._rejected += 1
+                raise PasswordHashPoolFull()
+            self._pending += 1
+            self._max_queue_depth = max(self._max_queue_depth, self.queue_depth)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, self._timed, time.perf_counter(), fn, args
+        )
+
+    def _timed(self, submitted: float, fn: Callable[..., T], args: Any) -> T:
+        started = time.perf_counter()
+        with self._lock:
+            self._running += 1
+            self._queue_wait_total += started - submitted
+        try:
+            return fn(*args)
+        finally:
+            with self._lock:
+                self._running -= 1
+                self._pending -= 1
+                self._completed += 1
+                self._run_time_total += time.perf_counter() - started
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            completed = self._completed or 1
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "running": self._running,
+                "queue_depth": self.queue_depth,
+                "max_queue_depth": self._max_queue_depth,
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "avg_queue_wait_ms": round(self._queue_wait_total / completed * 1000, 3),
+                "avg_run_time_ms": round(self._run_time_total / completed * 1000, 3),
+            }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=True)
@@ -0,0 +1,117 @@
+import json
+import logging
+import os
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+from app.core.config import Settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_KID = "default"
+
+class KeyRingError(Exception):
+    pass
+
+class KeyRing:
+    """
+    JWT signing keys identified by ``kid``.
+
+    Tokens are signed with the active key and carry its ``kid`` header;
+    verification looks the ``kid`` up among all loaded keys, so retired keys
+    keep validating until they are removed. Keys are parsed once and cached;
+    a keys file is re-read when its modification time changes, checked at
+    most every ``reload_seconds`` or straight away when a token names an
+    unknown ``kid`` (i.e. another worker already rotated).
+    """
+
+    def __init__(
+        self,
+        load: Callable[[], Tuple[str, Dict[str, str]]],
+        version: Callable[[], Optional[float]] = lambda: None,
+        reload_seconds: float = 30,
+    ) -> None:
+        self._load = load
+        self._version = version
+        self.reload_seconds = reload_seconds
+        self._lock = threading.Lock()
+        self._loaded_version: Optional[float] = None
+        self._checked_at = 0.0
+        self.active_kid, self.keys = self._reload()
+
+    def _reload(self) -> Tuple[str, Dict[str, str]]:
+        self._loaded_version = self._version()
+        self._checked_at = time.monotonic()
+        active_kid, keys = self._load()
+        if active_kid not in keys:
+            raise KeyRingError(f"Active key id {active_kid!r} is not in the key ring")
+        return active_kid, keys
+
+    def _refresh(self, force: bool = False) -> None:
+        now = time.monotonic()
+        if not force and now - self._checked_at < self.reload_seconds:
+            return
+        with self._lock:
+            self._checked_at = now
+            if self._version() == self._loaded_version:
+                return
+            try:
+                self.active_kid, self.keys = self._reload()
+                logger.info("Reloaded JWT key ring (active kid %s)", self.active_kid)
+            except (OSError, ValueError, KeyRingError):
+                logger.exception("Keeping the previous JWT key ring; reload failed")
+
+    def signing_key(self) -> Tuple[str, str]:
+        self._refresh()
+        return self.active_kid, self.keys[self.active_kid]
+
+    def verification_key(self, kid: Optional[str]) -> Optional[str]:
+        self._refresh()
+        if kid is None:
+            # Tokens minted before key ids were introduced
+            kid = DEFAULT_KID if DEFAULT_KID in self.keys else self.active_kid
+        if kid not in self.keys:
+            self._refresh(force=True)
+        return self.keys.get(kid)
+
+def parse_keys(value: str) -> Dict[str, str]:
+    keys = {}
+    for item in value.split(","):
+        kid, sep, secret = item.strip().partition(":")
+        if not sep or not kid or not secret:
+            raise KeyRingError("JWT_KEYS entries must look like kid:secret")
+        keys[kid] = secret
+    return keys
+
+def load_keys_file(path: str) -> Tuple[str, Dict[str, str]]:
+    with open(path) as keys_file:
+        data = json.load(keys_file)
+    keys = data.get("keys") or {}
+    if not isinstance(keys, dict) or not keys:
+        raise KeyRingError(f"{path} defines no keys")
+    return data.get("active_kid") or next(iter(keys)), keys
+
+def key_ring_from_settings(settings: Settings) -> KeyRing:
+    if settings.JWT_KEYS_FILE:
+        path = settings.JWT_KEYS_FILE
+
+        def version() -> Optional[float]:
+            try:
+                return os.stat(path).st_mtime
+            except OSError:
+                return None
+
+        return KeyRing(lambda: load_keys_file(path), version, settings.JWT_KEYS_RELOAD_SECONDS)
+
+    if settings.JWT_KEYS:
+        keys = parse_keys(settings.JWT_KEYS)
+        active_kid = settings.JWT_ACTIVE_KID or next(iter(keys))
+        return KeyRing(lambda: (active_kid, keys))
+
+    if "SECRET_KEY" not in settings.__fields_set__:
+        logger.warning(
+            "No JWT keys configured and SECRET_KEY is generated per process; "
+            "tokens will only be accepted by the worker that issued them"
+        )
+    return KeyRing(lambda: (DEFAULT_KID, {DEFAULT_KID: settings.SECRET_KEY}))
@@ -0,0 +1,19 @@
+from typing import Any, Callable, Dict
+
+# Process-local metrics registry. Components register a collector that returns
+# their current counters and gauges; GET /metrics reports a snapshot of all of them.
+Collector = Callable[[], Dict[str, Any]]
+
+_collectors: Dict[str, Collector] = {}
+
+def register(name: str, collector: Collector) -> None:
+    """
+    Register (or replace) the collector reported under ``name``
+    """
+    _collectors[name] = collector
+
+def snapshot() -> Dict[str, Dict[str, Any]]:
+    """
+    Collect the current values from every registered component
+    """
+    return {name: collector() for name, collector in _collectors.items()}
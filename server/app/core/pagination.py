@@ -0,0 +1,49 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Tuple
+
+# Opaque keyset cursors: the sort key of the last row on a page, JSON encoded
+# and base64url wrapped so clients treat it as a token rather than parse it.
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+class InvalidCursor(ValueError):
+    pass
+
+def encode_cursor(*key: Any) -> str:
+    values = [value.isoformat() if isinstance(value, datetime) else value for value in key]
+    raw = json.dumps(values, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+def decode_cursor(cursor: str) -> List[Any]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except (ValueError, TypeError):
+        raise InvalidCursor(cursor)
+    if not isinstance(values, list):
+        raise InvalidCursor(cursor)
+    return values
+
+def decode_created_at_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Decode a ``(created_at, id)`` cursor
+    """
+    values = decode_cursor(cursor)
+    try:
+        created_at, row_id = values
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (ValueError, TypeError):
+        raise InvalidCursor(cursor)
+
+def decode_id_cursor(cursor: str) -> int:
+    """
+    Decode an ``id`` cursor
+    """
+    values = decode_cursor(cursor)
+    try:
+        (row_id,) = values
+        return int(row_id)
+    except (ValueError, TypeError):
+        raise InvalidCursor(cursor)
@@ -0,0 +1,89 @@
+import hashlib
+import re
+import textwrap
+from typing import List
+
+# Part of every content hash: bump it whenever render_html's output changes,
+# then run scripts/render_lessons.py so stored HTML is brought up to date
+RENDERER_VERSION = "1"
+
+MARKDOWN_EXTENSIONS = ["fenced_code", "codehilite", "tables", "sane_lists"]
+# Pygments emits <span class="..."> tokens; the client ships the stylesheet
+CODE_CSS_CLASS = "highlight"
+
+ALLOWED_TAGS = [
+    "a", "abbr", "b", "blockquote", "br", "code", "del", "div", "em", "h1", "h2", "h3",
+    "h4", "h5", "h6", "hr", "i", "img", "li", "ol", "p", "pre", "span", "strong",
+    "table", "tbody", "td", "th", "thead", "tr", "ul",
+]
+ALLOWED_ATTRIBUTES = {
+    "a": ["href", "title"],
+    "abbr": ["title"],
+    "img": ["src", "alt", "title"],
+    "code": ["class"],
+    "div": ["class"],
+    "pre": ["class"],
+    "span": ["class"],
+    "td": ["align"],
+    "th": ["align"],
+}
+ALLOWED_PROTOCOLS = ["http", "https", "mailto"]
+
+FENCE = re.compile(r"^\s*(```|~~~)")
+LIST_ITEM = re.compile(r"^\s*([-*+]|\d+\.)\s+")
+
+def content_hash(content: str) -> str:
+    """
+    Identifies ``content`` as rendered by the current renderer
+    """
+    return hashlib.sha256(f"{RENDERER_VERSION}\0{content}".encode()).hexdigest()
+
+def separate_lists(text: str) -> str:
+    """
+    Lesson text often starts a list right under a paragraph, which Markdown
+    would read as part of the paragraph; add the blank line it expects
+    """
+    lines: List[str] = []
+    in_fence = False
+    for line in text.split("\n"):
+        if FENCE.match(line):
+            in_fence = not in_fence
+        elif (
+            not in_fence
+            and LIST_ITEM.match(line)
+            and lines
+            and lines[-1].strip()
+            and not LIST_ITEM.match(lines[-1])
+        ):
+            lines.append("")
+        lines.append(line)
+    return "\n".join(lines)
+
+def render_html(content: str, *, code_css_class: str = CODE_CSS_CLASS) -> str:
+    """
+    Lesson Markdown as sanitized HTML with syntax-highlighted code blocks.
+
+    Content written inside indented Python strings is dedented first. Any
+    HTML in the source that is not on the allow-list is stripped, so the
+    result is safe to insert into the page as-is.
+    """
+    # Imported on first render: API workers import this module through the
+    # models and repositories but mostly serve stored HTML, so they needn't
+    # load Markdown, bleach and Pygments
+    import bleach
+    import markdown
+
+    source = separate_lists(textwrap.dedent(content or "").strip("\n"))
+    html = markdown.markdown(
+        source,
+        extensions=MARKDOWN_EXTENSIONS,
+        extension_configs={"codehilite": {"css_class": code_css_class, "guess_lang": False}},
+        output_format="html",
+    )
+    return bleach.clean(
+        html,
+        tags=ALLOWED_TAGS,
+        attributes=ALLOWED_ATTRIBUTES,
+        protocols=ALLOWED_PROTOCOLS,
+        strip=True,
+    )
@@ -1,12 +1,25 @@
 from datetime import datetime, timedelta
-from typing import Any, Union, Optional
+from typing import Any, Dict, Union, Optional
 
-from jose import jwt
+from jose import jwt, JWTError
 from passlib.context import CryptContext
+from app.core import metrics
 from app.core.config import settings
+from app.core.hashing import PasswordHashPool
+from app.core.keyring import key_ring_from_settings
+
+ALGORITHM = "HS256"
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+key_ring = key_ring_from_settings(settings)
+
+password_hash_pool = PasswordHashPool(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE,
+)
+metrics.register("password_hash_pool", lambda: password_hash_pool.stats())
+
 def create_access_token(
     subject: Union[str, Any], expires_delta: Optional[timedelta] = None
 ) -> str:
@@ -20,9 +33,20 @@ def create_access_token(
             minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
         )
     to_encode = {"exp": expire, "sub": str(subject)}
-    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm="HS256")
+    kid, key = key_ring.signing_key()
+    encoded_jwt = jwt.encode(to_encode, key, algorithm=ALGORITHM, headers={"kid": kid})
     return encoded_jwt
 
+def decode_access_token(token: str) -> Dict[str, Any]:
+    """
+    Verify a JWT access token against the key named by its kid header
+    """
+    kid = jwt.get_unverified_header(token).get("kid")
+    key = key_ring.verification_key(kid)
+    if key is None:
+        raise JWTError(f"Unknown signing key id {kid!r}")
+    return jwt.decode(token, key, algorithms=[ALGORITHM])
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
     Verify a password against a hash
@@ -33,4 +57,16 @@ def get_password_hash(password: str) -> str:
     """
     Hash a password
     """
-    return pwd_context.hash(password) 
\ No newline at end of file
+    return pwd_context.hash(password)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    Verify a password against a hash on the password hashing pool
+    """
+    return await password_hash_pool.run(verify_password, plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+    """
+    Hash a password on the password hashing pool
+    """
+    return await password_hash_pool.run(get_password_hash, password)
@@ -0,0 +1,97 @@
+import asyncio
+from typing import Any, Dict, Optional, Set
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core import metrics
+from app.core.cache import RedisCache, TTLCache, redis_client_from_url
+from app.core.config import settings
+from app.models import User
+
+# Columns kept for an authenticated user. The password hash is deliberately
+# left out so it never sits in a shared cache.
+CACHED_USER_FIELDS = ("id", "email", "full_name", "is_active", "is_superuser")
+
+class UserCache:
+    """
+    Short-lived cache of authenticated users keyed by id.
+
+    A per-process LRU answers most lookups; an optional shared tier lets
+    workers warm each other. Cached users come back as transient ``User``
+    instances carrying only ``CACHED_USER_FIELDS``. Entries are dropped when a
+    user row is updated or deleted through the ORM; other workers' local
+    entries expire within ``USER_CACHE_TTL_SECONDS``.
+    """
+
+    def __init__(self, local: TTLCache, remote: Optional[RedisCache] = None) -> None:
+        self.local = local
+        self.remote = remote
+        self._pending: Set[asyncio.Task] = set()
+
+    async def get(self, user_id: int) -> Optional[User]:
+        data = self.local.get(user_id)
+        if data is None and self.remote is not None:
+            data = await self.remote.get(user_id)
+            if data is not None:
+                self.local.set(user_id, data)
+        return User(**data) if data is not None else None
+
+    async def set(self, user: User) -> None:
+        data = {field: getattr(user, field) for field in CACHED_USER_FIELDS}
+        self.local.set(user.id, data)
+        if self.remote is not None:
+            await self.remote.set(user.id, data)
+
+    def invalidate(self, user_id: int) -> None:
+        self.local.delete(user_id)
+        if self.remote is None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Outside the event loop (scripts); the shared entry expires on its own
+            return
+        task = loop.create_task(self.remote.delete(user_id))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    def stats(self) -> Dict[str, Any]:
+        stats = self.local.stats()
+        if self.remote is not None:
+            stats["remote"] = self.remote.stats()
+        return stats
+
+def build_user_cache() -> UserCache:
+    remote = None
+    if settings.USER_CACHE_REDIS_URL:
+        remote = RedisCache(
+            redis_client_from_url(settings.USER_CACHE_REDIS_URL),
+            prefix="user",
+            ttl_seconds=settings.USER_CACHE_TTL_SECONDS,
+        )
+    return UserCache(
+        TTLCache(settings.USER_CACHE_MAX_SIZE, settings.USER_CACHE_TTL_SECONDS),
+        remote,
+    )
+
+user_cache = build_user_cache()
+metrics.register("user_cache", lambda: user_cache.stats())
+
+# Invalidate after commit rather than at flush so a concurrent request can't
+# re-cache the old row between the UPDATE and the COMMIT
+@event.listens_for(Session, "after_flush")
+def _collect_changed_users(session: Session, flush_context: Any) -> None:
+    changed = session.info.setdefault("changed_user_ids", set())
+    for obj in list(session.dirty) + list(session.deleted):
+        if isinstance(obj, User) and obj.id is not None:
+            changed.add(obj.id)
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed_users(session: Session) -> None:
+    for user_id in session.info.pop("changed_user_ids", ()):
+        user_cache.invalidate(user_id)
+
+@event.listens_for(Session, "after_rollback")
+def _forget_changed_users(session: Session) -> None:
+    session.info.pop("changed_user_ids", None)
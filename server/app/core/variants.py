@@ -0,0 +1,162 @@
+import re
+import textwrap
+from itertools import combinations
+from typing import Any, Dict, List, Mapping, Optional
+
+from app.core.rendering import CODE_CSS_CLASS, FENCE, render_html
+
+# Stored with every variant: bump it whenever a transform below changes, then
+# run scripts/generate_content_variants.py to regenerate them
+VARIANT_VERSION = "1"
+
+# Presentations a variant can combine, in the order they are applied and
+# appear in a variant key
+FEATURES = ("simplified", "chunked", "large_code")
+
+# UserPreference.accessibility_settings flags and the feature each one asks for
+PREFERENCE_FEATURES = {
+    "simplified_language": "simplified",
+    "chunked_steps": "chunked",
+    "large_code_font": "large_code",
+}
+
+# Every non-empty combination, e.g. "simplified+large_code"
+VARIANT_KEYS = [
+    "+".join(features)
+    for size in range(1, len(FEATURES) + 1)
+    for features in combinations(FEATURES, size)
+]
+
+# Plain-language replacements, longest phrases first
+PLAIN_WORDS = {
+    "in order to": "to",
+    "prior to": "before",
+    "in addition": "also",
+    "a number of": "some",
+    "approximately": "about",
+    "subsequently": "then",
+    "additional": "more",
+    "demonstrate": "show",
+    "facilitate": "help",
+    "sufficient": "enough",
+    "utilize": "use",
+    "utilise": "use",
+    "numerous": "many",
+    "commence": "start",
+    "terminate": "end",
+    "obtain": "get",
+    "require": "need",
+    "assist": "help",
+}
+PLAIN_WORD = re.compile(
+    r"\b(" + "|".join(re.escape(phrase) for phrase in sorted(PLAIN_WORDS, key=len, reverse=True)) + r")\b",
+    re.IGNORECASE,
+)
+CLAUSE_BREAK = re.compile(r";\s+(\w)")
+HEADING = re.compile(r"^\s{0,3}#{1,6}\s+(.*?)\s*#*\s*$")
+
+# Blocks (paragraphs, lists, code) per step when a section runs long
+BLOCKS_PER_STEP = 2
+
+def variant_key(accessibility_settings: Optional[Mapping[str, Any]]) -> Optional[str]:
+    """
+    The variant asked for by a learner's accessibility settings, or None for
+    the standard presentation
+    """
+    wanted = {
+        feature
+        for setting, feature in PREFERENCE_FEATURES.items()
+        if (accessibility_settings or {}).get(setting)
+    }
+    return "+".join(feature for feature in FEATURES if feature in wanted) or None
+
+def _plain(match: "re.Match[str]") -> str:
+    word = match.group(0)
+    plain = PLAIN_WORDS[word.lower()]
+    return plain.capitalize() if word[0].isupper() else plain
+
+def simplify(text: str) -> str:
+    """
+    Swap formal words for plain ones and split sentences at semicolons.
+    Code blocks and `inline code` are left as they are.
+    """
+    lines = []
+    in_fence = False
+    for line in text.split("\n"):
+        if FENCE.match(line):
+            in_fence = not in_fence
+        elif not in_fence:
+            # Odd segments are inside backticks
+            parts = line.split("`")
+            for index in range(0, len(parts), 2):
+                part = PLAIN_WORD.sub(_plain, parts[index])
+                parts[index] = CLAUSE_BREAK.sub(lambda match: ". " + match.group(1).upper(), part)
+            line = "`".join(parts)
+        lines.append(line)
+    return "\n".join(lines)
+
+def _blocks(text: str) -> List[str]:
+    # Blank-line separated blocks; a fenced code block stays in one piece
+    blocks: List[str] = []
+    current: List[str] = []
+    in_fence = False
+    for line in text.split("\n"):
+        if FENCE.match(line):
+            in_fence = not in_fence
+        if not line.strip() and not in_fence:
+            if current:
+                blocks.append("\n".join(current))
+                current = []
+            continue
+        current.append(line)
+        # A heading is a block of its own
+        if not in_fence and len(current) == 1 and HEADING.match(line):
+            blocks.append(line)
+            current = []
+    if current:
+        blocks.append("\n".join(current))
+    return blocks
+
+def chunk(text: str) -> str:
+    """
+    Break the lesson into numbered steps: one per heading, and a new one
+    every ``BLOCKS_PER_STEP`` blocks within a long section
+    """
+    steps: List[Dict[str, Any]] = []
+    for block in _blocks(text):
+        heading = HEADING.match(block)
+        if heading:
+            steps.append({"title": heading.group(1), "blocks": []})
+        elif not steps or len(steps[-1]["blocks"]) >= BLOCKS_PER_STEP:
+            steps.append({"title": None, "blocks": [block]})
+        else:
+            steps[-1]["blocks"].append(block)
+    sections = []
+    for number, step in enumerate(steps, start=1):
+        title = f"### Step {number} of {len(steps)}"
+        if step["title"]:
+            title += f": {step['title']}"
+        sections.append("\n\n".join([title] + step["blocks"]))
+    return "\n\n---\n\n".join(sections)
+
+def render_variant(content: str, key: str) -> str:
+    """
+    ``content`` rendered as the variant ``key``; the client styles
+    ``large-code`` blocks
+    """
+    features = key.split("+")
+    text = textwrap.dedent(content or "").strip("\n")
+    if "simplified" in features:
+        text = simplify(text)
+    if "chunked" in features:
+        text = chunk(text)
+    code_css_class = CODE_CSS_CLASS
+    if "large_code" in features:
+        code_css_class += " large-code"
+    return render_html(text, code_css_class=code_css_class)
+
+def render_variants(content: str) -> Dict[str, str]:
+    """
+    Every variant of ``content`` by key. Module-level so a process pool can run it.
+    """
+    return {key: render_variant(content, key) for key in VARIANT_KEYS}
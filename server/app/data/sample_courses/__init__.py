@@ -0,0 +1,101 @@
+import importlib
+import json
+import os
+import pkgutil
+import threading
+from typing import Any, Dict, List, Optional
+
+from app.schemas.sample_content import SampleCourse
+
+# Optional precompiled snapshot written by scripts/build_sample_snapshot.py:
+# index.json holds the listing and <course_id>.json each course, already
+# serialized, so production workers never import or validate the course modules.
+SNAPSHOT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "snapshot")
+SNAPSHOT_INDEX = "index.json"
+
+def listing_item(course_id: str, course: SampleCourse) -> Dict[str, Any]:
+    return {
+        "id": course_id,
+        "title": course.title,
+        "description": course.description,
+        "difficulty_level": course.difficulty_level,
+        "estimated_duration": course.estimated_duration,
+    }
+
+class SampleCourseRegistry:
+    """
+    Sample courses discovered by id and loaded on first use.
+
+    Each module in this package defines one course; its module name is the
+    course id and it exports ``sample_courses = {course_id: SampleCourse}``.
+    Discovery only lists module names, so nothing is imported or validated
+    until a course is requested. When a snapshot exists it is served instead
+    and the modules are never imported.
+    """
+
+    def __init__(self, snapshot_dir: Optional[str] = SNAPSHOT_DIR) -> None:
+        self.snapshot_dir = snapshot_dir
+        self._courses: Dict[str, SampleCourse] = {}
+        self._lock = threading.Lock()
+        self._index: Optional[List[Dict[str, Any]]] = None
+        self._module_ids = sorted(
+            module.name for module in pkgutil.iter_modules(__path__)
+            if not module.name.startswith("_")
+        )
+        if snapshot_dir and os.path.exists(os.path.join(snapshot_dir, SNAPSHOT_INDEX)):
+            with open(os.path.join(snapshot_dir, SNAPSHOT_INDEX), "rb") as index_file:
+                self._index = json.load(index_file)["courses"]
+
+    @property
+    def uses_snapshot(self) -> bool:
+        return self._index is not None
+
+    def course_ids(self) -> List[str]:
+        if self._index is not None:
+            return [item["id"] for item in self._index]
+        return self._module_ids
+
+    def get(self, course_id: str) -> Optional[SampleCourse]:
+        """
+        Import and validate a course module the first time it is asked for
+        """
+        if course_id not in self._module_ids:
+            return None
+        with self._lock:
+            if course_id not in self._courses:
+                # Imported here so workers serving the snapshot never load
+                # the Markdown, bleach and Pygments stack
+                from app.core.rendering import render_html
+
+                module = importlib.import_module(f"{__name__}.{course_id}")
+                course = module.sample_courses[course_id]
+                # Rendered once per process here, or once per deploy into the snapshot
+                for sample_module in course.modules:
+                    for lesson in sample_module.lessons:
+                        lesson.content_html = render_html(lesson.content)
+                self._courses[course_id] = course
+            return self._courses[course_id]
+
+    def course_json(self, course_id: str) -> Optional[bytes]:
+        if self._index is not None:
+            if course_id not in self.course_ids():
+                return None
+            with open(os.path.join(self.snapshot_dir, f"{course_id}.json"), "rb") as course_file:
+                return course_file.read()
+        course = self.get(course_id)
+        return course.json().encode() if course is not None else None
+
+    def listing(self) -> List[Dict[str, Any]]:
+        if self._index is not None:
+            return self._index
+        return [listing_item(course_id, self.get(course_id)) for course_id in self.course_ids()]
+
+    def write_snapshot(self, snapshot_dir: str) -> None:
+        os.makedirs(snapshot_dir, exist_ok=True)
+        for course_id in self.course_ids():
+            with open(os.path.join(snapshot_dir, f"{course_id}.json"), "wb") as course_file:
+                course_file.write(self.get(course_id).json().encode())
+        with open(os.path.join(snapshot_dir, SNAPSHOT_INDEX), "w") as index_file:
+            json.dump({"courses": self.listing()}, index_file)
+
+sample_course_registry = SampleCourseRegistry()
@@ -432,5 +432,7 @@ digital_content_course = SampleCourse(
     ]
 )
 
-# Add to sample courses
-sample_courses["digital_content_creation"] = digital_content_course 
\ No newline at end of file
+# Export the sample course
+sample_courses = {
+    "digital_content_creation": digital_content_course
+} 
\ No newline at end of file
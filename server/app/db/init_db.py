@@ -1,4 +1,8 @@
 import logging
+import os
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import inspect
 from sqlalchemy.orm import Session
 from app.db.session import Base, engine
 from app.core.config import settings
@@ -8,11 +12,34 @@ from app.core.security import get_password_hash
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+INITIAL_REVISION = "20230601_initial"
+
+def alembic_config() -> Config:
+    config = Config(os.path.join(SERVER_DIR, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(SERVER_DIR, "alembic"))
+    return config
+
+def migrate_database() -> None:
+    """
+    Bring the schema up to date. Runs once per deployment, before any API
+    worker starts, instead of every worker creating tables on import.
+    """
+    config = alembic_config()
+    tables = set(inspect(engine).get_table_names())
+    if not tables:
+        # Fresh database: build the current models and mark them as migrated
+        Base.metadata.create_all(bind=engine)
+        command.stamp(config, "head")
+        logger.info("Created database tables")
+    else:
+        if "alembic_version" not in tables:
+            # Created by the old import-time create_all, which matches the initial revision
+            command.stamp(config, INITIAL_REVISION)
+        command.upgrade(config, "head")
+        logger.info("Applied database migrations")
+
 def init_db(db: Session) -> None:
-    # Create tables
-    Base.metadata.create_all(bind=engine)
-    logger.info("Created database tables")
-    
     # Check if we need to create a first superuser
     user = db.query(User).filter(User.email == settings.FIRST_SUPERUSER_EMAIL).first()
     if not user:
@@ -42,6 +69,7 @@ def init_db(db: Session) -> None:
 def main() -> None:
     from app.db.session import SessionLocal
     
+    migrate_database()
     db = SessionLocal()
     try:
         logger.info("Initializing database")
@@ -0,0 +1,105 @@
+from typing import Dict, List
+
+from sqlalchemy import DDL, event
+
+from app.db.session import Base
+
+# Text search configuration used for stemming on PostgreSQL
+SEARCH_CONFIG = "english"
+
+def weighted_tsvector(title_column: str, body_column: str) -> str:
+    """
+    Generated-column expression for PostgreSQL: title words rank above body words
+    """
+    return (
+        f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce({title_column}, '')), 'A') || "
+        f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce({body_column}, '')), 'B')"
+    )
+
+# SQLite has no tsvector, so development databases mirror the searchable text
+# into one FTS5 table kept in sync by triggers. Each row's rowid is
+# id * 4 + kind code, so a trigger can find and replace it without a scan.
+# alembic/versions/20261017_search.py holds a frozen copy of this DDL and of
+# weighted_tsvector: changing either needs a new migration.
+SQLITE_KINDS: Dict[str, int] = {"course": 1, "module": 2, "lesson": 3}
+
+SQLITE_SEARCH_DDL: List[str] = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5(
+        title, body, kind UNINDEXED, entity_id UNINDEXED, course_id UNINDEXED,
+        tokenize = 'porter unicode61'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS courses_search_insert AFTER INSERT ON courses BEGIN
+        INSERT INTO search_index (rowid, title, body, kind, entity_id, course_id)
+        VALUES (new.id * 4 + 1, new.title, coalesce(new.description, ''), 'course', new.id, new.id);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS courses_search_update AFTER UPDATE OF title, description ON courses BEGIN
+        DELETE FROM search_index WHERE rowid = old.id * 4 + 1;
+        INSERT INTO search_index (rowid, title, body, kind, entity_id, course_id)
+        VALUES (new.id * 4 + 1, new.title, coalesce(new.description, ''), 'course', new.id, new.id);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS courses_search_delete AFTER DELETE ON courses BEGIN
+        DELETE FROM search_index WHERE rowid = old.id * 4 + 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS modules_search_insert AFTER INSERT ON modules BEGIN
+        INSERT INTO search_index (rowid, title, body, kind, entity_id, course_id)
+        VALUES (new.id * 4 + 2, new.title, coalesce(new.description, ''), 'module', new.id, new.course_id);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS modules_search_update AFTER UPDATE OF title, description, course_id ON modules BEGIN
+        DELETE FROM search_index WHERE rowid = old.id * 4 + 2;
+        INSERT INTO search_index (rowid, title, body, kind, entity_id, course_id)
+        VALUES (new.id * 4 + 2, new.title, coalesce(new.description, ''), 'module', new.id, new.course_id);
+        UPDATE search_index SET course_id = new.course_id
+        WHERE new.course_id IS NOT old.course_id
+          AND rowid IN (SELECT id * 4 + 3 FROM lessons WHERE module_id = new.id);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS modules_search_delete AFTER DELETE ON modules BEGIN
+        DELETE FROM search_index WHERE rowid = old.id * 4 + 2;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS lessons_search_insert AFTER INSERT ON lessons BEGIN
+        INSERT INTO search_index (rowid, title, body, kind, entity_id, course_id)
+        VALUES (new.id * 4 + 3, new.title, coalesce(new.content, ''), 'lesson', new.id,
+                (SELECT course_id FROM modules WHERE id = new.module_id));
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS lessons_search_update AFTER UPDATE OF title, content, module_id ON lessons BEGIN
+        DELETE FROM search_index WHERE rowid = old.id * 4 + 3;
+        INSERT INTO search_index (rowid, title, body, kind, entity_id, course_id)
+        VALUES (new.id * 4 + 3, new.title, coalesce(new.content, ''), 'lesson', new.id,
+                (SELECT course_id FROM modules WHERE id = new.module_id));
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS lessons_search_delete AFTER DELETE ON lessons BEGIN
+        DELETE FROM search_index WHERE rowid = old.id * 4 + 3;
+    END
+    """,
+]
+
+SQLITE_SEARCH_DROP: List[str] = [
+    f"DROP TRIGGER IF EXISTS {table}_search_{action}"
+    for table in ("courses", "modules", "lessons")
+    for action in ("insert", "update", "delete")
+] + ["DROP TABLE IF EXISTS search_index"]
+
+# Databases built with metadata.create_all (an empty database in init_db,
+# benchmarks) get the mirror too; migrated ones get it from Alembic
+for statement in SQLITE_SEARCH_DDL:
+    event.listen(Base.metadata, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+for statement in SQLITE_SEARCH_DROP:
+    event.listen(Base.metadata, "before_drop", DDL(statement).execute_if(dialect="sqlite"))
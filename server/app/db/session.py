@@ -1,4 +1,5 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
@@ -21,6 +22,59 @@ else:
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+
+def get_async_database_uri(uri: str) -> str:
+    """
+    Map a synchronous database URL onto its asyncio driver
+    (asyncpg for PostgreSQL, aiosqlite for SQLite).
+    """
+    scheme, sep, rest = uri.partition("://")
+    dialect = scheme.split("+", 1)[0]
+    if dialect == "sqlite":
+        return f"sqlite+aiosqlite{sep}{rest}"
+    if dialect in ("postgresql", "postgres"):
+        return f"postgresql+asyncpg{sep}{rest}"
+    return uri
+
+
+# Async engine used by the request handlers so queries never block the event loop
+if is_sqlite:
+    async_engine = create_async_engine(
+        get_async_database_uri(settings.SQLALCHEMY_DATABASE_URI),
+        connect_args={"check_same_thread": False},
+        pool_pre_ping=True
+    )
+else:
+    async_engine = create_async_engine(
+        get_async_database_uri(settings.SQLALCHEMY_DATABASE_URI),
+        pool_pre_ping=True,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW
+    )
+
+# expire_on_commit=False so committed objects can still be serialized
+# without triggering an implicit (and, under asyncio, illegal) reload
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
+async def warm_connection_pool(connections: int) -> None:
+    """
+    Open ``connections`` pooled connections up front so the first requests
+    don't pay for connection setup. Never touches the schema.
+    """
+    count = 1 if is_sqlite else max(1, min(connections, settings.DB_POOL_SIZE))
+    # Hold every connection until all are open so the pool keeps distinct ones
+    opened = []
+    try:
+        for _ in range(count):
+            conn = await async_engine.connect()
+            opened.append(conn)
+            await conn.execute(text("SELECT 1"))
+    finally:
+        for conn in opened:
+            await conn.close()
+
 Base = declarative_base()
 
 # Dependency
@@ -29,4 +83,4 @@ def get_db():
     try:
         yield db
     finally:
-        db.close() 
\ No newline at end of file
+        db.close()
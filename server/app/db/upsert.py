@@ -0,0 +1,16 @@
+from typing import List
+
+from app.db.session import is_sqlite
+
+if is_sqlite:
+    from sqlalchemy.dialects.sqlite import insert as dialect_insert
+else:
+    from sqlalchemy.dialects.postgresql import insert as dialect_insert
+
+def insert_or_ignore(model, index_elements: List[str]):
+    """
+    ``INSERT ... ON CONFLICT (index_elements) DO NOTHING`` for the configured
+    database. PostgreSQL and SQLite (3.35+) both accept RETURNING on it, which
+    yields only the rows that were actually inserted.
+    """
+    return dialect_insert(model).on_conflict_do_nothing(index_elements=index_elements)
@@ -1,17 +1,42 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.core import metrics, security
 from app.core.config import settings
-from app.db.session import engine
-from app.models import Base
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.db.session import async_engine, warm_connection_pool
 from app.api.v1.api import api_router
+from app.services.llm import close_llm_provider
+from app.services.tutor_log import tutor_log_buffer
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
+# The schema is managed by scripts/init_db.py (Alembic), run once per deploy
+# before the workers start; workers only warm their connection pool.
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await warm_connection_pool(settings.DB_POOL_WARM_CONNECTIONS)
+    tutor_log_buffer.start()
+    # Only runs when RECOMMENDATION_REFRESH_SECONDS is set; otherwise workers
+    # just read the table scripts/refresh_recommendations.py fills, and never
+    # import NumPy and SciPy
+    recommendation_refresher = None
+    if settings.RECOMMENDATION_REFRESH_SECONDS > 0:
+        from app.services.recommendations import recommendation_refresher
+        recommendation_refresher.start()
+    yield
+    if recommendation_refresher is not None:
+        await recommendation_refresher.stop()
+    security.password_hash_pool.shutdown()
+    await close_llm_provider()
+    # Write out buffered tutor analytics before the engine goes away
+    await tutor_log_buffer.stop()
+    await async_engine.dispose()
 
 app = FastAPI(
     title=settings.SERVER_NAME,
-    openapi_url=f"{settings.API_V1_STR}/openapi.json"
+    openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    lifespan=lifespan
 )
 
 # Set up CORS middleware
@@ -21,6 +46,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
 # Include API router
@@ -32,4 +58,8 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy"} 
\ No newline at end of file
+    return {"status": "healthy"}
+
+@app.get("/metrics")
+async def read_metrics():
+    return metrics.snapshot() 
\ No newline at end of file
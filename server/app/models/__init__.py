@@ -2,7 +2,10 @@ from app.db.session import Base
 from app.models.user import User
 from app.models.course import Course, Module, Lesson, Category, CourseProgress, LessonCompletion
 from app.models.user_preference import UserPreference
-from app.models.message import Message
+from app.models.message import Message, ConversationSummary
+from app.models.tutor_log import TutorLog
+from app.models.recommendation import CourseRecommendation
+from app.models.content_variant import ContentVariant
 
 # For type checking
 __all__ = [
@@ -15,5 +18,9 @@ __all__ = [
     "CourseProgress",
     "LessonCompletion",
     "UserPreference",
-    "Message"
+    "Message",
+    "ConversationSummary",
+    "TutorLog",
+    "CourseRecommendation",
+    "ContentVariant"
 ]
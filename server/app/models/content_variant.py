@@ -0,0 +1,24 @@
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, Text
+
+from app.db.session import Base
+
+class ContentVariant(Base):
+    """
+    A lesson rendered for one accessibility presentation (simplified
+    language, chunked steps, larger code font, or a combination).
+
+    Generated offline by scripts/generate_content_variants.py; a variant is
+    only served while ``source_hash`` matches the lesson's ``content_hash``
+    and ``version`` matches ``VARIANT_VERSION``.
+    """
+    __tablename__ = "content_variants"
+
+    lesson_id = Column(Integer, ForeignKey("lessons.id", ondelete="CASCADE"), primary_key=True)
+    # One of app.core.variants.VARIANT_KEYS, e.g. "simplified+large_code"
+    variant_key = Column(String(64), primary_key=True)
+    source_hash = Column(String(64), nullable=False)
+    version = Column(String(16), nullable=False)
+    content_html = Column(Text, nullable=False)
+    generated_at = Column(DateTime, default=datetime.utcnow, nullable=False)
@@ -1,9 +1,12 @@
-from sqlalchemy import Column, Integer, String, Text, Float, ForeignKey, Table, Boolean, DateTime, Enum
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Computed, Integer, String, Text, Float, ForeignKey, Table, Boolean, DateTime, Enum, Index, event, inspect
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred, relationship
 from datetime import datetime
 import enum
 
 from app.db.session import Base
+from app.db.search import weighted_tsvector
+from app.core.rendering import content_hash, render_html
 from app.core.config import settings
 
 # Check if we're using SQLite
@@ -14,7 +17,8 @@ course_category = Table(
     "course_category",
     Base.metadata,
     Column("course_id", Integer, ForeignKey("courses.id")),
-    Column("category_id", Integer, ForeignKey("categories.id"))
+    Column("category_id", Integer, ForeignKey("categories.id")),
+    Index("ix_course_category_category_id_course_id", "category_id", "course_id")
 )
 
 # Define enum class for course level
@@ -34,6 +38,10 @@ class Category(Base):
 
 class Course(Base):
     __tablename__ = "courses"
+    __table_args__ = (
+        # Keyset pagination order for list_courses
+        Index("ix_courses_created_at_id", "created_at", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, index=True)
@@ -48,6 +56,10 @@ class Course(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     is_published = Column(Boolean, default=False)
+    # Full-text search: a generated tsvector on PostgreSQL, the FTS5 mirror
+    # in app.db.search on SQLite
+    if not is_sqlite:
+        search_vector = deferred(Column(TSVECTOR, Computed(weighted_tsvector("title", "description"))))
     
     # Relationships
     categories = relationship("Category", secondary=course_category, back_populates="courses")
@@ -76,7 +88,9 @@ class Module(Base):
     title = Column(String, index=True)
     description = Column(Text, nullable=True)
     order = Column(Integer)
-    course_id = Column(Integer, ForeignKey("courses.id"))
+    course_id = Column(Integer, ForeignKey("courses.id"), index=True)
+    if not is_sqlite:
+        search_vector = deferred(Column(TSVECTOR, Computed(weighted_tsvector("title", "description"))))
     
     # Relationships
     course = relationship("Course", back_populates="modules")
@@ -90,22 +104,53 @@ class Lesson(Base):
     content = Column(Text)
     video_url = Column(String, nullable=True)
     order = Column(Integer)
-    module_id = Column(Integer, ForeignKey("modules.id"))
+    module_id = Column(Integer, ForeignKey("modules.id"), index=True)
+    # ``content`` rendered to sanitized HTML, and the content_hash it was
+    # rendered from; filled on write, or on first read for rows written
+    # outside the ORM
+    content_html = deferred(Column(Text, nullable=True))
+    content_hash = Column(String(64), nullable=True)
+    if not is_sqlite:
+        search_vector = deferred(Column(TSVECTOR, Computed(weighted_tsvector("title", "content"))))
     
     # Relationships
     module = relationship("Module", back_populates="lessons")
     completions = relationship("LessonCompletion", back_populates="lesson")
     messages = relationship("Message", back_populates="lesson")
 
+@event.listens_for(Lesson, "before_insert")
+@event.listens_for(Lesson, "before_update")
+def render_lesson_content(mapper, connection, lesson: Lesson) -> None:
+    if inspect(lesson).pending or inspect(lesson).attrs.content.history.has_changes():
+        digest = content_hash(lesson.content or "")
+        if digest != lesson.content_hash:
+            lesson.content_html = render_html(lesson.content or "")
+            lesson.content_hash = digest
+
+if not is_sqlite:
+    Index("ix_courses_search_vector", Course.search_vector, postgresql_using="gin")
+    Index("ix_modules_search_vector", Module.search_vector, postgresql_using="gin")
+    Index("ix_lessons_search_vector", Lesson.search_vector, postgresql_using="gin")
+
 class CourseProgress(Base):
     __tablename__ = "course_progresses"
+    __table_args__ = (
+        # One progress row per learner and course
+        Index("ix_course_progresses_user_id_course_id", "user_id", "course_id", unique=True),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
     course_id = Column(Integer, ForeignKey("courses.id"))
     started_at = Column(DateTime, default=datetime.utcnow)
+    # Set when the last lesson is completed, cleared if the course grows
     completed_at = Column(DateTime, nullable=True)
     last_accessed = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Maintained by repositories.progress alongside every completion so
+    # dashboards never have to count lessons
+    completed_lessons = Column(Integer, nullable=False, default=0, server_default="0")
+    total_lessons = Column(Integer, nullable=False, default=0, server_default="0")
+    percent = Column(Float, nullable=False, default=0.0, server_default="0")
     
     # Relationships
     user = relationship("User", back_populates="course_progresses")
@@ -114,11 +159,15 @@ class CourseProgress(Base):
 
 class LessonCompletion(Base):
     __tablename__ = "lesson_completions"
+    __table_args__ = (
+        # A lesson is completed at most once per learner
+        Index("ix_lesson_completions_user_id_lesson_id", "user_id", "lesson_id", unique=True),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
     lesson_id = Column(Integer, ForeignKey("lessons.id"))
-    course_progress_id = Column(Integer, ForeignKey("course_progresses.id"))
+    course_progress_id = Column(Integer, ForeignKey("course_progresses.id"), index=True)
     completed_at = Column(DateTime, default=datetime.utcnow)
     
     # Relationships
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Enum
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Enum, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import enum
@@ -12,6 +12,12 @@ class MessageRole(str, enum.Enum):
 
 class Message(Base):
     __tablename__ = "messages"
+    __table_args__ = (
+        # Serves "the latest N messages of a conversation" without a sort.
+        # Conversations are ordered by id, the key the rolling summary's
+        # watermark uses: created_at can disagree when two turns overlap.
+        Index("ix_messages_user_id_lesson_id_id", "user_id", "lesson_id", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     content = Column(Text, nullable=False)
@@ -19,7 +25,29 @@ class Message(Base):
     user_id = Column(Integer, ForeignKey("users.id"))
     lesson_id = Column(Integer, ForeignKey("lessons.id"), nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
+    # Estimated prompt tokens, counted once when the message is written
+    token_count = Column(Integer, nullable=True)
     
     # Relationships
     user = relationship("User", back_populates="messages")
-    lesson = relationship("Lesson", back_populates="messages") 
\ No newline at end of file
+    lesson = relationship("Lesson", back_populates="messages")
+
+class ConversationSummary(Base):
+    """
+    Rolling summary of the turns that have scrolled out of a conversation's
+    recent window, so prompts never need the whole history
+    """
+    __tablename__ = "conversation_summaries"
+    __table_args__ = (
+        UniqueConstraint("user_id", "conversation_id", name="uq_conversation_summaries_user_id_conversation_id"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    # "lesson-<id>" or "general", as used by the tutor API
+    conversation_id = Column(String, nullable=False)
+    summary = Column(Text, nullable=False, default="")
+    token_count = Column(Integer, nullable=False, default=0)
+    # Messages up to and including this id are folded into the summary
+    summarized_through_id = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
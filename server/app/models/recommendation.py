@@ -0,0 +1,23 @@
+from sqlalchemy import Column, Integer, Float, DateTime, ForeignKey, Index
+from datetime import datetime
+
+from app.db.session import Base
+
+class CourseRecommendation(Base):
+    """
+    One precomputed "next course" suggestion for a learner.
+
+    Rewritten in bulk by the recommendation refresher; requests only read it.
+    """
+    __tablename__ = "course_recommendations"
+    __table_args__ = (
+        # A learner's suggestions are read best first
+        Index("ix_course_recommendations_user_id_rank", "user_id", "rank", unique=True),
+    )
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    course_id = Column(Integer, ForeignKey("courses.id", ondelete="CASCADE"), primary_key=True)
+    # 1 is the best suggestion
+    rank = Column(Integer, nullable=False)
+    score = Column(Float, nullable=False)
+    generated_at = Column(DateTime, default=datetime.utcnow, nullable=False)
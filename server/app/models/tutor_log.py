@@ -0,0 +1,26 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, JSON
+from datetime import datetime
+
+from app.db.session import Base
+
+class TutorLog(Base):
+    """
+    Analytics record of one tutor exchange or piece of lesson feedback.
+
+    Written in bulk by the tutor log buffer, never in the request path.
+    """
+    __tablename__ = "tutor_logs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), index=True)
+    # Conversation the exchange belongs to: "lesson-<id>" or "general"
+    session_id = Column(String, nullable=False)
+    # "chat", "explain" or "feedback"
+    kind = Column(String, nullable=False)
+    context = Column(JSON, nullable=True)
+    user_message = Column(Text, nullable=False, default="")
+    ai_response = Column(Text, nullable=False, default="")
+    feedback_rating = Column(Integer, nullable=True)
+    feedback_comment = Column(Text, nullable=True)
+    latency_ms = Column(Integer, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
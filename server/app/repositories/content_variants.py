@@ -0,0 +1,98 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import JSON, column, delete, insert, select, table, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.variants import VARIANT_KEYS, VARIANT_VERSION
+from app.models import ContentVariant, Lesson, UserPreference
+
+# Just the columns written here: tables migrated from the initial revision
+# lack some of UserPreference's other columns, whose defaults an insert
+# through the model would send
+preference_settings = table(
+    "user_preferences",
+    column("user_id"),
+    column("accessibility_settings", JSON),
+)
+
+async def accessibility_settings(db: AsyncSession, user_id: int) -> Optional[Dict[str, Any]]:
+    return await db.scalar(
+        select(UserPreference.accessibility_settings).where(UserPreference.user_id == user_id)
+    )
+
+async def set_accessibility_settings(db: AsyncSession, user_id: int, settings: Dict[str, Any]) -> None:
+    """
+    Store ``settings`` as the learner's accessibility settings, creating
+    their preference row if they have none
+    """
+    result = await db.execute(
+        update(preference_settings)
+        .where(preference_settings.c.user_id == user_id)
+        .values(accessibility_settings=settings)
+    )
+    if not result.rowcount:
+        await db.execute(insert(preference_settings).values(user_id=user_id, accessibility_settings=settings))
+    await db.commit()
+
+async def lesson_batches(db: AsyncSession, after_id: int, batch_size: int) -> List[Tuple[int, str, Optional[str]]]:
+    """
+    ``(id, content, content_hash)`` of up to ``batch_size`` lessons with an
+    id above ``after_id``, in id order
+    """
+    rows = await db.execute(
+        select(Lesson.id, Lesson.content, Lesson.content_hash)
+        .where(Lesson.id > after_id)
+        .order_by(Lesson.id)
+        .limit(batch_size)
+    )
+    return [tuple(row) for row in rows]
+
+async def current_lesson_ids(db: AsyncSession, lessons: Sequence[Tuple[int, Optional[str]]]) -> Set[int]:
+    """
+    Of the ``(lesson_id, content_hash)`` pairs, the lessons that already have
+    every variant generated from that hash by the current VARIANT_VERSION
+    """
+    hashes = dict(lessons)
+    rows = await db.execute(
+        select(ContentVariant.lesson_id, ContentVariant.variant_key, ContentVariant.source_hash)
+        .where(
+            ContentVariant.lesson_id.in_(list(hashes)),
+            ContentVariant.version == VARIANT_VERSION,
+        )
+    )
+    keys: Dict[int, Set[str]] = {}
+    for lesson_id, key, source_hash in rows:
+        if source_hash == hashes[lesson_id]:
+            keys.setdefault(lesson_id, set()).add(key)
+    return {lesson_id for lesson_id, found in keys.items() if found >= set(VARIANT_KEYS)}
+
+async def replace_variants(
+    db: AsyncSession,
+    variants: Dict[int, Tuple[str, Dict[str, str]]],
+    *,
+    generated_at: datetime,
+) -> None:
+    """
+    Replace the stored variants of each lesson in ``variants`` (lesson id ->
+    source hash and HTML by variant key), dropping keys no longer generated
+    """
+    if not variants:
+        return
+    await db.execute(delete(ContentVariant).where(ContentVariant.lesson_id.in_(list(variants))))
+    await db.execute(
+        insert(ContentVariant),
+        [
+            {
+                "lesson_id": lesson_id,
+                "variant_key": key,
+                "source_hash": source_hash,
+                "version": VARIANT_VERSION,
+                "content_html": html,
+                "generated_at": generated_at,
+            }
+            for lesson_id, (source_hash, rendered) in variants.items()
+            for key, html in rendered.items()
+        ],
+    )
+    await db.commit()
@@ -0,0 +1,224 @@
+import asyncio
+from datetime import datetime
+from typing import List, Optional, Sequence, Tuple
+
+from sqlalchemy import and_, func, select, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import noload, selectinload
+
+from app.core.rendering import content_hash, render_html
+from app.core.variants import VARIANT_VERSION
+from app.models import Category, ContentVariant, Course, Lesson, Module
+from app.models.course import course_category
+from app.schemas.course import CourseSummary, LessonView
+
+# Loads everything the Course schema serializes in one batched SELECT per level
+# (categories, modules, lessons), so a page of courses costs four queries no
+# matter how many courses, modules or lessons it contains.
+course_tree_options = (
+    selectinload(Course.categories),
+    selectinload(Course.modules).selectinload(Module.lessons),
+)
+
+def paginate_courses(
+    query,
+    *,
+    skip: int,
+    limit: int,
+    category_id: int | None,
+    after: Tuple[datetime, int] | None
+):
+    """
+    Apply the shared course ordering, category filter and page window.
+    ``after`` is a ``(created_at, id)`` keyset that replaces ``skip``.
+    """
+    query = query.order_by(Course.created_at, Course.id)
+    if category_id:
+        query = query.where(Course.categories.any(Category.id == category_id))
+    if after is not None:
+        query = query.where(tuple_(Course.created_at, Course.id) > tuple_(*after))
+    else:
+        query = query.offset(skip)
+    return query.limit(limit)
+
+async def list_courses(
+    db: AsyncSession,
+    *,
+    skip: int = 0,
+    limit: int = 100,
+    category_id: int | None = None,
+    after: Tuple[datetime, int] | None = None
+) -> Sequence[Course]:
+    """
+    Fetch a page of courses with their full category/module/lesson tree
+    """
+    query = paginate_courses(
+        select(Course).options(*course_tree_options),
+        skip=skip, limit=limit, category_id=category_id, after=after
+    )
+    result = await db.scalars(query)
+    return result.all()
+
+async def list_categories(
+    db: AsyncSession,
+    *,
+    skip: int = 0,
+    limit: int = 100,
+    after: int | None = None
+) -> Sequence[Category]:
+    """
+    Fetch a page of categories ordered by id; ``after`` is an id keyset
+    """
+    query = select(Category).order_by(Category.id)
+    if after is not None:
+        query = query.where(Category.id > after)
+    else:
+        query = query.offset(skip)
+    result = await db.scalars(query.limit(limit))
+    return result.all()
+
+async def list_course_summaries(
+    db: AsyncSession,
+    *,
+    skip: int = 0,
+    limit: int = 100,
+    category_id: int | None = None,
+    after: Tuple[datetime, int] | None = None
+) -> List[CourseSummary]:
+    """
+    Fetch a page of catalogue summaries in two queries, selecting only the
+    columns the summary needs (lesson content is never read)
+    """
+    module_count = (
+        select(func.count(Module.id))
+        .where(Module.course_id == Course.id)
+        .correlate(Course)
+        .scalar_subquery()
+    )
+    lesson_count = (
+        select(func.count(Lesson.id))
+        .join(Module, Lesson.module_id == Module.id)
+        .where(Module.course_id == Course.id)
+        .correlate(Course)
+        .scalar_subquery()
+    )
+    query = paginate_courses(
+        select(
+            Course.id,
+            Course.title,
+            Course.level,
+            Course.estimated_time,
+            Course.created_at,
+            module_count.label("module_count"),
+            lesson_count.label("lesson_count"),
+        ),
+        skip=skip, limit=limit, category_id=category_id, after=after
+    )
+    rows = (await db.execute(query)).all()
+    if not rows:
+        return []
+
+    category_ids = {row.id: [] for row in rows}
+    links = await db.execute(
+        select(course_category.c.course_id, course_category.c.category_id)
+        .where(course_category.c.course_id.in_(category_ids))
+    )
+    for course_id, linked_category_id in links:
+        category_ids[course_id].append(linked_category_id)
+
+    return [
+        CourseSummary(
+            id=row.id,
+            title=row.title,
+            level=row.level,
+            estimated_time=row.estimated_time,
+            created_at=row.created_at,
+            category_ids=category_ids[row.id],
+            module_count=row.module_count,
+            lesson_count=row.lesson_count,
+        )
+        for row in rows
+    ]
+
+async def get_course(
+    db: AsyncSession,
+    course_id: int,
+    *,
+    modules: bool = True,
+    lessons: bool = True
+) -> Course | None:
+    """
+    Fetch one course, refreshing any copy already in the session. Modules and
+    their lessons are loaded only when asked for.
+    """
+    options = [selectinload(Course.categories)]
+    if modules and lessons:
+        options.append(selectinload(Course.modules).selectinload(Module.lessons))
+    elif modules:
+        options.append(selectinload(Course.modules).noload(Module.lessons))
+    else:
+        options.append(noload(Course.modules))
+    return await db.scalar(
+        select(Course)
+        .options(*options)
+        .where(Course.id == course_id)
+        .execution_options(populate_existing=True)
+    )
+
+async def get_categories(db: AsyncSession, category_ids: List[int]) -> Sequence[Category]:
+    result = await db.scalars(select(Category).where(Category.id.in_(category_ids)))
+    return result.all()
+
+async def lesson_exists(db: AsyncSession, lesson_id: int) -> bool:
+    return await db.scalar(select(Lesson.id).where(Lesson.id == lesson_id)) is not None
+
+async def get_lesson_view(
+    db: AsyncSession, lesson_id: int, *, variant_key: Optional[str] = None
+) -> LessonView | None:
+    """
+    A lesson with its pre-rendered HTML; the raw content is not read.
+
+    With ``variant_key``, the stored variant is served instead when one was
+    generated from the lesson's current content (a primary-key join); if it
+    is missing or stale the standard HTML is served.
+
+    Lessons written outside the ORM (raw SQL, imports) have no HTML yet: the
+    first read renders it off the event loop and stores it for later reads.
+    """
+    query = select(
+        Lesson.id,
+        Lesson.title,
+        Lesson.order,
+        Lesson.module_id,
+        Lesson.video_url,
+        Lesson.content_html,
+    ).where(Lesson.id == lesson_id)
+    if variant_key is not None:
+        query = query.add_columns(ContentVariant.content_html.label("variant_html")).outerjoin(
+            ContentVariant,
+            and_(
+                ContentVariant.lesson_id == Lesson.id,
+                ContentVariant.variant_key == variant_key,
+                ContentVariant.source_hash == Lesson.content_hash,
+                ContentVariant.version == VARIANT_VERSION,
+            ),
+        )
+    row = (await db.execute(query)).one_or_none()
+    if row is None:
+        return None
+    if variant_key is not None and row.variant_html is not None:
+        return LessonView(
+            **{**row._mapping, "content_html": row.variant_html},
+            variant=variant_key,
+        )
+    lesson = LessonView(**row._mapping)
+    if row.content_html is None:
+        content = await db.scalar(select(Lesson.content).where(Lesson.id == lesson_id)) or ""
+        lesson.content_html = await asyncio.to_thread(render_html, content)
+        await db.execute(
+            update(Lesson)
+            .where(Lesson.id == lesson_id)
+            .values(content_html=lesson.content_html, content_hash=content_hash(content))
+        )
+        await db.commit()
+    return lesson
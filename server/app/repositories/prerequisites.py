@@ -0,0 +1,57 @@
+from typing import Iterable, List, Tuple
+
+from sqlalchemy import delete, func, insert, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.session import is_sqlite
+from app.models import Course
+from app.models.course import course_prerequisites
+
+# pg_advisory_xact_lock key shared by every prerequisite write
+PREREQUISITE_WRITE_LOCK = 0x70726571
+
+async def lock_prerequisite_writes(db: AsyncSession) -> None:
+    """
+    Hold the prerequisite write lock until the transaction ends (PostgreSQL;
+    SQLite relies on the caller's in-process lock)
+    """
+    if not is_sqlite:
+        await db.execute(select(func.pg_advisory_xact_lock(PREREQUISITE_WRITE_LOCK)))
+
+async def load_graph(db: AsyncSession) -> Tuple[List[int], List[Tuple[int, int]]]:
+    """
+    Every course id and every ``(course_id, prerequisite_id)`` edge, in two queries
+    """
+    course_ids = list((await db.scalars(select(Course.id))).all())
+    edges = [
+        (course_id, prerequisite_id)
+        for course_id, prerequisite_id in await db.execute(
+            select(course_prerequisites.c.course_id, course_prerequisites.c.prerequisite_id)
+        )
+    ]
+    return course_ids, edges
+
+async def existing_course_ids(db: AsyncSession, course_ids: Iterable[int]) -> List[int]:
+    return list((await db.scalars(select(Course.id).where(Course.id.in_(set(course_ids))))).all())
+
+async def replace_prerequisites(db: AsyncSession, course_id: int, prerequisite_ids: Iterable[int]) -> None:
+    """
+    Make ``prerequisite_ids`` the direct prerequisites of ``course_id``. Does not commit.
+    """
+    await db.execute(delete(course_prerequisites).where(course_prerequisites.c.course_id == course_id))
+    rows = [{"course_id": course_id, "prerequisite_id": prerequisite_id} for prerequisite_id in set(prerequisite_ids)]
+    if rows:
+        await db.execute(insert(course_prerequisites), rows)
+
+async def delete_course_edges(db: AsyncSession, course_id: int) -> None:
+    """
+    Drop every prerequisite edge to or from ``course_id``. Does not commit.
+    """
+    await db.execute(
+        delete(course_prerequisites).where(
+            or_(
+                course_prerequisites.c.course_id == course_id,
+                course_prerequisites.c.prerequisite_id == course_id,
+            )
+        )
+    )
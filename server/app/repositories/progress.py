@@ -0,0 +1,330 @@
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, case, func, literal, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.upsert import insert_or_ignore
+from app.models import Course, CourseProgress, Lesson, LessonCompletion, Module
+from app.schemas.course import CourseProgressOverview, LessonCompletionResult
+
+class CourseNotFound(Exception):
+    pass
+
+class LessonNotFound(Exception):
+    pass
+
+class CourseNotStarted(Exception):
+    pass
+
+def lesson_count(course_id):
+    """
+    Correlated count of the lessons in all modules of ``course_id``
+    """
+    return (
+        select(func.count(Lesson.id))
+        .join(Module, Lesson.module_id == Module.id)
+        .where(Module.course_id == course_id)
+        .scalar_subquery()
+    )
+
+def progress_counters(now: datetime) -> dict:
+    """
+    SET clause recomputing a progress row's counters from its completions
+    and the course's current lessons. ``completed_at`` keeps its first value
+    while the course stays complete and is cleared if lessons are added.
+    """
+    completed = (
+        select(func.count(LessonCompletion.id))
+        .where(LessonCompletion.course_progress_id == CourseProgress.id)
+        .scalar_subquery()
+    )
+    total = lesson_count(CourseProgress.course_id)
+    return {
+        "completed_lessons": completed,
+        "total_lessons": total,
+        "percent": case((total > 0, completed * 100.0 / total), else_=0.0),
+        "completed_at": case(
+            (and_(total > 0, completed >= total), func.coalesce(CourseProgress.completed_at, now)),
+            else_=None,
+        ),
+    }
+
+async def refresh_progress(db: AsyncSession, *conditions, touch: bool = True) -> int:
+    """
+    Recompute the counters of the progress rows matching ``conditions`` in one
+    UPDATE; ``touch=False`` leaves ``last_accessed`` alone (for backfills).
+    Returns the number of rows updated. Does not commit.
+    """
+    values = progress_counters(datetime.utcnow())
+    if not touch:
+        values["last_accessed"] = CourseProgress.last_accessed
+    result = await db.execute(
+        update(CourseProgress)
+        .where(*conditions)
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount
+
+async def backfill_progress(
+    db: AsyncSession, *, course_id: Optional[int] = None, batch_size: int = 5000
+) -> int:
+    """
+    Recompute the counters of every progress row (of ``course_id`` only, if
+    given) without touching ``last_accessed``, committing one id range of
+    ``batch_size`` rows at a time so row locks stay brief on a live database.
+    Returns the number of rows updated.
+    """
+    scope = [CourseProgress.course_id == course_id] if course_id is not None else []
+    last_id = await db.scalar(select(func.max(CourseProgress.id)).where(*scope)) or 0
+    updated = 0
+    for start in range(0, last_id, batch_size):
+        updated += await refresh_progress(
+            db,
+            CourseProgress.id > start,
+            CourseProgress.id <= start + batch_size,
+            *scope,
+            touch=False,
+        )
+        await db.commit()
+    return updated
+
+async def start_course(db: AsyncSession, *, user_id: int, course_id: int) -> CourseProgress:
+    """
+    Idempotently create the learner's progress row for a course.
+
+    A single INSERT ... SELECT ... ON CONFLICT DO NOTHING both checks that the
+    course exists and inserts; only a repeat start needs a second query.
+    """
+    insert_progress = (
+        insert_or_ignore(CourseProgress, ["user_id", "course_id"])
+        .from_select(
+            ["user_id", "course_id", "total_lessons"],
+            select(literal(user_id), Course.id, lesson_count(Course.id)).where(Course.id == course_id)
+        )
+        .returning(CourseProgress)
+    )
+    progress = await db.scalar(insert_progress)
+    if progress is None:
+        progress = await db.scalar(
+            select(CourseProgress).where(
+                CourseProgress.user_id == user_id,
+                CourseProgress.course_id == course_id
+            )
+        )
+        if progress is None:
+            raise CourseNotFound()
+    await db.commit()
+    return progress
+
+async def complete_lesson(db: AsyncSession, *, user_id: int, lesson_id: int) -> LessonCompletion:
+    """
+    Idempotently record a lesson completion.
+
+    The insert selects the lesson joined to the learner's progress for its
+    course, so a missing lesson, an unstarted course and a repeat completion
+    all insert nothing; only then is a second query made to tell them apart.
+    A new completion also refreshes the progress row's counters.
+    """
+    insert_completion = (
+        insert_or_ignore(LessonCompletion, ["user_id", "lesson_id"])
+        .from_select(
+            ["user_id", "lesson_id", "course_progress_id"],
+            select(literal(user_id), Lesson.id, CourseProgress.id)
+            .join(Module, Lesson.module_id == Module.id)
+            .join(
+                CourseProgress,
+                and_(
+                    CourseProgress.course_id == Module.course_id,
+                    CourseProgress.user_id == user_id
+                )
+            )
+            .where(Lesson.id == lesson_id)
+        )
+        .returning(LessonCompletion)
+    )
+    completion = await db.scalar(insert_completion)
+    if completion is None:
+        lesson_exists, completion = (await db.execute(
+            select(Lesson.id, LessonCompletion)
+            .outerjoin(
+                LessonCompletion,
+                and_(
+                    LessonCompletion.lesson_id == Lesson.id,
+                    LessonCompletion.user_id == user_id
+                )
+            )
+            .where(Lesson.id == lesson_id)
+        )).first() or (None, None)
+        if lesson_exists is None:
+            raise LessonNotFound()
+        if completion is None:
+            raise CourseNotStarted()
+    else:
+        # Same transaction as the completion, so the counters never drift
+        await refresh_progress(db, CourseProgress.id == completion.course_progress_id)
+    await db.commit()
+    return completion
+
+# Per-lesson outcomes of complete_lessons
+COMPLETED = "completed"
+ALREADY_COMPLETED = "already_completed"
+LESSON_NOT_FOUND = "lesson_not_found"
+COURSE_NOT_STARTED = "course_not_started"
+
+def as_utc(moment: Optional[datetime], now: datetime) -> datetime:
+    """
+    Naive UTC time for a client timestamp, never later than ``now``
+    """
+    if moment is None:
+        return now
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+    return min(moment, now)
+
+async def complete_lessons(
+    db: AsyncSession,
+    *,
+    user_id: int,
+    items: List[Tuple[int, Optional[datetime]]],
+) -> List[LessonCompletionResult]:
+    """
+    Record many ``(lesson_id, completed_at)`` completions in one transaction.
+
+    One query classifies every lesson (missing, course not started, already
+    completed), one multi-row INSERT ... ON CONFLICT DO NOTHING adds the
+    rest, and one UPDATE refreshes the counters of every progress row
+    touched. There is one result per item, in order. A lesson listed more
+    than once is recorded with its earliest time; its later entries report
+    it as already completed.
+    """
+    now = datetime.utcnow()
+    requested: Dict[int, datetime] = {}
+    for lesson_id, completed_at in items:
+        moment = as_utc(completed_at, now)
+        requested[lesson_id] = min(moment, requested.get(lesson_id, moment))
+
+    rows = await db.execute(
+        select(Lesson.id, CourseProgress.id, LessonCompletion.id, LessonCompletion.completed_at)
+        .join(Module, Lesson.module_id == Module.id)
+        .outerjoin(
+            CourseProgress,
+            and_(CourseProgress.course_id == Module.course_id, CourseProgress.user_id == user_id)
+        )
+        .outerjoin(
+            LessonCompletion,
+            and_(LessonCompletion.lesson_id == Lesson.id, LessonCompletion.user_id == user_id)
+        )
+        .where(Lesson.id.in_(requested))
+    )
+    results = {
+        lesson_id: LessonCompletionResult(lesson_id=lesson_id, status=LESSON_NOT_FOUND)
+        for lesson_id in requested
+    }
+    to_insert = []
+    for lesson_id, progress_id, completion_id, completed_at in rows:
+        if completion_id is not None:
+            results[lesson_id] = LessonCompletionResult(
+                lesson_id=lesson_id,
+                status=ALREADY_COMPLETED,
+                completion_id=completion_id,
+                completed_at=completed_at,
+            )
+        elif progress_id is None:
+            results[lesson_id] = LessonCompletionResult(lesson_id=lesson_id, status=COURSE_NOT_STARTED)
+        else:
+            to_insert.append({
+                "user_id": user_id,
+                "lesson_id": lesson_id,
+                "course_progress_id": progress_id,
+                "completed_at": requested[lesson_id],
+            })
+
+    if to_insert:
+        inserted = await db.execute(
+            insert_or_ignore(LessonCompletion, ["user_id", "lesson_id"])
+            .values(to_insert)
+            .returning(LessonCompletion.id, LessonCompletion.lesson_id, LessonCompletion.completed_at)
+        )
+        for completion_id, lesson_id, completed_at in inserted:
+            results[lesson_id] = LessonCompletionResult(
+                lesson_id=lesson_id,
+                status=COMPLETED,
+                completion_id=completion_id,
+                completed_at=completed_at,
+            )
+        # Rows a concurrent request inserted first were skipped by ON CONFLICT
+        for row in to_insert:
+            if results[row["lesson_id"]].status != COMPLETED:
+                results[row["lesson_id"]] = LessonCompletionResult(
+                    lesson_id=row["lesson_id"], status=ALREADY_COMPLETED
+                )
+        await refresh_progress(
+            db, CourseProgress.id.in_({row["course_progress_id"] for row in to_insert})
+        )
+    await db.commit()
+    ordered = []
+    seen = set()
+    for lesson_id, _ in items:
+        result = results[lesson_id]
+        if lesson_id in seen and result.status == COMPLETED:
+            result = result.copy(update={"status": ALREADY_COMPLETED})
+        seen.add(lesson_id)
+        ordered.append(result)
+    return ordered
+
+async def list_user_progress(db: AsyncSession, *, user_id: int) -> List[CourseProgressOverview]:
+    """
+    Every course the learner has started, most recently used first, with
+    its counters and the last lesson completed, in a single query.
+
+    The counters are read straight off the progress rows; the latest
+    completion per course comes from a window over the learner's
+    completions, so the cost does not grow with the number of courses.
+    """
+    ranked = (
+        select(
+            LessonCompletion.course_progress_id,
+            LessonCompletion.lesson_id,
+            LessonCompletion.completed_at,
+            func.row_number().over(
+                partition_by=LessonCompletion.course_progress_id,
+                order_by=(LessonCompletion.completed_at.desc(), LessonCompletion.id.desc()),
+            ).label("position"),
+        )
+        .where(LessonCompletion.user_id == user_id)
+        .subquery()
+    )
+    rows = await db.execute(
+        select(
+            CourseProgress.id,
+            CourseProgress.course_id,
+            Course.title.label("course_title"),
+            CourseProgress.started_at,
+            CourseProgress.last_accessed,
+            CourseProgress.completed_at,
+            CourseProgress.completed_lessons,
+            CourseProgress.total_lessons,
+            CourseProgress.percent,
+            ranked.c.lesson_id.label("last_lesson_id"),
+            Lesson.title.label("last_lesson_title"),
+            ranked.c.completed_at.label("last_lesson_completed_at"),
+        )
+        .join(Course, Course.id == CourseProgress.course_id)
+        .outerjoin(
+            ranked,
+            and_(ranked.c.course_progress_id == CourseProgress.id, ranked.c.position == 1),
+        )
+        .outerjoin(Lesson, Lesson.id == ranked.c.lesson_id)
+        .where(CourseProgress.user_id == user_id)
+        .order_by(CourseProgress.last_accessed.desc(), CourseProgress.id.desc())
+    )
+    return [CourseProgressOverview(**row._mapping) for row in rows]
+
+async def completed_course_ids(db: AsyncSession, *, user_id: int) -> List[int]:
+    return list((await db.scalars(
+        select(CourseProgress.course_id).where(
+            CourseProgress.user_id == user_id, CourseProgress.completed_at.is_not(None)
+        )
+    )).all())
@@ -0,0 +1,110 @@
+from datetime import datetime
+from typing import AsyncIterator, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Course, CourseProgress, CourseRecommendation, Lesson, LessonCompletion, Module
+from app.schemas.course import CourseRecommendation as CourseRecommendationSchema
+
+# Rows per DELETE/INSERT when rewriting suggestions, so one refresh never
+# holds a huge transaction
+WRITE_BATCH_USERS = 1_000
+
+async def completion_batches(
+    db: AsyncSession, after_id: int, batch_size: int = 50_000
+) -> AsyncIterator[List[Tuple[int, int, int]]]:
+    """
+    ``(id, user_id, lesson_id)`` of every completion with an id above
+    ``after_id``, in id order, streamed ``batch_size`` rows at a time
+    """
+    result = await db.stream(
+        select(LessonCompletion.id, LessonCompletion.user_id, LessonCompletion.lesson_id)
+        .where(LessonCompletion.id > after_id)
+        .order_by(LessonCompletion.id)
+        .execution_options(yield_per=batch_size)
+    )
+    async for partition in result.partitions(batch_size):
+        yield [tuple(row) for row in partition]
+
+async def lesson_courses(db: AsyncSession) -> List[Tuple[int, int]]:
+    rows = await db.execute(
+        select(Lesson.id, Module.course_id).join(Module, Lesson.module_id == Module.id)
+    )
+    return [tuple(row) for row in rows]
+
+async def started_courses(
+    db: AsyncSession, user_ids: Optional[Sequence[int]] = None
+) -> List[Tuple[int, int]]:
+    """
+    ``(user_id, course_id)`` of every course started by ``user_ids`` (everyone if None)
+    """
+    query = select(CourseProgress.user_id, CourseProgress.course_id)
+    if user_ids is None:
+        return [tuple(row) for row in await db.execute(query)]
+    started = []
+    for start in range(0, len(user_ids), WRITE_BATCH_USERS):
+        batch = user_ids[start:start + WRITE_BATCH_USERS]
+        started.extend(
+            tuple(row) for row in await db.execute(query.where(CourseProgress.user_id.in_(batch)))
+        )
+    return started
+
+async def replace_recommendations(
+    db: AsyncSession,
+    suggestions: Dict[int, List[Tuple[int, float]]],
+    *,
+    generated_at: datetime,
+) -> None:
+    """
+    Replace the stored suggestions of every user in ``suggestions`` with the
+    given ``(course_id, score)`` lists, best first. Commits per batch.
+    """
+    user_ids = list(suggestions)
+    for start in range(0, len(user_ids), WRITE_BATCH_USERS):
+        batch = user_ids[start:start + WRITE_BATCH_USERS]
+        await db.execute(
+            delete(CourseRecommendation).where(CourseRecommendation.user_id.in_(batch))
+        )
+        rows = [
+            {
+                "user_id": user_id,
+                "course_id": course_id,
+                "rank": rank,
+                "score": score,
+                "generated_at": generated_at,
+            }
+            for user_id in batch
+            for rank, (course_id, score) in enumerate(suggestions[user_id], start=1)
+        ]
+        if rows:
+            await db.execute(insert(CourseRecommendation), rows)
+        await db.commit()
+
+async def delete_stale_recommendations(db: AsyncSession, *, generated_before: datetime) -> None:
+    """
+    Drop suggestions a full refresh did not rewrite, e.g. of learners whose
+    completions are gone
+    """
+    await db.execute(
+        delete(CourseRecommendation).where(CourseRecommendation.generated_at < generated_before)
+    )
+    await db.commit()
+
+async def list_recommendations(
+    db: AsyncSession, *, user_id: int, limit: int
+) -> List[CourseRecommendationSchema]:
+    rows = await db.execute(
+        select(
+            CourseRecommendation.course_id,
+            Course.title,
+            CourseRecommendation.rank,
+            CourseRecommendation.score,
+            CourseRecommendation.generated_at,
+        )
+        .join(Course, Course.id == CourseRecommendation.course_id)
+        .where(CourseRecommendation.user_id == user_id)
+        .order_by(CourseRecommendation.rank)
+        .limit(limit)
+    )
+    return [CourseRecommendationSchema(**row._mapping) for row in rows]
@@ -0,0 +1,143 @@
+import html
+import re
+from typing import List, Sequence
+
+from sqlalchemy import func, literal, select, text, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.search import SEARCH_CONFIG, SQLITE_KINDS
+from app.db.session import is_sqlite
+from app.models import Course, Lesson, Module
+from app.schemas.course import SearchHit
+
+SEARCH_KINDS = tuple(SQLITE_KINDS)
+# Longer queries rarely narrow results further and make every match slower
+MAX_TERMS = 8
+TERM = re.compile(r"\w+")
+# The database marks matches with control characters; the text is escaped
+# before they become <mark> tags, so snippets are safe to render as HTML
+HIGHLIGHT_START = "\x02"
+HIGHLIGHT_STOP = "\x03"
+
+def search_terms(q: str) -> List[str]:
+    """
+    Words of a free-text query. Dropping everything else means user input
+    can never be read as FTS5 or tsquery syntax.
+    """
+    return TERM.findall(q.casefold())[:MAX_TERMS]
+
+def render_snippet(snippet: str) -> str:
+    return (
+        html.escape(snippet)
+        .replace(HIGHLIGHT_START, "<mark>")
+        .replace(HIGHLIGHT_STOP, "</mark>")
+    )
+
+async def search_catalogue(
+    db: AsyncSession, q: str, *, limit: int, kinds: Sequence[str] = SEARCH_KINDS
+) -> List[SearchHit]:
+    """
+    Courses, modules and lessons matching every word of ``q`` (the last one
+    as a prefix, so results appear while typing), best match first, with a
+    highlighted snippet. Titles weigh more than descriptions and content.
+    """
+    terms = search_terms(q)
+    if not terms or not kinds:
+        return []
+    if is_sqlite:
+        return await search_sqlite(db, terms, limit=limit, kinds=kinds)
+    return await search_postgresql(db, terms, limit=limit, kinds=kinds)
+
+async def search_sqlite(
+    db: AsyncSession, terms: List[str], *, limit: int, kinds: Sequence[str]
+) -> List[SearchHit]:
+    match = " ".join(f'"{term}"' for term in terms) + "*"
+    kind_list = ", ".join(f"'{kind}'" for kind in kinds if kind in SQLITE_KINDS)
+    rows = await db.execute(
+        text(f"""
+            SELECT search_index.kind, search_index.entity_id, search_index.course_id,
+                   courses.title AS course_title, search_index.title,
+                   snippet(search_index, -1, :start, :stop, '…', 16) AS snippet,
+                   -bm25(search_index, 10.0, 1.0) AS rank
+            FROM search_index
+            LEFT JOIN courses ON courses.id = search_index.course_id
+            WHERE search_index MATCH :match AND search_index.kind IN ({kind_list})
+            ORDER BY bm25(search_index, 10.0, 1.0)
+            LIMIT :limit
+        """),
+        {"match": match, "start": HIGHLIGHT_START, "stop": HIGHLIGHT_STOP, "limit": limit},
+    )
+    return [
+        SearchHit(
+            kind=row.kind,
+            id=row.entity_id,
+            course_id=row.course_id,
+            course_title=row.course_title,
+            title=row.title,
+            snippet=render_snippet(row.snippet),
+            rank=row.rank,
+        )
+        for row in rows
+    ]
+
+async def search_postgresql(
+    db: AsyncSession, terms: List[str], *, limit: int, kinds: Sequence[str]
+) -> List[SearchHit]:
+    query = func.to_tsquery(SEARCH_CONFIG, " & ".join(terms[:-1] + [f"{terms[-1]}:*"]))
+    sources = {
+        "course": (Course, Course.description, Course.id, select().select_from(Course)),
+        "module": (Module, Module.description, Module.course_id, select().select_from(Module)),
+        "lesson": (
+            Lesson,
+            Lesson.content,
+            Module.course_id,
+            select().select_from(Lesson).join(Module, Lesson.module_id == Module.id),
+        ),
+    }
+    selects = []
+    for kind in kinds:
+        model, body, course_id, base = sources[kind]
+        selects.append(
+            base.add_columns(
+                literal(kind).label("kind"),
+                model.id.label("id"),
+                course_id.label("course_id"),
+                model.title.label("title"),
+                body.label("body"),
+                func.ts_rank_cd(model.search_vector, query).label("rank"),
+            )
+            .where(model.search_vector.op("@@")(query))
+        )
+    # Rank and cut to the page first; ts_headline re-parses the text, so it
+    # only runs on the rows that are returned
+    hits = union_all(*selects).order_by(text("rank DESC")).limit(limit).subquery()
+    headline_options = (
+        f'StartSel="{HIGHLIGHT_START}", StopSel="{HIGHLIGHT_STOP}", MaxWords=32, MinWords=12'
+    )
+    rows = await db.execute(
+        select(
+            hits.c.kind,
+            hits.c.id,
+            hits.c.course_id,
+            Course.title.label("course_title"),
+            hits.c.title,
+            func.ts_headline(
+                SEARCH_CONFIG, func.coalesce(hits.c.body, hits.c.title), query, headline_options
+            ).label("snippet"),
+            hits.c.rank,
+        )
+        .outerjoin(Course, Course.id == hits.c.course_id)
+        .order_by(hits.c.rank.desc())
+    )
+    return [
+        SearchHit(
+            kind=row.kind,
+            id=row.id,
+            course_id=row.course_id,
+            course_title=row.course_title,
+            title=row.title,
+            snippet=render_snippet(row.snippet),
+            rank=row.rank,
+        )
+        for row in rows
+    ]
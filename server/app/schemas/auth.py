@@ -24,6 +24,7 @@ class UserInDBBase(UserBase):
 
     class Config:
         from_attributes = True
+        orm_mode = True
 
 class User(UserInDBBase):
     pass
@@ -1,6 +1,6 @@
 from typing import Optional, List
 from datetime import datetime
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 # Category schemas
 class CategoryBase(BaseModel):
@@ -15,6 +15,7 @@ class Category(CategoryBase):
     
     class Config:
         from_attributes = True
+        orm_mode = True
 
 # Lesson schemas
 class LessonBase(BaseModel):
@@ -32,6 +33,18 @@ class Lesson(LessonBase):
     
     class Config:
         from_attributes = True
+        orm_mode = True
+
+class LessonView(BaseModel):
+    """A lesson as shown to learners: its content as sanitized, highlighted HTML"""
+    id: int
+    title: str
+    order: int
+    module_id: int
+    video_url: Optional[str] = None
+    content_html: Optional[str] = None
+    # The accessibility variant served, if not the standard presentation
+    variant: Optional[str] = None
 
 # Module schemas
 class ModuleBase(BaseModel):
@@ -49,6 +62,7 @@ class Module(ModuleBase):
     
     class Config:
         from_attributes = True
+        orm_mode = True
 
 # Course schemas
 class CourseBase(BaseModel):
@@ -74,6 +88,51 @@ class Course(CourseBase):
     
     class Config:
         from_attributes = True
+        orm_mode = True
+
+class CourseSummary(BaseModel):
+    """Catalogue projection of a course; never carries lesson content"""
+    id: int
+    title: str
+    level: str
+    estimated_time: int
+    created_at: datetime
+    category_ids: List[int] = []
+    module_count: int
+    lesson_count: int
+
+class SearchHit(BaseModel):
+    """A course, module or lesson matching a catalogue search, best first"""
+    kind: str
+    id: int
+    course_id: Optional[int]
+    course_title: Optional[str]
+    title: str
+    snippet: str
+    rank: float
+
+# Prerequisite schemas
+class CoursePrerequisitesUpdate(BaseModel):
+    prerequisite_ids: List[int]
+
+class CoursePrerequisites(BaseModel):
+    course_id: int
+    prerequisite_ids: List[int]
+    # Direct and indirect prerequisites, in an order they can be taken
+    all_prerequisite_ids: List[int]
+
+class UnlockedCourses(BaseModel):
+    completed_course_ids: List[int]
+    # Not yet completed, with every prerequisite completed; prerequisites first
+    unlocked_course_ids: List[int]
+
+class CourseRecommendation(BaseModel):
+    """A precomputed "next course" suggestion, best first"""
+    course_id: int
+    title: str
+    rank: int
+    score: float
+    generated_at: datetime
 
 # Progress schemas
 class CourseProgressBase(BaseModel):
@@ -85,9 +144,29 @@ class CourseProgress(CourseProgressBase):
     user_id: int
     started_at: datetime
     last_accessed: datetime
+    completed_lessons: int = 0
+    total_lessons: int = 0
+    percent: float = 0.0
     
     class Config:
         from_attributes = True
+        orm_mode = True
+
+class CourseProgressOverview(BaseModel):
+    """One enrolled course on the learner dashboard"""
+    id: int
+    course_id: int
+    course_title: str
+    started_at: datetime
+    last_accessed: datetime
+    completed_at: Optional[datetime] = None
+    completed_lessons: int
+    total_lessons: int
+    percent: float
+    # Most recently completed lesson, if any
+    last_lesson_id: Optional[int] = None
+    last_lesson_title: Optional[str] = None
+    last_lesson_completed_at: Optional[datetime] = None
 
 class LessonCompletionBase(BaseModel):
     lesson_id: int
@@ -99,4 +178,24 @@ class LessonCompletion(LessonCompletionBase):
     completed_at: datetime
     
     class Config:
-        from_attributes = True 
\ No newline at end of file
+        from_attributes = True
+        orm_mode = True
+
+# Batch completion schemas
+class LessonCompletionItem(BaseModel):
+    lesson_id: int
+    # When the lesson was finished on the device; defaults to the time of upload
+    completed_at: Optional[datetime] = None
+
+class LessonCompletionBatch(BaseModel):
+    completions: List[LessonCompletionItem] = Field(..., min_items=1, max_items=500)
+
+class LessonCompletionResult(BaseModel):
+    lesson_id: int
+    # "completed", "already_completed", "lesson_not_found" or "course_not_started"
+    status: str
+    completion_id: Optional[int] = None
+    completed_at: Optional[datetime] = None
+
+class LessonCompletionBatchResult(BaseModel):
+    results: List[LessonCompletionResult]
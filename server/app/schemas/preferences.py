@@ -0,0 +1,11 @@
+from pydantic import BaseModel
+
+class AccessibilitySettings(BaseModel):
+    """
+    The flags of UserPreference.accessibility_settings that pick a lesson
+    variant (app.core.variants.PREFERENCE_FEATURES); any others stored
+    alongside them are kept but ignored
+    """
+    simplified_language: bool = False
+    chunked_steps: bool = False
+    large_code_font: bool = False
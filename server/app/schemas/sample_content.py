@@ -44,6 +44,8 @@ class SampleLesson(BaseModel):
     order: int
     module_id: int
     content: str
+    # ``content`` as sanitized HTML, filled in by the sample course registry
+    content_html: Optional[str] = None
     video_url: Optional[str]
     learning_objectives: List[LearningObjective]
     key_concepts: List[ConceptReference]
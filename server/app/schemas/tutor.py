@@ -0,0 +1,56 @@
+from typing import List, Optional
+from datetime import datetime
+from pydantic import BaseModel, Field
+
+# The client sends camelCase; snake_case field names are accepted as well
+class CamelModel(BaseModel):
+    class Config:
+        allow_population_by_field_name = True
+
+class TutorPreferences(CamelModel):
+    communication_style: str = Field("direct", alias="communicationStyle")
+    response_length: str = Field("concise", alias="responseLength")
+    use_emoji: bool = Field(False, alias="useEmoji")
+    use_visual_aids: bool = Field(True, alias="useVisualAids")
+
+class ChatContext(CamelModel):
+    course_id: Optional[int] = Field(None, alias="courseId")
+    lesson_id: Optional[int] = Field(None, alias="lessonId")
+    module_name: Optional[str] = Field(None, alias="moduleName")
+    lesson_title: Optional[str] = Field(None, alias="lessonTitle")
+
+class ChatRequest(CamelModel):
+    message: str = Field(..., min_length=1, max_length=4000)
+    context: ChatContext = ChatContext()
+    preferences: TutorPreferences = TutorPreferences()
+
+class TutorResponse(BaseModel):
+    message: str
+    conversation_id: str
+    suggestions: List[str] = []
+
+class ExplainRequest(CamelModel):
+    concept_id: str = Field(..., alias="conceptId")
+    style: Optional[str] = None
+    lesson_id: Optional[int] = Field(None, alias="lessonId")
+    preferences: TutorPreferences = TutorPreferences()
+
+class LessonFeedback(BaseModel):
+    understanding: str
+    pacing: str
+    comments: Optional[str] = None
+
+class FeedbackRequest(CamelModel):
+    lesson_id: int = Field(..., alias="lessonId")
+    feedback: LessonFeedback
+
+class ConversationMessage(BaseModel):
+    id: int
+    role: str
+    content: str
+    timestamp: datetime
+
+class Conversation(BaseModel):
+    id: str
+    messages: List[ConversationMessage]
+    context: ChatContext
@@ -0,0 +1,76 @@
+import logging
+from typing import Any, Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core import metrics
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.variants import variant_key
+from app.models import UserPreference
+from app.repositories import content_variants as variant_repo
+
+logger = logging.getLogger(__name__)
+
+# Cached for learners without a variant, so they are not looked up again either
+STANDARD = ""
+
+class VariantPreferenceCache:
+    """
+    The lesson variant each learner's accessibility settings ask for, keyed
+    by user id. Entries are dropped when a preference row is written through
+    the ORM in this process; other workers' entries expire within
+    ``CONTENT_VARIANT_PREFERENCE_TTL_SECONDS``.
+    """
+
+    def __init__(self, local: TTLCache) -> None:
+        self.local = local
+
+    async def get(self, db: AsyncSession, user_id: int) -> Optional[str]:
+        key = self.local.get(user_id)
+        if key is None:
+            key = variant_key(await self._settings(db, user_id)) or STANDARD
+            self.local.set(user_id, key)
+        return key or None
+
+    async def _settings(self, db: AsyncSession, user_id: int) -> Optional[Dict[str, Any]]:
+        # Settings that can't be read mean the standard lesson, not an error;
+        # the savepoint keeps the session usable for the lesson itself
+        try:
+            async with db.begin_nested():
+                settings = await variant_repo.accessibility_settings(db, user_id)
+        except SQLAlchemyError:
+            logger.exception("Could not read accessibility settings of user %s", user_id)
+            return None
+        return settings if isinstance(settings, dict) else None
+
+    def invalidate(self, user_id: int) -> None:
+        self.local.delete(user_id)
+
+    def stats(self) -> Dict[str, Any]:
+        return self.local.stats()
+
+variant_preferences = VariantPreferenceCache(
+    TTLCache(settings.CONTENT_VARIANT_PREFERENCE_MAX_SIZE, settings.CONTENT_VARIANT_PREFERENCE_TTL_SECONDS)
+)
+metrics.register("content_variant_preferences", lambda: variant_preferences.stats())
+
+# As for the user cache: collect at flush, invalidate once committed
+@event.listens_for(Session, "after_flush")
+def _collect_changed_preferences(session: Session, flush_context: Any) -> None:
+    changed = session.info.setdefault("changed_preference_user_ids", set())
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, UserPreference) and obj.user_id is not None:
+            changed.add(obj.user_id)
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed_preferences(session: Session) -> None:
+    for user_id in session.info.pop("changed_preference_user_ids", ()):
+        variant_preferences.invalidate(user_id)
+
+@event.listens_for(Session, "after_rollback")
+def _forget_changed_preferences(session: Session) -> None:
+    session.info.pop("changed_preference_user_ids", None)
@@ -0,0 +1,184 @@
+from typing import List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.upsert import insert_or_ignore
+from app.models.message import ConversationSummary, Message, MessageRole
+from app.services.llm import ChatMessages
+
+# Chat APIs add a few tokens of framing to every message
+MESSAGE_OVERHEAD_TOKENS = 4
+# Longest excerpt of a message kept in the rolling summary
+SUMMARY_LINE_CHARS = 160
+
+def count_tokens(text: str) -> int:
+    """
+    Estimated prompt tokens for ``text``: about four characters per token for
+    English, which is close enough for budgeting without a tokenizer
+    """
+    return (len(text) + 3) // 4 + MESSAGE_OVERHEAD_TOKENS
+
+def message_tokens(message: Message) -> int:
+    # Rows written before token counts existed are counted on the fly
+    return message.token_count if message.token_count is not None else count_tokens(message.content)
+
+def conversation_filter(user_id: int, lesson_id: Optional[int]):
+    lesson_filter = Message.lesson_id.is_(None) if lesson_id is None else Message.lesson_id == lesson_id
+    return (Message.user_id == user_id, lesson_filter)
+
+async def get_summary(
+    db: AsyncSession, *, user_id: int, conversation_id: str
+) -> Optional[ConversationSummary]:
+    return await db.scalar(
+        select(ConversationSummary).where(
+            ConversationSummary.user_id == user_id,
+            ConversationSummary.conversation_id == conversation_id,
+        )
+    )
+
+async def recent_messages(
+    db: AsyncSession, *, user_id: int, lesson_id: Optional[int], after_id: int, limit: int
+) -> List[Message]:
+    """
+    The newest ``limit`` messages not yet folded into the summary, oldest
+    first. Walks ix_messages_user_id_lesson_id_id backwards, so the cost
+    depends on ``limit`` and not on the length of the conversation.
+    """
+    query = (
+        select(Message)
+        .where(*conversation_filter(user_id, lesson_id), Message.id > after_id)
+        .order_by(Message.id.desc())
+        .limit(limit)
+    )
+    messages = list((await db.scalars(query)).all())
+    messages.reverse()
+    return messages
+
+async def build_prompt(
+    db: AsyncSession,
+    *,
+    user_id: int,
+    lesson_id: Optional[int],
+    conversation_id: str,
+    system: str,
+    question: str,
+    history_limit: int,
+    token_budget: int,
+) -> ChatMessages:
+    """
+    Assemble the prompt for one turn from the system prompt, the rolling
+    summary of older turns, as many recent messages as fit in
+    ``token_budget``, and the new question.
+
+    Two indexed queries and per-message token counts stored at write time
+    keep this proportional to the recent window, however long the chat is.
+    """
+    summary = await get_summary(db, user_id=user_id, conversation_id=conversation_id)
+    recent = await recent_messages(
+        db,
+        user_id=user_id,
+        lesson_id=lesson_id,
+        after_id=summary.summarized_through_id if summary else 0,
+        limit=history_limit,
+    )
+
+    used = count_tokens(system) + count_tokens(question)
+    if summary and summary.summary:
+        system = f"{system}\n\nEarlier in this conversation:\n{summary.summary}"
+        used += summary.token_count
+    included: List[Message] = []
+    for message in reversed(recent):
+        used += message_tokens(message)
+        if used > token_budget:
+            break
+        included.append(message)
+    included.reverse()
+
+    prompt: ChatMessages = [{"role": "system", "content": system}]
+    prompt.extend({"role": message.role, "content": message.content} for message in included)
+    prompt.append({"role": "user", "content": question})
+    return prompt
+
+def summary_line(message: Message) -> str:
+    text = " ".join(message.content.split())
+    if len(text) > SUMMARY_LINE_CHARS:
+        text = text[:SUMMARY_LINE_CHARS - 3].rstrip() + "..."
+    speaker = "Learner asked" if message.role == MessageRole.user.value else "Tutor answered"
+    return f"- {speaker}: {text}"
+
+async def overflow_messages(
+    db: AsyncSession, *, user_id: int, lesson_id: Optional[int], after_id: int, keep: int
+) -> List[Message]:
+    """
+    Unsummarized messages older than the newest ``keep``, oldest first. Uses
+    the same id order as recent_messages, so every message is in exactly one
+    of the two.
+    """
+    query = (
+        select(Message)
+        .where(*conversation_filter(user_id, lesson_id), Message.id > after_id)
+        .order_by(Message.id.desc())
+        .offset(keep)
+    )
+    messages = list((await db.scalars(query)).all())
+    messages.reverse()
+    return messages
+
+async def fold_old_turns(
+    db: AsyncSession,
+    *,
+    user_id: int,
+    lesson_id: Optional[int],
+    conversation_id: str,
+    keep: int,
+    max_summary_tokens: int,
+) -> None:
+    """
+    Move messages that have scrolled past the newest ``keep`` into the rolling
+    summary, dropping its oldest lines once it exceeds ``max_summary_tokens``.
+
+    The summary is extractive (one short line per message) so keeping it up to
+    date costs no model calls. Only messages after the summary's watermark are
+    read, so each call touches a couple of rows.
+    """
+    summary = await get_summary(db, user_id=user_id, conversation_id=conversation_id)
+    watermark = summary.summarized_through_id if summary else 0
+    if not await overflow_messages(db, user_id=user_id, lesson_id=lesson_id, after_id=watermark, keep=keep):
+        return
+
+    await db.execute(
+        insert_or_ignore(ConversationSummary, ["user_id", "conversation_id"]).values(
+            user_id=user_id,
+            conversation_id=conversation_id,
+            summary="",
+            token_count=0,
+            summarized_through_id=0,
+        )
+    )
+    # Lock the row so concurrent turns in one conversation fold each message once
+    summary = await db.scalar(
+        select(ConversationSummary)
+        .where(
+            ConversationSummary.user_id == user_id,
+            ConversationSummary.conversation_id == conversation_id,
+        )
+        .with_for_update()
+        .execution_options(populate_existing=True)
+    )
+    overflow = await overflow_messages(
+        db, user_id=user_id, lesson_id=lesson_id, after_id=summary.summarized_through_id, keep=keep
+    )
+    if not overflow:
+        await db.rollback()
+        return
+
+    lines = [line for line in summary.summary.splitlines() if line]
+    lines.extend(summary_line(message) for message in overflow)
+    tokens = sum(count_tokens(line) for line in lines)
+    while lines and tokens > max_summary_tokens:
+        tokens -= count_tokens(lines.pop(0))
+    summary.summary = "\n".join(lines)
+    summary.token_count = tokens
+    summary.summarized_through_id = max(message.id for message in overflow)
+    await db.commit()
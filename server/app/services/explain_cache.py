@@ -0,0 +1,87 @@
+import asyncio
+import hashlib
+import json
+import re
+from typing import Any, Dict, Optional
+
+from app.core import metrics
+from app.core.cache import SQLiteCache, TTLCache
+from app.core.config import settings
+from app.schemas.tutor import TutorPreferences
+
+WHITESPACE = re.compile(r"\s+")
+
+def normalize_prompt(prompt: str) -> str:
+    return WHITESPACE.sub(" ", prompt).strip().casefold()
+
+def explanation_key(
+    prompt: str,
+    *,
+    concept_id: str,
+    lesson_id: Optional[int],
+    preferences: TutorPreferences,
+    model: str,
+) -> str:
+    """
+    Cache key for an explanation: the same question about the same concept,
+    in the same lesson, for the same preferences and model, gets one answer
+    """
+    material = json.dumps(
+        {
+            "prompt": normalize_prompt(prompt),
+            "concept_id": concept_id,
+            "lesson_id": lesson_id,
+            "preferences": preferences.dict(),
+            "model": model,
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(material.encode()).hexdigest()
+
+class ExplanationCache:
+    """
+    Tutor explanations by ``explanation_key``.
+
+    A per-process LRU with a TTL answers repeated questions without I/O; the
+    optional SQLite tier keeps answers across restarts and shares them with
+    the other workers on the host.
+    """
+
+    def __init__(self, local: TTLCache, disk: Optional[SQLiteCache] = None) -> None:
+        self.local = local
+        self.disk = disk
+
+    async def get(self, key: str) -> Optional[str]:
+        message = self.local.get(key)
+        if message is None and self.disk is not None:
+            message = await asyncio.to_thread(self.disk.get, key)
+            if message is not None:
+                self.local.set(key, message)
+        return message
+
+    async def set(self, key: str, message: str) -> None:
+        self.local.set(key, message)
+        if self.disk is not None:
+            await asyncio.to_thread(self.disk.set, key, message)
+
+    def stats(self) -> Dict[str, Any]:
+        stats = self.local.stats()
+        if self.disk is not None:
+            stats["disk"] = self.disk.stats()
+        return stats
+
+def build_explanation_cache() -> ExplanationCache:
+    disk = None
+    if settings.EXPLAIN_CACHE_PATH:
+        disk = SQLiteCache(
+            settings.EXPLAIN_CACHE_PATH,
+            ttl_seconds=settings.EXPLAIN_CACHE_TTL_SECONDS,
+            max_entries=settings.EXPLAIN_CACHE_DISK_MAX_ENTRIES,
+        )
+    return ExplanationCache(
+        TTLCache(settings.EXPLAIN_CACHE_MAX_SIZE, settings.EXPLAIN_CACHE_TTL_SECONDS),
+        disk,
+    )
+
+explanation_cache = build_explanation_cache()
+metrics.register("explanation_cache", lambda: explanation_cache.stats())
@@ -0,0 +1,344 @@
+import asyncio
+import hashlib
+import json
+import random
+import time
+from collections import deque
+from functools import lru_cache
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Protocol, Set
+
+import httpx
+
+from app.core import metrics
+from app.core.config import settings
+
+# Chat messages in the OpenAI shape: {"role": "system" | "user" | "assistant", "content": str}
+ChatMessages = List[Dict[str, str]]
+
+# Responses worth another attempt: rate limiting and transient server errors
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+
+class ProviderError(Exception):
+    """
+    The model provider failed to produce an answer
+    """
+
+class RetryableProviderError(ProviderError):
+    """
+    A failure that may succeed when tried again (timeouts, 429s, 5xx)
+    """
+
+class ProviderBusy(Exception):
+    """
+    Raised when more prompts are waiting than the provider is allowed to queue
+    """
+
+class LLMProvider(Protocol):
+    def stream(self, messages: ChatMessages) -> AsyncIterator[str]:
+        """
+        Yield the assistant reply as it is generated, one chunk of text at a time
+        """
+        ...
+
+class FakeLLMProvider:
+    """
+    Local, deterministic provider for development and tests. Replies with a
+    short acknowledgement of the last user message, one word per chunk.
+    """
+
+    def __init__(self, delay_seconds: float = 0.0) -> None:
+        self.delay_seconds = delay_seconds
+
+    async def stream(self, messages: ChatMessages) -> AsyncIterator[str]:
+        question = next(
+            (message["content"] for message in reversed(messages) if message["role"] == "user"), ""
+        )
+        reply = f"Here is a clear, step-by-step answer to: {question}"
+        for index, word in enumerate(reply.split(" ")):
+            if self.delay_seconds:
+                await asyncio.sleep(self.delay_seconds)
+            yield word if index == 0 else f" {word}"
+
+class OpenAIProvider:
+    """
+    Streams chat completions from an OpenAI-compatible HTTP API.
+
+    All requests go through one shared ``httpx.AsyncClient`` so connections
+    are pooled and kept alive between prompts. Pointing ``AI_BASE_URL`` at a
+    local stub server exercises the real HTTP path in tests.
+    """
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        *,
+        api_key: Optional[str],
+        model: str,
+        temperature: float,
+        max_tokens: int,
+    ) -> None:
+        self.client = client
+        self.api_key = api_key
+        self.model = model
+        self.temperature = temperature
+        self.max_tokens = max_tokens
+
+    async def stream(self, messages: ChatMessages) -> AsyncIterator[str]:
+        body = {
+            "model": self.model,
+            "messages": messages,
+            "temperature": self.temperature,
+            "max_tokens": self.max_tokens,
+            "stream": True,
+        }
+        headers = {"Authorization": f"Bearer {self.api_key}"} if self.api_key else {}
+        try:
+            async with self.client.stream(
+                "POST", "/chat/completions", json=body, headers=headers
+            ) as response:
+                if response.status_code >= 400:
+                    await response.aread()
+                    error = (
+                        RetryableProviderError
+                        if response.status_code in RETRYABLE_STATUS_CODES
+                        else ProviderError
+                    )
+                    raise error(f"Provider returned {response.status_code}: {response.text[:200]}")
+                async for line in response.aiter_lines():
+                    if not line.startswith("data:"):
+                        continue
+                    data = line[len("data:"):].strip()
+                    if data == "[DONE]":
+                        break
+                    try:
+                        choices = json.loads(data).get("choices")
+                    except (ValueError, AttributeError) as exc:
+                        raise ProviderError(f"Malformed stream chunk: {data[:200]!r}") from exc
+                    # Usage-only and keep-alive chunks carry no choices
+                    if not choices:
+                        continue
+                    content = (choices[0].get("delta") or {}).get("content")
+                    if content:
+                        yield content
+        except httpx.TransportError as exc:
+            raise RetryableProviderError(f"Provider request failed: {exc!r}") from exc
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+def prompt_key(messages: ChatMessages) -> str:
+    return hashlib.sha256(json.dumps(messages, sort_keys=True).encode()).hexdigest()
+
+class _Flight:
+    """
+    One prompt being answered. Every caller that asked for the same prompt
+    while it is in flight replays the chunks received so far and then follows
+    the rest as they arrive.
+    """
+
+    def __init__(self) -> None:
+        self.chunks: List[str] = []
+        self.done = False
+        self.error: Optional[BaseException] = None
+        self._changed = asyncio.Condition()
+
+    async def add(self, chunk: str) -> None:
+        async with self._changed:
+            self.chunks.append(chunk)
+            self._changed.notify_all()
+
+    async def finish(self, error: Optional[BaseException] = None) -> None:
+        async with self._changed:
+            self.done = True
+            self.error = error
+            self._changed.notify_all()
+
+    async def follow(self) -> AsyncIterator[str]:
+        index = 0
+        while True:
+            async with self._changed:
+                await self._changed.wait_for(lambda: index < len(self.chunks) or self.done)
+                pending = self.chunks[index:]
+            if not pending:
+                if self.error is not None:
+                    raise self.error
+                return
+            index += len(pending)
+            for chunk in pending:
+                yield chunk
+
+class BoundedProvider:
+    """
+    Backpressure, coalescing and retries in front of any provider.
+
+    At most ``max_concurrency`` prompts are sent at once and up to
+    ``max_queue`` more wait their turn; beyond that ``ProviderBusy`` is raised
+    so callers can shed load instead of piling up. Identical prompts that
+    arrive while one is in flight share its answer rather than calling the
+    provider again. Retryable failures are retried with exponential backoff
+    and full jitter, but only until the first chunk has been passed on.
+    """
+
+    def __init__(
+        self,
+        provider: LLMProvider,
+        *,
+        max_concurrency: int,
+        max_queue: int,
+        max_retries: int,
+        retry_base_seconds: float,
+    ) -> None:
+        self.provider = provider
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.max_retries = max_retries
+        self.retry_base_seconds = retry_base_seconds
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._flights: Dict[str, _Flight] = {}
+        self._tasks: Set[asyncio.Task] = set()
+        self._waiting = 0
+        self._running = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+        self._coalesced = 0
+        self._retries = 0
+        self._queue_times: Deque[float] = deque(maxlen=1000)
+
+    async def stream(self, messages: ChatMessages) -> AsyncIterator[str]:
+        key = prompt_key(messages)
+        flight = self._flights.get(key)
+        if flight is None:
+            if len(self._flights) >= self.max_concurrency + self.max_queue:
+                self._rejected += 1
+                raise ProviderBusy()
+            flight = self._flights[key] = _Flight()
+            # The provider call runs in its own task so one caller going away
+            # does not cut the answer short for the others
+            task = asyncio.get_running_loop().create_task(self._run(key, messages, flight))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        else:
+            self._coalesced += 1
+        async for chunk in flight.follow():
+            yield chunk
+
+    async def _run(self, key: str, messages: ChatMessages, flight: _Flight) -> None:
+        error: Optional[BaseException] = None
+        try:
+            await self._call(messages, flight)
+        except BaseException as exc:
+            error = exc
+            if not isinstance(exc, Exception):
+                raise
+        finally:
+            self._flights.pop(key, None)
+            if error is None:
+                self._completed += 1
+            else:
+                self._failed += 1
+            await flight.finish(error)
+
+    async def _call(self, messages: ChatMessages, flight: _Flight) -> None:
+        queued = time.perf_counter()
+        self._waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self._waiting -= 1
+        self._queue_times.append(time.perf_counter() - queued)
+        self._running += 1
+        try:
+            await self._attempt(messages, flight)
+        finally:
+            self._running -= 1
+            self._semaphore.release()
+
+    async def _attempt(self, messages: ChatMessages, flight: _Flight) -> None:
+        attempt = 0
+        while True:
+            try:
+                async for chunk in self.provider.stream(messages):
+                    await flight.add(chunk)
+                return
+            except RetryableProviderError:
+                if flight.chunks or attempt >= self.max_retries:
+                    raise
+            delay = random.uniform(0, self.retry_base_seconds * 2 ** attempt)
+            attempt += 1
+            self._retries += 1
+            await asyncio.sleep(delay)
+
+    def stats(self) -> Dict[str, Any]:
+        queue_times = sorted(self._queue_times)
+
+        def percentile(fraction: float) -> float:
+            if not queue_times:
+                return 0.0
+            return round(queue_times[int(fraction * (len(queue_times) - 1))] * 1000, 3)
+        return {
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "running": self._running,
+            "waiting": self._waiting,
+            "completed": self._completed,
+            "failed": self._failed,
+            "rejected": self._rejected,
+            "coalesced": self._coalesced,
+            "retries": self._retries,
+            "queue_time_p50_ms": percentile(0.5),
+            "queue_time_p95_ms": percentile(0.95),
+            "queue_time_max_ms": percentile(1.0),
+        }
+
+    async def aclose(self) -> None:
+        close = getattr(self.provider, "aclose", None)
+        if close is not None:
+            await close()
+
+def build_http_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        base_url=settings.AI_BASE_URL,
+        timeout=httpx.Timeout(settings.AI_TIMEOUT_SECONDS, connect=5.0),
+        limits=httpx.Limits(
+            max_connections=settings.AI_MAX_CONCURRENCY,
+            max_keepalive_connections=settings.AI_MAX_CONCURRENCY,
+        ),
+    )
+
+@lru_cache()
+def get_llm_provider() -> BoundedProvider:
+    if settings.AI_PROVIDER == "fake":
+        provider: LLMProvider = FakeLLMProvider()
+    elif settings.AI_PROVIDER == "openai":
+        provider = OpenAIProvider(
+            build_http_client(),
+            api_key=settings.OPENAI_API_KEY,
+            model=settings.AI_MODEL,
+            temperature=settings.AI_TEMPERATURE,
+            max_tokens=settings.AI_MAX_TOKENS,
+        )
+    else:
+        raise ValueError(f"Unknown AI_PROVIDER {settings.AI_PROVIDER!r}")
+    return BoundedProvider(
+        provider,
+        max_concurrency=settings.AI_MAX_CONCURRENCY,
+        max_queue=settings.AI_MAX_QUEUE,
+        max_retries=settings.AI_MAX_RETRIES,
+        retry_base_seconds=settings.AI_RETRY_BASE_SECONDS,
+    )
+
+async def close_llm_provider() -> None:
+    """
+    Close the shared HTTP client if a provider was ever created
+    """
+    if get_llm_provider.cache_info().currsize:
+        await get_llm_provider().aclose()
+        get_llm_provider.cache_clear()
+
+def llm_provider_stats() -> Dict[str, Any]:
+    if not get_llm_provider.cache_info().currsize:
+        return {}
+    return get_llm_provider().stats()
+
+metrics.register("llm_provider", llm_provider_stats)
@@ -0,0 +1,326 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import metrics
+from app.core.config import settings
+from app.repositories import prerequisites as prerequisite_repo
+
+logger = logging.getLogger(__name__)
+
+class PrerequisiteCycle(Exception):
+    """
+    Raised when new prerequisites would make a course (indirectly) require itself
+    """
+
+    def __init__(self, path: List[int]) -> None:
+        super().__init__(" -> ".join(str(course_id) for course_id in path))
+        self.path = path
+
+class PrerequisiteGraph:
+    """
+    The course prerequisite DAG held in memory.
+
+    Every course gets a bit; a course's transitive prerequisites are kept as
+    one integer bitmask, so "has the learner completed everything this course
+    needs" is a single AND against the bitmask of their completed courses.
+    Courses are also kept in topological order (prerequisites first).
+
+    Changing one course's prerequisites only recomputes the closure of that
+    course and of the courses that depend on it, and only moves those
+    courses in the order.
+    """
+
+    def __init__(self) -> None:
+        self._bits: Dict[int, int] = {}
+        self._direct: Dict[int, Set[int]] = {}
+        self._dependents: Dict[int, Set[int]] = {}
+        self._closure: Dict[int, int] = {}
+        self._next_bit = 0
+        self.order: List[int] = []
+        # Stored edges left out because they closed a cycle
+        self.dropped_edges: List[Tuple[int, int]] = []
+
+    @classmethod
+    def build(cls, course_ids: Iterable[int], edges: Iterable[Tuple[int, int]]) -> "PrerequisiteGraph":
+        """
+        Graph of ``course_ids`` from ``(course_id, prerequisite_id)`` edges.
+
+        Writes are checked for cycles, but should the stored edges contain
+        one anyway, it is logged and broken by leaving out one of its edges
+        rather than failing every read of the graph.
+        """
+        graph = cls()
+        for course_id in course_ids:
+            graph.add_course(course_id)
+        for course_id, prerequisite_id in edges:
+            graph.add_course(course_id)
+            graph.add_course(prerequisite_id)
+            graph._direct[course_id].add(prerequisite_id)
+            graph._dependents[prerequisite_id].add(course_id)
+        while True:
+            order = graph._topological_order()
+            if len(order) == len(graph._direct):
+                break
+            graph._drop_stored_cycle(set(graph._direct) - set(order))
+        graph.order = order
+        for course_id in graph.order:
+            graph._closure[course_id] = graph._compute_closure(course_id)
+        return graph
+
+    def __contains__(self, course_id: int) -> bool:
+        return course_id in self._bits
+
+    def __len__(self) -> int:
+        return len(self._bits)
+
+    def add_course(self, course_id: int) -> None:
+        if course_id in self._bits:
+            return
+        self._bits[course_id] = 1 << self._next_bit
+        self._next_bit += 1
+        self._direct[course_id] = set()
+        self._dependents[course_id] = set()
+        self._closure[course_id] = 0
+        self.order.append(course_id)
+
+    def remove_course(self, course_id: int) -> None:
+        if course_id not in self._bits:
+            return
+        self.set_prerequisites(course_id, ())
+        for dependent in list(self._dependents[course_id]):
+            self.set_prerequisites(dependent, self._direct[dependent] - {course_id})
+        # The bit is retired rather than reused; a full rebuild compacts them
+        del self._bits[course_id], self._direct[course_id], self._dependents[course_id]
+        del self._closure[course_id]
+        self.order.remove(course_id)
+
+    def prerequisites(self, course_id: int) -> List[int]:
+        """
+        Direct prerequisites of ``course_id``
+        """
+        return sorted(self._direct.get(course_id, ()))
+
+    def all_prerequisites(self, course_id: int) -> List[int]:
+        """
+        Direct and indirect prerequisites of ``course_id`` in the order they can be taken
+        """
+        closure = self._closure.get(course_id, 0)
+        return [other for other in self.order if closure & self._bits[other]]
+
+    def mask(self, course_ids: Iterable[int]) -> int:
+        mask = 0
+        for course_id in course_ids:
+            mask |= self._bits.get(course_id, 0)
+        return mask
+
+    def find_cycle(self, course_id: int, prerequisite_ids: Iterable[int]) -> Optional[List[int]]:
+        """
+        The cycle that giving ``course_id`` these prerequisites would create, if any
+        """
+        bit = self._bits.get(course_id, 0)
+        for prerequisite_id in prerequisite_ids:
+            if prerequisite_id == course_id:
+                return [course_id, course_id]
+            if bit and self._closure.get(prerequisite_id, 0) & bit:
+                return [course_id] + self._path(prerequisite_id, course_id)
+        return None
+
+    def set_prerequisites(self, course_id: int, prerequisite_ids: Iterable[int]) -> None:
+        """
+        Replace the direct prerequisites of ``course_id``.
+
+        Raises ``PrerequisiteCycle`` (leaving the graph unchanged) if the
+        change would introduce a cycle.
+        """
+        prerequisite_ids = set(prerequisite_ids)
+        cycle = self.find_cycle(course_id, prerequisite_ids)
+        if cycle is not None:
+            raise PrerequisiteCycle(cycle)
+        self.add_course(course_id)
+        for prerequisite_id in prerequisite_ids:
+            self.add_course(prerequisite_id)
+        for prerequisite_id in self._direct[course_id] - prerequisite_ids:
+            self._dependents[prerequisite_id].discard(course_id)
+        for prerequisite_id in prerequisite_ids:
+            self._dependents[prerequisite_id].add(course_id)
+        self._direct[course_id] = prerequisite_ids
+
+        affected = self._downstream(course_id)
+        # find_cycle ruled out a cycle, so only the order of course_id and
+        # the courses depending on it can be wrong: when a prerequisite now
+        # comes after course_id, move those courses (keeping their relative
+        # order) behind everything else
+        position = self.order.index(course_id)
+        later = self.order[position + 1:]
+        if not prerequisite_ids.isdisjoint(later):
+            self.order = [other for other in self.order if other not in affected] + [
+                other for other in self.order if other in affected
+            ]
+        for other in self.order:
+            if other in affected:
+                self._closure[other] = self._compute_closure(other)
+
+    def unlocked(self, completed_ids: Iterable[int]) -> List[int]:
+        """
+        Courses not yet completed whose prerequisites, direct and indirect,
+        all are, in topological order
+        """
+        completed = self.mask(completed_ids)
+        return [
+            course_id
+            for course_id in self.order
+            if not completed & self._bits[course_id] and not self._closure[course_id] & ~completed
+        ]
+
+    def is_unlocked(self, course_id: int, completed_ids: Iterable[int]) -> bool:
+        return not self._closure.get(course_id, 0) & ~self.mask(completed_ids)
+
+    def _compute_closure(self, course_id: int) -> int:
+        # Prerequisites come first in self.order, so their closures are current
+        closure = 0
+        for prerequisite_id in self._direct[course_id]:
+            closure |= self._bits[prerequisite_id] | self._closure[prerequisite_id]
+        return closure
+
+    def _downstream(self, course_id: int) -> Set[int]:
+        seen = {course_id}
+        queue = deque([course_id])
+        while queue:
+            for dependent in self._dependents[queue.popleft()]:
+                if dependent not in seen:
+                    seen.add(dependent)
+                    queue.append(dependent)
+        return seen
+
+    def _path(self, start: int, goal: int) -> List[int]:
+        # Breadth-first along prerequisite edges; only called once a path is known to exist
+        parents: Dict[int, Optional[int]] = {start: None}
+        queue = deque([start])
+        while queue:
+            current = queue.popleft()
+            if current == goal:
+                break
+            for prerequisite_id in self._direct[current]:
+                if prerequisite_id not in parents:
+                    parents[prerequisite_id] = current
+                    queue.append(prerequisite_id)
+        path = [goal]
+        while parents[path[-1]] is not None:
+            path.append(parents[path[-1]])
+        path.reverse()
+        return path
+
+    def _topological_order(self) -> List[int]:
+        """
+        Kahn's algorithm over every course. Courses on or behind a cycle are
+        left out of the result.
+        """
+        remaining = {course_id: len(prerequisites) for course_id, prerequisites in self._direct.items()}
+        queue = deque(sorted(course_id for course_id, count in remaining.items() if not count))
+        order = []
+        while queue:
+            course_id = queue.popleft()
+            order.append(course_id)
+            for dependent in sorted(self._dependents[course_id]):
+                remaining[dependent] -= 1
+                if not remaining[dependent]:
+                    queue.append(dependent)
+        return order
+
+    def _drop_stored_cycle(self, stuck: Set[int]) -> None:
+        # Every course Kahn's algorithm could not place has a prerequisite it
+        # could not place either, so following those must come back around
+        path = [min(stuck)]
+        seen = {path[0]: 0}
+        while True:
+            prerequisite_id = min(self._direct[path[-1]] & stuck)
+            if prerequisite_id in seen:
+                break
+            seen[prerequisite_id] = len(path)
+            path.append(prerequisite_id)
+        cycle = path[seen[prerequisite_id]:] + [prerequisite_id]
+        course_id = path[-1]
+        logger.error(
+            "Stored course prerequisites form a cycle %s; ignoring %s -> %s",
+            " -> ".join(map(str, cycle)), course_id, prerequisite_id,
+        )
+        self._direct[course_id].discard(prerequisite_id)
+        self._dependents[prerequisite_id].discard(course_id)
+        self.dropped_edges.append((course_id, prerequisite_id))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "courses": len(self._bits),
+            "edges": sum(len(prerequisites) for prerequisites in self._direct.values()),
+            "dropped_edges": len(self.dropped_edges),
+        }
+
+class PrerequisiteGraphCache:
+    """
+    The per-process ``PrerequisiteGraph``, loaded from the database on first
+    use. Writes in this process update it in place; other workers pick the
+    change up when their copy is older than ``ttl_seconds``.
+    """
+
+    def __init__(self, ttl_seconds: float) -> None:
+        self.ttl_seconds = ttl_seconds
+        self._graph: Optional[PrerequisiteGraph] = None
+        self._loaded_at = 0.0
+        self._loads = 0
+        self._lock = asyncio.Lock()
+        self._write_lock = asyncio.Lock()
+
+    @asynccontextmanager
+    async def writing(self, db: AsyncSession) -> AsyncIterator[PrerequisiteGraph]:
+        """
+        Serialize prerequisite writes: one at a time in this process, and on
+        PostgreSQL across workers until ``db``'s transaction ends, which must
+        happen inside the block. Yields the graph freshly loaded from the
+        database, so a cycle check against it sees every committed write.
+        """
+        async with self._write_lock:
+            await prerequisite_repo.lock_prerequisite_writes(db)
+            yield await self.get(db, reload=True)
+
+    def fresh(self) -> bool:
+        return self._graph is not None and time.monotonic() - self._loaded_at < self.ttl_seconds
+
+    async def get(self, db: AsyncSession, *, reload: bool = False) -> PrerequisiteGraph:
+        if self.fresh() and not reload:
+            return self._graph
+        async with self._lock:
+            if not self.fresh() or reload:
+                course_ids, edges = await prerequisite_repo.load_graph(db)
+                self._graph = PrerequisiteGraph.build(course_ids, edges)
+                self._loaded_at = time.monotonic()
+                self._loads += 1
+        return self._graph
+
+    def update(self, change: Callable[[PrerequisiteGraph], None]) -> None:
+        """
+        Apply a committed write to the loaded graph, if any. Should the change
+        not apply cleanly (another write raced it), the graph is reloaded on
+        next use instead.
+        """
+        if self._graph is None:
+            return
+        try:
+            change(self._graph)
+        except PrerequisiteCycle:
+            self._graph = None
+
+    def stats(self) -> Dict[str, Any]:
+        stats = {"loads": self._loads, "loaded": self._graph is not None}
+        if self._graph is not None:
+            stats.update(self._graph.stats())
+            stats["age_seconds"] = round(time.monotonic() - self._loaded_at, 1)
+        return stats
+
+prerequisite_graph = PrerequisiteGraphCache(settings.PREREQUISITE_GRAPH_TTL_SECONDS)
+metrics.register("prerequisite_graph", lambda: prerequisite_graph.stats())
@@ -0,0 +1,254 @@
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+from scipy import sparse
+
+from app.core import metrics
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.repositories import recommendations as recommendation_repo
+
+logger = logging.getLogger(__name__)
+
+# Learners scored per matrix product; bounds the dense users x courses block
+SCORE_BATCH_USERS = 2_048
+
+def _ids(values: Iterable[int]) -> np.ndarray:
+    return np.fromiter(values, dtype=np.int64)
+
+class CompletionModel:
+    """
+    The binary learner x lesson completion matrix and the lesson x lesson
+    co-occurrence counts derived from it, indexed directly by user and lesson id.
+
+    Adding completions updates the co-occurrence counts for the affected
+    learners only (their new rows' outer product minus their old one), so an
+    incremental refresh costs in proportion to the learners who changed.
+    """
+
+    def __init__(self) -> None:
+        self.completions = sparse.csr_matrix((0, 0), dtype=np.float32)
+        self.cooccurrence = sparse.csr_matrix((0, 0), dtype=np.float32)
+
+    def grow(self, users: int = 0, lessons: int = 0) -> None:
+        shape = (max(users, self.completions.shape[0]), max(lessons, self.completions.shape[1]))
+        if shape != self.completions.shape:
+            self.completions.resize(shape)
+            self.cooccurrence.resize((shape[1], shape[1]))
+
+    def add(self, user_ids: np.ndarray, lesson_ids: np.ndarray) -> np.ndarray:
+        """
+        Record completions; returns the ids of the learners whose rows changed
+        """
+        if not len(user_ids):
+            return np.empty(0, dtype=np.int64)
+        self.grow(int(user_ids.max()) + 1, int(lesson_ids.max()) + 1)
+        users = np.unique(user_ids)
+        before = self.completions[users]
+        added = sparse.csr_matrix(
+            (np.ones(len(user_ids), dtype=np.float32), (user_ids, lesson_ids)),
+            shape=self.completions.shape,
+        )
+        completions = (self.completions + added).tocsr()
+        completions.data[:] = 1
+        self.completions = completions
+        after = completions[users]
+        self.cooccurrence = (self.cooccurrence + after.T @ after - before.T @ before).tocsr()
+        self.cooccurrence.eliminate_zeros()
+        return users
+
+    def lesson_similarity(self) -> sparse.csr_matrix:
+        """
+        Cosine similarity between lessons by the learners who completed them,
+        with each lesson's similarity to itself removed
+        """
+        counts = self.cooccurrence.diagonal()
+        scale = np.zeros_like(counts)
+        scale[counts > 0] = 1 / np.sqrt(counts[counts > 0])
+        normalize = sparse.diags(scale)
+        similarity = (normalize @ self.cooccurrence @ normalize).tocsr()
+        similarity = (similarity - sparse.diags(similarity.diagonal())).tocsr()
+        similarity.eliminate_zeros()
+        return similarity
+
+def lesson_course_matrix(pairs: Sequence[Tuple[int, int]], lessons: int, courses: int) -> sparse.csr_matrix:
+    """
+    Lesson x course membership, each column scaled by 1 / sqrt(lessons in the
+    course) so long courses do not win on size alone
+    """
+    pairs = [(lesson_id, course_id) for lesson_id, course_id in pairs if lesson_id < lessons]
+    lesson_ids = _ids(lesson_id for lesson_id, _ in pairs)
+    course_ids = _ids(course_id for _, course_id in pairs)
+    sizes = np.bincount(course_ids, minlength=courses).astype(np.float32)
+    weights = 1 / np.sqrt(sizes[course_ids])
+    return sparse.csr_matrix((weights, (lesson_ids, course_ids)), shape=(lessons, courses))
+
+def recommend(
+    model: CompletionModel,
+    users: np.ndarray,
+    lesson_courses: Sequence[Tuple[int, int]],
+    started: Sequence[Tuple[int, int]],
+    k: int,
+) -> Iterator[Tuple[int, List[Tuple[int, float]]]]:
+    """
+    Top ``k`` ``(course_id, score)`` suggestions for each of ``users``, best first.
+
+    A course scores by how similar its lessons are to the lessons the learner
+    completed. Courses the learner has started or completed lessons in are
+    left out. Learners are scored in batches with sparse products and
+    ``argpartition`` rather than one at a time.
+    """
+    courses = max((course_id for _, course_id in lesson_courses), default=-1) + 1
+    model.grow(lessons=max((lesson_id for lesson_id, _ in lesson_courses), default=-1) + 1)
+    membership = lesson_course_matrix(lesson_courses, model.completions.shape[1], courses)
+    affinity = (model.lesson_similarity() @ membership).tocsr()
+    started = [
+        (user_id, course_id)
+        for user_id, course_id in started
+        if user_id < model.completions.shape[0] and course_id < courses
+    ]
+    started_matrix = sparse.csr_matrix(
+        (
+            np.ones(len(started), dtype=np.float32),
+            (_ids(user_id for user_id, _ in started), _ids(course_id for _, course_id in started)),
+        ),
+        shape=(model.completions.shape[0], courses),
+    )
+    k = min(k, courses)
+    if not k:
+        for user_id in users:
+            yield int(user_id), []
+        return
+
+    for start in range(0, len(users), SCORE_BATCH_USERS):
+        batch = users[start:start + SCORE_BATCH_USERS]
+        completed = model.completions[batch]
+        scores = (completed @ affinity).toarray()
+        taken = (completed @ membership + started_matrix[batch]).toarray() > 0
+        scores[taken] = 0
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = np.argsort(-top_scores, axis=1)
+        top = np.take_along_axis(top, order, axis=1)
+        top_scores = np.take_along_axis(top_scores, order, axis=1)
+        for row, user_id in enumerate(batch):
+            yield int(user_id), [
+                (int(course_id), float(score))
+                for course_id, score in zip(top[row], top_scores[row])
+                if score > 0
+            ]
+
+class RecommendationRefresher:
+    """
+    Keeps ``course_recommendations`` up to date.
+
+    The first refresh loads every completion; later ones load only
+    completions newer than the last one seen, update the model for those
+    learners and rewrite just their suggestions. Every
+    ``full_refresh_seconds`` the model is rebuilt and everyone is rewritten.
+    The matrix work runs on a thread so the event loop stays responsive.
+    """
+
+    def __init__(self, *, top_k: int, interval_seconds: float, full_refresh_seconds: float) -> None:
+        self.top_k = top_k
+        self.interval_seconds = interval_seconds
+        self.full_refresh_seconds = full_refresh_seconds
+        self._model: Optional[CompletionModel] = None
+        self._watermark = 0
+        self._full_at = 0.0
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._refreshes = 0
+        self._failures = 0
+        self._last: Dict[str, Any] = {}
+
+    async def refresh(self, *, full: bool = False) -> Dict[str, Any]:
+        async with self._lock:
+            return await self._refresh(full)
+
+    async def _refresh(self, full: bool) -> Dict[str, Any]:
+        started_at = time.perf_counter()
+        full = full or self._model is None or time.monotonic() - self._full_at >= self.full_refresh_seconds
+        generated_at = datetime.utcnow()
+        async with AsyncSessionLocal() as db:
+            ids, user_ids, lesson_ids = [], [], []
+            async for batch in recommendation_repo.completion_batches(db, 0 if full else self._watermark):
+                ids.append(batch[-1][0])
+                user_ids.append(_ids(user_id for _, user_id, _ in batch))
+                lesson_ids.append(_ids(lesson_id for _, _, lesson_id in batch))
+            if not ids and not full:
+                return {"full": False, "users": 0, "seconds": 0.0}
+            model = CompletionModel() if full else self._model
+            users = await asyncio.to_thread(
+                model.add,
+                np.concatenate(user_ids) if ids else _ids(()),
+                np.concatenate(lesson_ids) if ids else _ids(()),
+            )
+            lesson_courses = await recommendation_repo.lesson_courses(db)
+            started = await recommendation_repo.started_courses(
+                db, None if full else users.tolist()
+            )
+            suggestions = await asyncio.to_thread(
+                lambda: dict(recommend(model, users, lesson_courses, started, self.top_k))
+            )
+            await recommendation_repo.replace_recommendations(
+                db, suggestions, generated_at=generated_at
+            )
+            if full:
+                await recommendation_repo.delete_stale_recommendations(db, generated_before=generated_at)
+
+        self._model = model
+        if ids:
+            self._watermark = ids[-1]
+        elif full:
+            self._watermark = 0
+        if full:
+            self._full_at = time.monotonic()
+        self._refreshes += 1
+        self._last = {
+            "full": full,
+            "users": len(users),
+            "seconds": round(time.perf_counter() - started_at, 3),
+        }
+        return self._last
+
+    def start(self) -> None:
+        if self._task is None and self.interval_seconds > 0:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except Exception:
+                self._failures += 1
+                logger.exception("Course recommendation refresh failed")
+            await asyncio.sleep(self.interval_seconds)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "refreshes": self._refreshes,
+            "failures": self._failures,
+            "watermark": self._watermark,
+            "last": self._last,
+        }
+
+recommendation_refresher = RecommendationRefresher(
+    top_k=settings.RECOMMENDATION_TOP_K,
+    interval_seconds=settings.RECOMMENDATION_REFRESH_SECONDS,
+    full_refresh_seconds=settings.RECOMMENDATION_FULL_REFRESH_SECONDS,
+)
+metrics.register("recommendations", lambda: recommendation_refresher.stats())
@@ -0,0 +1,109 @@
+import gzip
+import hashlib
+import json
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from fastapi import Request, Response
+
+from app.data.sample_courses import SampleCourseRegistry
+
+try:
+    import brotli
+except ImportError:  # optional: gzip is always available
+    brotli = None
+
+# Sample content only changes with a deploy, so let clients and proxies reuse
+# a response for a few minutes and then revalidate it with If-None-Match
+CACHE_CONTROL = "public, max-age=300"
+
+@dataclass
+class CatalogueEntry:
+    """
+    One pre-serialized JSON document with its pre-compressed encodings
+    """
+    body: bytes
+    etag: str
+    encoded: Dict[str, bytes] = field(default_factory=dict)
+
+    @classmethod
+    def from_json(cls, body: bytes) -> "CatalogueEntry":
+        digest = hashlib.sha256(body).hexdigest()[:32]
+        entry = cls(body=body, etag=f'"{digest}"')
+        entry.encoded["gzip"] = gzip.compress(body, compresslevel=9, mtime=0)
+        if brotli is not None:
+            entry.encoded["br"] = brotli.compress(body, quality=11)
+        return entry
+
+    def etag_for(self, encoding: Optional[str]) -> str:
+        # Each content-coding is a distinct representation with its own strong ETag
+        return self.etag if encoding is None else f'{self.etag[:-1]}-{encoding}"'
+
+    def matches(self, if_none_match: str) -> bool:
+        candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        if "*" in candidates:
+            return True
+        known = {self.etag_for(None)} | {self.etag_for(encoding) for encoding in self.encoded}
+        return not candidates.isdisjoint(known)
+
+def accepted_encodings(accept_encoding: str) -> List[str]:
+    """
+    Codings named in Accept-Encoding that were not refused with q=0
+    """
+    accepted = []
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        params = params.replace(" ", "")
+        if params in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        if coding:
+            accepted.append(coding.lower())
+    return accepted
+
+def catalogue_response(entry: CatalogueEntry, request: Request) -> Response:
+    """
+    Serve a catalogue entry, answering 304 when the client's copy is current
+    and the smallest pre-compressed body the client accepts otherwise
+    """
+    accepted = accepted_encodings(request.headers.get("accept-encoding", ""))
+    encoding = next((coding for coding in ("br", "gzip") if coding in accepted and coding in entry.encoded), None)
+    headers = {
+        "ETag": entry.etag_for(encoding),
+        "Cache-Control": CACHE_CONTROL,
+        "Vary": "Accept-Encoding",
+    }
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and entry.matches(if_none_match):
+        return Response(status_code=304, headers=headers)
+    if encoding is not None:
+        headers["Content-Encoding"] = encoding
+        return Response(entry.encoded[encoding], media_type="application/json", headers=headers)
+    return Response(entry.body, media_type="application/json", headers=headers)
+
+class SampleCatalogue:
+    """
+    Sample courses served as pre-serialized JSON. Each entry is built the
+    first time it is requested and then reused for the life of the worker.
+    """
+
+    def __init__(self, registry: SampleCourseRegistry) -> None:
+        self.registry = registry
+        self._courses: Dict[str, CatalogueEntry] = {}
+        self._listing: Optional[CatalogueEntry] = None
+
+    def get(self, course_id: str) -> Optional[CatalogueEntry]:
+        entry = self._courses.get(course_id)
+        if entry is None:
+            body = self.registry.course_json(course_id)
+            if body is None:
+                return None
+            entry = self._courses[course_id] = CatalogueEntry.from_json(body)
+        return entry
+
+    def listing(self) -> CatalogueEntry:
+        if self._listing is None:
+            self._listing = CatalogueEntry.from_json(json_bytes({"courses": self.registry.listing()}))
+        return self._listing
+
+def json_bytes(data: Any) -> bytes:
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode()
@@ -0,0 +1,260 @@
+import asyncio
+import json
+import threading
+import time
+from datetime import datetime
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.data.sample_courses import SampleCourseRegistry, sample_course_registry
+from app.db.session import AsyncSessionLocal
+from app.models.message import Message, MessageRole
+from app.schemas.sample_content import ConceptReference
+from app.schemas.tutor import ChatContext, TutorPreferences
+from app.services import context as context_service
+from app.services import tutor_log
+from app.services.llm import ChatMessages, LLMProvider
+
+# Conversations are per user and per lesson: "lesson-<id>", or "general" for
+# questions asked outside a lesson
+GENERAL_CONVERSATION = "general"
+
+STYLE_INSTRUCTIONS = {
+    "direct": "Answer directly and literally, without idioms or small talk.",
+    "conversational": "Use a friendly, conversational tone while staying literal and clear.",
+    "step-by-step": "Break every explanation into short numbered steps.",
+}
+
+LENGTH_INSTRUCTIONS = {
+    "concise": "Keep answers short: a few sentences unless more is asked for.",
+    "detailed": "Give thorough answers with examples.",
+}
+
+def conversation_id(lesson_id: Optional[int]) -> str:
+    return GENERAL_CONVERSATION if lesson_id is None else f"lesson-{lesson_id}"
+
+def parse_conversation_id(value: str) -> Optional[int]:
+    """
+    The lesson id of a conversation id; ValueError when it is not one
+    """
+    if value == GENERAL_CONVERSATION:
+        return None
+    prefix, _, lesson_id = value.partition("-")
+    if prefix != "lesson" or not lesson_id.isdigit():
+        raise ValueError(f"Invalid conversation id {value!r}")
+    return int(lesson_id)
+
+def system_prompt(preferences: TutorPreferences, context: ChatContext) -> str:
+    lines = [
+        "You are a patient programming tutor for autistic learners.",
+        "Use clear, literal language and explain any jargon you use.",
+        STYLE_INSTRUCTIONS.get(preferences.communication_style, STYLE_INSTRUCTIONS["direct"]),
+        LENGTH_INSTRUCTIONS.get(preferences.response_length, LENGTH_INSTRUCTIONS["concise"]),
+        "You may use emoji sparingly." if preferences.use_emoji else "Do not use emoji.",
+    ]
+    if preferences.use_visual_aids:
+        lines.append("Where it helps, include small code blocks or ASCII diagrams.")
+    if context.lesson_title:
+        module = f" (module: {context.module_name})" if context.module_name else ""
+        lines.append(f"The learner is studying the lesson \"{context.lesson_title}\"{module}.")
+    return "\n".join(lines)
+
+def sse_event(data: Dict, event: Optional[str] = None) -> str:
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {json.dumps(data)}\n\n"
+
+def model_name() -> str:
+    """
+    Identifies the model behind the answers, for cache keys
+    """
+    return f"{settings.AI_PROVIDER}:{settings.AI_MODEL}"
+
+class ConceptIndex:
+    """
+    Key concepts of the sample courses by id, built on first use
+    """
+
+    def __init__(self, registry: SampleCourseRegistry) -> None:
+        self.registry = registry
+        self._concepts: Optional[Dict[str, ConceptReference]] = None
+        self._lock = threading.Lock()
+
+    def get(self, concept_id: str) -> Optional[ConceptReference]:
+        if self._concepts is None:
+            with self._lock:
+                if self._concepts is None:
+                    self._concepts = self._build()
+        return self._concepts.get(concept_id)
+
+    def _build(self) -> Dict[str, ConceptReference]:
+        concepts: Dict[str, ConceptReference] = {}
+        for course_id in self.registry.course_ids():
+            course = self.registry.get(course_id)
+            if course is None:
+                continue
+            for module in course.modules:
+                for lesson in module.lessons:
+                    for concept in lesson.key_concepts:
+                        concepts.setdefault(concept.id, concept)
+                    for objective in lesson.learning_objectives:
+                        for concept in objective.concepts:
+                            concepts.setdefault(concept.id, concept)
+        return concepts
+
+concept_index = ConceptIndex(sample_course_registry)
+
+def explain_prompt(concept: ConceptReference, style: Optional[str]) -> str:
+    parts = [f"Can you explain {concept.name} in simpler terms?", f"Definition: {concept.description}"]
+    if concept.example_code:
+        parts.append(f"Example:\n{concept.example_code}")
+    if style == "example":
+        parts.append("Focus on a worked example.")
+    elif style == "visual":
+        parts.append("Use a diagram or visual analogy.")
+    return "\n".join(parts)
+
+async def load_history(
+    db: AsyncSession, *, user_id: int, lesson_id: Optional[int], limit: int
+) -> List[Message]:
+    """
+    The newest ``limit`` messages of a conversation, oldest first
+    """
+    lesson_filter = Message.lesson_id.is_(None) if lesson_id is None else Message.lesson_id == lesson_id
+    query = (
+        select(Message)
+        .where(Message.user_id == user_id, lesson_filter)
+        .order_by(Message.id.desc())
+        .limit(limit)
+    )
+    messages = list((await db.scalars(query)).all())
+    messages.reverse()
+    return messages
+
+class TutorTurn:
+    """
+    One question and its streamed answer.
+
+    Chunks are passed on as soon as the provider yields them. The question and
+    the answer are written together in one transaction once the stream ends
+    (or is cut short by the client), so no connection is held and nothing is
+    committed while tokens are being generated.
+    """
+
+    def __init__(
+        self,
+        provider: LLMProvider,
+        *,
+        user_id: int,
+        lesson_id: Optional[int],
+        question: str,
+        prompt: ChatMessages,
+        persist: bool = True,
+        on_complete: Optional[Callable[[str], Awaitable[None]]] = None,
+        kind: str = "chat",
+        log_context: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        self.provider = provider
+        self.user_id = user_id
+        self.lesson_id = lesson_id
+        self.question = question
+        self.prompt = prompt
+        self.persist = persist
+        self.on_complete = on_complete
+        self.kind = kind
+        self.log_context = log_context
+        self.asked_at = datetime.utcnow()
+        self.started = time.perf_counter()
+        self.chunks: List[str] = []
+        self.message_id: Optional[int] = None
+
+    @property
+    def reply(self) -> str:
+        return "".join(self.chunks)
+
+    async def stream(self) -> AsyncIterator[str]:
+        try:
+            async for chunk in self.provider.stream(self.prompt):
+                self.chunks.append(chunk)
+                yield chunk
+            # Only a reply that finished is handed on, never one cut short
+            if self.on_complete is not None:
+                await self.on_complete(self.reply)
+            tutor_log.record(
+                user_id=self.user_id,
+                session_id=conversation_id(self.lesson_id),
+                kind=self.kind,
+                context=self.log_context,
+                user_message=self.question,
+                ai_response=self.reply,
+                latency_ms=round((time.perf_counter() - self.started) * 1000),
+            )
+        finally:
+            if self.persist and self.chunks:
+                # Shielded so a client disconnect does not lose what was said
+                await asyncio.shield(self.save())
+
+    async def complete(self) -> str:
+        async for _ in self.stream():
+            pass
+        return self.reply
+
+    async def save(self) -> None:
+        question = Message(
+            user_id=self.user_id,
+            lesson_id=self.lesson_id,
+            role=MessageRole.user.value,
+            content=self.question,
+            created_at=self.asked_at,
+            token_count=context_service.count_tokens(self.question),
+        )
+        answer = Message(
+            user_id=self.user_id,
+            lesson_id=self.lesson_id,
+            role=MessageRole.assistant.value,
+            content=self.reply,
+            created_at=datetime.utcnow(),
+            token_count=context_service.count_tokens(self.reply),
+        )
+        async with AsyncSessionLocal() as db:
+            db.add_all([question, answer])
+            await db.commit()
+            self.message_id = answer.id
+            await context_service.fold_old_turns(
+                db,
+                user_id=self.user_id,
+                lesson_id=self.lesson_id,
+                conversation_id=conversation_id(self.lesson_id),
+                keep=settings.TUTOR_HISTORY_MESSAGES,
+                max_summary_tokens=settings.TUTOR_SUMMARY_MAX_TOKENS,
+            )
+
+async def start_chat(
+    db: AsyncSession,
+    provider: LLMProvider,
+    *,
+    user_id: int,
+    question: str,
+    context: ChatContext,
+    preferences: TutorPreferences,
+) -> TutorTurn:
+    prompt = await context_service.build_prompt(
+        db,
+        user_id=user_id,
+        lesson_id=context.lesson_id,
+        conversation_id=conversation_id(context.lesson_id),
+        system=system_prompt(preferences, context),
+        question=question,
+        history_limit=settings.TUTOR_HISTORY_MESSAGES,
+        token_budget=settings.TUTOR_CONTEXT_TOKEN_BUDGET,
+    )
+    return TutorTurn(
+        provider,
+        user_id=user_id,
+        lesson_id=context.lesson_id,
+        question=question,
+        prompt=prompt,
+        log_context=context.dict(exclude_none=True),
+    )
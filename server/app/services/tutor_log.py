@@ -0,0 +1,93 @@
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import insert
+
+from app.core import metrics
+from app.core.batching import BatchBuffer
+from app.core.config import settings
+from app.db.session import async_engine
+from app.models.tutor_log import TutorLog
+
+COLUMNS = (
+    "user_id",
+    "session_id",
+    "kind",
+    "context",
+    "user_message",
+    "ai_response",
+    "feedback_rating",
+    "feedback_comment",
+    "latency_ms",
+    "created_at",
+)
+
+# Lesson feedback "understanding" answers as a 1-3 rating
+UNDERSTANDING_RATINGS = {"unclear": 1, "somewhat": 2, "clear": 3}
+
+def copy_rows(records: List[Dict[str, Any]]) -> List[tuple]:
+    """
+    ``records`` as COPY rows in COLUMNS order; COPY doesn't encode JSON itself
+    """
+    return [
+        tuple(
+            json.dumps(record[column]) if column == "context" and record[column] is not None
+            else record[column]
+            for column in COLUMNS
+        )
+        for record in records
+    ]
+
+async def write_tutor_logs(records: List[Dict[str, Any]]) -> None:
+    """
+    Bulk-insert buffered records: COPY on PostgreSQL (asyncpg), one
+    executemany INSERT elsewhere
+    """
+    async with async_engine.connect() as conn:
+        if async_engine.dialect.driver == "asyncpg":
+            raw = await conn.get_raw_connection()
+            await raw.driver_connection.copy_records_to_table(
+                TutorLog.__tablename__,
+                columns=COLUMNS,
+                records=copy_rows(records),
+            )
+        else:
+            await conn.execute(insert(TutorLog), records)
+        await conn.commit()
+
+tutor_log_buffer = BatchBuffer(
+    write_tutor_logs,
+    max_size=settings.TUTOR_LOG_BUFFER_SIZE,
+    flush_size=settings.TUTOR_LOG_FLUSH_SIZE,
+    flush_seconds=settings.TUTOR_LOG_FLUSH_SECONDS,
+)
+metrics.register("tutor_log_buffer", lambda: tutor_log_buffer.stats())
+
+def record(
+    *,
+    user_id: int,
+    session_id: str,
+    kind: str,
+    context: Optional[Dict[str, Any]] = None,
+    user_message: str = "",
+    ai_response: str = "",
+    feedback_rating: Optional[int] = None,
+    feedback_comment: Optional[str] = None,
+    latency_ms: Optional[int] = None,
+) -> bool:
+    """
+    Queue one tutor log record; False when the buffer is full and it was dropped
+    """
+    return tutor_log_buffer.add({
+        "user_id": user_id,
+        "session_id": session_id,
+        "kind": kind,
+        "context": context,
+        "user_message": user_message,
+        "ai_response": ai_response,
+        "feedback_rating": feedback_rating,
+        "feedback_comment": feedback_comment,
+        "latency_ms": latency_ms,
+        "created_at": datetime.utcnow(),
+    })
@@ -0,0 +1,33 @@
+"""
+Recompute the maintained counters on course progress rows.
+
+Completing a lesson keeps its progress row up to date, but adding or removing
+lessons from a course does not touch the learners' rows. Run this after
+editing a course (or to repair counters) to recompute completed_lessons,
+total_lessons, percent and completed_at in batches of primary keys.
+
+    python scripts/backfill_course_progress.py [--course-id 3] [--batch-size 5000]
+"""
+import argparse
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db.session import AsyncSessionLocal, async_engine
+from app.repositories.progress import backfill_progress
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--course-id", type=int, default=None, help="only this course's learners")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    args = parser.parse_args()
+
+    async with AsyncSessionLocal() as db:
+        updated = await backfill_progress(db, course_id=args.course_id, batch_size=args.batch_size)
+    await async_engine.dispose()
+    print(f"Recomputed {updated} course progress rows")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,89 @@
+"""
+Concurrent-request latency with a blocking vs. an async database session.
+
+Two routes run the same deliberately slow query: ``/blocking`` through the
+synchronous ``SessionLocal`` inside an ``async def`` handler (the previous
+pattern), ``/async`` through ``AsyncSessionLocal``. Every request in a burst
+is issued at once; with the blocking session they serialize on the event loop.
+``--depth`` is the CTE depth on SQLite and the sleep in microseconds on PostgreSQL.
+
+    python scripts/benchmarks/bench_async_db.py --requests 50
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy import text
+
+from app.db.session import AsyncSessionLocal, SessionLocal, is_sqlite
+
+# Waits on the server for PostgreSQL; SQLite has no sleep, so burn CPU instead
+if is_sqlite:
+    SLOW_QUERY = text(
+        "WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < :depth) "
+        "SELECT count(*) FROM n"
+    )
+else:
+    SLOW_QUERY = text("SELECT pg_sleep(:depth / 1000000.0)")
+
+def build_app(depth: int) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/blocking")
+    async def blocking():
+        db = SessionLocal()
+        try:
+            return {"n": db.execute(SLOW_QUERY, {"depth": depth}).scalar()}
+        finally:
+            db.close()
+
+    @app.get("/async")
+    async def non_blocking():
+        async with AsyncSessionLocal() as db:
+            return {"n": (await db.execute(SLOW_QUERY, {"depth": depth})).scalar()}
+
+    return app
+
+async def burst(client: httpx.AsyncClient, path: str, requests: int) -> list[float]:
+    # Latency is measured from the moment the whole burst is issued, which is
+    # what a client waiting behind a blocked event loop actually experiences
+    start = time.perf_counter()
+
+    async def one() -> float:
+        response = await client.get(path)
+        response.raise_for_status()
+        return time.perf_counter() - start
+
+    return await asyncio.gather(*(one() for _ in range(requests)))
+
+def report(label: str, latencies: list[float]) -> None:
+    latencies = sorted(latencies)
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(
+        f"{label:<10} p50={statistics.median(latencies) * 1000:8.1f} ms  "
+        f"p95={p95 * 1000:8.1f} ms  max={latencies[-1] * 1000:8.1f} ms"
+    )
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--depth", type=int, default=200_000)
+    args = parser.parse_args()
+
+    app = build_app(args.depth)
+    async with httpx.AsyncClient(app=app, base_url="http://bench") as client:
+        # Warm both connection pools
+        await client.get("/blocking")
+        await client.get("/async")
+        report("blocking", await burst(client, "/blocking", args.requests))
+        report("async", await burst(client, "/async", args.requests))
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,88 @@
+"""
+Deep-page latency of offset vs. keyset pagination on the courses table.
+
+Seeds ``--rows`` courses (1M by default) into the configured database unless
+it already holds that many, then times fetching the page at several depths
+with ``skip`` and with the equivalent ``(created_at, id)`` cursor.
+
+    DATABASE_URL=sqlite:///./bench.db python scripts/benchmarks/bench_course_pagination.py
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from sqlalchemy import func, insert, select
+
+from app.db.session import AsyncSessionLocal, engine
+from app.models import Base, Course
+from app.repositories import course as course_repo
+
+BATCH = 10_000
+
+def seed(rows: int) -> None:
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        existing = conn.scalar(select(func.count(Course.id)))
+        start = datetime(2024, 1, 1)
+        for offset in range(existing, rows, BATCH):
+            conn.execute(insert(Course), [
+                {
+                    "title": f"Course {n}",
+                    "description": "Seeded for pagination benchmarks",
+                    "level": "beginner",
+                    "estimated_time": 60,
+                    "is_published": True,
+                    # Coarse timestamps so many rows share created_at and the id tiebreak matters
+                    "created_at": start + timedelta(seconds=n // 10),
+                    "updated_at": start,
+                }
+                for n in range(offset, min(offset + BATCH, rows))
+            ])
+
+async def time_page(limit: int, repeats: int, **kwargs) -> float:
+    samples = []
+    async with AsyncSessionLocal() as db:
+        for _ in range(repeats):
+            start = time.perf_counter()
+            query = course_repo.paginate_courses(
+                select(Course.id, Course.created_at), limit=limit, category_id=None, **kwargs
+            )
+            (await db.execute(query)).all()
+            samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    seed(args.rows)
+    async with AsyncSessionLocal() as db:
+        for depth in (0, args.rows // 10, args.rows // 2, args.rows - args.limit):
+            # The keyset equivalent of skip=depth is the key of row depth - 1
+            after = None
+            if depth:
+                row = (await db.execute(
+                    select(Course.created_at, Course.id)
+                    .order_by(Course.created_at, Course.id)
+                    .offset(depth - 1)
+                    .limit(1)
+                )).one()
+                after = (row.created_at, row.id)
+            offset_time = await time_page(args.limit, args.repeats, skip=depth, after=None)
+            keyset_time = await time_page(args.limit, args.repeats, skip=0, after=after)
+            print(
+                f"depth={depth:<9} offset={offset_time * 1000:9.2f} ms  "
+                f"keyset={keyset_time * 1000:7.2f} ms"
+            )
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,78 @@
+"""
+Tutor provider behaviour under classroom load, against the local stub server.
+
+Starts scripts/stub_llm_server.py in-process, then sends ``--requests``
+concurrent prompts of which ``--distinct`` are different, through the shared
+pooled client. Reports throughput, how many prompts were coalesced, retries,
+queue time, and the most requests the stub ever had open at once (never more
+than ``--concurrency``).
+
+    python scripts/benchmarks/bench_llm_provider.py --requests 200 --distinct 20 --concurrency 8
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import httpx
+import uvicorn
+
+from app.services.llm import BoundedProvider, OpenAIProvider, ProviderBusy
+from scripts.stub_llm_server import create_app
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--distinct", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--queue", type=int, default=64)
+    parser.add_argument("--delay", type=float, default=0.01)
+    parser.add_argument("--fail-every", type=int, default=10)
+    parser.add_argument("--port", type=int, default=8199)
+    args = parser.parse_args()
+
+    stub = create_app(args.delay, args.fail_every)
+    server = uvicorn.Server(uvicorn.Config(stub, port=args.port, log_level="warning"))
+    serving = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.01)
+
+    client = httpx.AsyncClient(
+        base_url=f"http://127.0.0.1:{args.port}/v1",
+        limits=httpx.Limits(max_connections=args.concurrency),
+    )
+    provider = BoundedProvider(
+        OpenAIProvider(client, api_key=None, model="stub", temperature=0, max_tokens=100),
+        max_concurrency=args.concurrency,
+        max_queue=args.queue,
+        max_retries=3,
+        retry_base_seconds=0.01,
+    )
+
+    async def ask(index: int) -> str:
+        messages = [{"role": "user", "content": f"Explain concept {index % args.distinct}"}]
+        try:
+            return "".join([chunk async for chunk in provider.stream(messages)])
+        except ProviderBusy:
+            return "busy"
+
+    started = time.perf_counter()
+    replies = await asyncio.gather(*(ask(index) for index in range(args.requests)), return_exceptions=True)
+    elapsed = time.perf_counter() - started
+
+    failed = sum(1 for reply in replies if isinstance(reply, Exception))
+    busy = sum(1 for reply in replies if reply == "busy")
+    print(f"{args.requests} prompts ({args.distinct} distinct) in {elapsed:.2f}s "
+          f"= {args.requests / elapsed:.0f}/s, {busy} shed, {failed} failed")
+    print(f"stub: {stub.state.requests} requests, max {stub.state.max_in_flight} in flight")
+    print(f"provider: {provider.stats()}")
+
+    await provider.aclose()
+    server.should_exit = True
+    await serving
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,72 @@
+"""
+Login throughput as the password hashing pool grows.
+
+Seeds one user, then fires ``--requests`` concurrent logins through the real
+``/auth/login`` endpoint for each pool size from 1 up to the number of cores.
+Throughput should scale roughly linearly until the pool matches the core count.
+
+    python scripts/benchmarks/bench_login.py --requests 64
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import httpx
+from sqlalchemy import select
+
+from app.core import security
+from app.core.config import settings
+from app.core.hashing import PasswordHashPool
+from app.db.session import SessionLocal, engine
+from app.main import app
+from app.models import Base, User
+
+EMAIL = "login-bench@example.com"
+PASSWORD = "login-bench-password"
+
+def seed_user() -> None:
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        if not db.scalar(select(User).where(User.email == EMAIL)):
+            db.add(User(email=EMAIL, hashed_password=security.get_password_hash(PASSWORD)))
+            db.commit()
+    finally:
+        db.close()
+
+async def run(requests: int, workers: int) -> float:
+    security.password_hash_pool = PasswordHashPool(
+        max_workers=workers, max_queue=max(requests, settings.PASSWORD_HASH_MAX_QUEUE)
+    )
+    form = {"username": EMAIL, "password": PASSWORD}
+    async with httpx.AsyncClient(app=app, base_url="http://bench") as client:
+        await client.post(f"{settings.API_V1_STR}/auth/login", data=form)
+        start = time.perf_counter()
+        responses = await asyncio.gather(
+            *(client.post(f"{settings.API_V1_STR}/auth/login", data=form) for _ in range(requests))
+        )
+        elapsed = time.perf_counter() - start
+    assert all(r.status_code == 200 for r in responses), {r.status_code for r in responses}
+    security.password_hash_pool.shutdown()
+    return requests / elapsed
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=64)
+    args = parser.parse_args()
+
+    seed_user()
+    cores = os.cpu_count() or 1
+    workers = 1
+    while True:
+        print(f"workers={workers:<3} {await run(args.requests, workers):7.1f} logins/s")
+        if workers >= cores:
+            break
+        workers = min(workers * 2, cores)
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,97 @@
+"""
+Time the recommendation model on a generated catalogue.
+
+Builds ``--users`` learners (100k by default) who each work through a few
+courses drawn from topic clusters, then times the full build (completion
+matrix, co-occurrence, similarity, top-K for everyone) and an incremental
+refresh for ``--changed`` learners. No database is involved.
+
+    python scripts/benchmarks/bench_recommendations.py [--users 100000]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import numpy as np
+
+from app.services.recommendations import CompletionModel, recommend
+
+def catalogue(courses: int, lessons_per_course: int):
+    lesson_courses = [
+        (course * lessons_per_course + lesson + 1, course + 1)
+        for course in range(courses)
+        for lesson in range(lessons_per_course)
+    ]
+    return lesson_courses
+
+def learners(rng: np.random.Generator, users: int, courses: int, lessons_per_course: int, topics: int):
+    """
+    Each learner picks a topic and takes 1-5 of its courses, completing a
+    random prefix of each; returns (user_ids, lesson_ids, started pairs)
+    """
+    topic_size = courses // topics
+    user_ids, lesson_ids, started = [], [], []
+    for user_id in range(1, users + 1):
+        topic = rng.integers(topics)
+        taken = rng.choice(topic_size, size=rng.integers(1, 6), replace=False) + topic * topic_size
+        for course in taken:
+            done = rng.integers(1, lessons_per_course + 1)
+            user_ids.append(np.full(done, user_id))
+            lesson_ids.append(course * lessons_per_course + np.arange(done) + 1)
+            started.append((user_id, int(course) + 1))
+    return np.concatenate(user_ids), np.concatenate(lesson_ids), started
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--courses", type=int, default=500)
+    parser.add_argument("--lessons-per-course", type=int, default=12)
+    parser.add_argument("--topics", type=int, default=25)
+    parser.add_argument("--changed", type=int, default=1_000)
+    parser.add_argument("--top-k", type=int, default=10)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(23)
+    lesson_courses = catalogue(args.courses, args.lessons_per_course)
+    user_ids, lesson_ids, started = learners(
+        rng, args.users, args.courses, args.lessons_per_course, args.topics
+    )
+    print(f"users={args.users} lessons={len(lesson_courses)} completions={len(user_ids)}")
+
+    start = time.perf_counter()
+    model = CompletionModel()
+    users = model.add(user_ids, lesson_ids)
+    built = time.perf_counter()
+    suggestions = dict(recommend(model, users, lesson_courses, started, args.top_k))
+    scored = time.perf_counter()
+    print(
+        f"full:        matrix+cooccurrence={built - start:6.2f} s  "
+        f"similarity+top-{args.top_k}={scored - built:6.2f} s  "
+        f"({(scored - built) / len(users) * 1e6:.1f} us/learner)"
+    )
+
+    # The changed learners finish one more lesson in a course they started
+    changed = rng.choice(args.users, size=args.changed, replace=False) + 1
+    started_by_user = dict(started)
+    new_lessons = np.array([
+        (started_by_user[user_id] - 1) * args.lessons_per_course + args.lessons_per_course
+        for user_id in changed
+    ])
+    start = time.perf_counter()
+    users = model.add(changed, new_lessons)
+    added = time.perf_counter()
+    dict(recommend(model, users, lesson_courses, started, args.top_k))
+    scored = time.perf_counter()
+    print(
+        f"incremental: update={added - start:6.2f} s  "
+        f"similarity+top-{args.top_k}={scored - added:6.2f} s  for {len(users)} learners"
+    )
+
+    sample = int(users[0])
+    print(f"learner {sample} -> {suggestions.get(sample, [])[:5]}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Requests/sec for GET /samples/courses/{course_id}: re-serializing the
+Pydantic model per request (previous handler) vs. the pre-serialized
+catalogue, plus conditional requests that end in 304.
+
+    python scripts/benchmarks/bench_sample_catalogue.py --requests 2000
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import httpx
+from fastapi import FastAPI
+
+from app.api.v1.endpoints import sample_content
+from app.data.sample_courses.web_development_intro import sample_courses
+
+COURSE_ID = "web_development_intro"
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+    app.include_router(sample_content.router, prefix="/samples")
+
+    @app.get("/baseline/courses/{course_id}")
+    async def baseline(course_id: str):
+        return sample_courses[course_id]
+
+    return app
+
+async def rate(client: httpx.AsyncClient, path: str, requests: int, headers: dict) -> float:
+    start = time.perf_counter()
+    for _ in range(requests):
+        response = await client.get(path, headers=headers)
+        assert response.status_code in (200, 304), response.status_code
+    return requests / (time.perf_counter() - start)
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    async with httpx.AsyncClient(app=build_app(), base_url="http://bench") as client:
+        current = await client.get(f"/samples/courses/{COURSE_ID}", headers={"accept-encoding": "gzip"})
+        cases = [
+            ("re-serialized model", f"/baseline/courses/{COURSE_ID}", {"accept-encoding": "identity"}),
+            ("pre-serialized", f"/samples/courses/{COURSE_ID}", {"accept-encoding": "identity"}),
+            ("pre-compressed gzip", f"/samples/courses/{COURSE_ID}", {"accept-encoding": "gzip"}),
+            ("304 revalidation", f"/samples/courses/{COURSE_ID}",
+             {"accept-encoding": "gzip", "if-none-match": current.headers["etag"]}),
+        ]
+        for label, path, headers in cases:
+            print(f"{label:<22} {await rate(client, path, args.requests, headers):8.0f} req/s")
+
+if __name__ == "__main__":
+    asyncio.run(main())
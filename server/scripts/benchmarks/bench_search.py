@@ -0,0 +1,124 @@
+"""
+Catalogue search latency: the full-text index vs. scanning with ILIKE.
+
+Seeds ``--courses`` courses (2,000 by default), each with ``--modules``
+modules of ``--lessons`` lessons of generated text, into the configured
+database unless it already holds that many, then times a set of queries
+through ``search_catalogue`` and through the equivalent substring scan.
+
+    SQLALCHEMY_DATABASE_URI=sqlite:///./bench.db python scripts/benchmarks/bench_search.py
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from sqlalchemy import and_, func, insert, literal, or_, select, union_all
+
+from app.db.session import AsyncSessionLocal, engine
+from app.models import Base, Course, Lesson, Module
+from app.repositories import search as search_repo
+
+VOCABULARY = (
+    "algebra geometry calculus derivative integral matrix vector probability statistics "
+    "variance regression gradient descent network neuron function variable equation proof "
+    "theorem python javascript recursion iteration array pointer memory cache compiler "
+    "grammar vocabulary essay reading writing history empire revolution economy market "
+    "chemistry molecule reaction energy physics force motion wave quantum biology cell gene"
+).split()
+QUERIES = ["gradient descent", "quantum", "recursion array", "empire history", "molec"]
+PARAGRAPH_WORDS = 120
+
+# Made-up words standing in for the long tail of a real catalogue, so the
+# subject words above are as selective as they would be in practice
+FILLER = [f"{syllable}{n}" for syllable in ("ka", "lo", "mi", "su", "te") for n in range(1_000)]
+
+def paragraph(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(VOCABULARY if rng.random() < 0.02 else FILLER) for _ in range(words))
+
+def seed(courses: int, modules: int, lessons: int) -> None:
+    Base.metadata.create_all(bind=engine)
+    rng = random.Random(21)
+    with engine.begin() as conn:
+        existing = conn.scalar(select(func.count(Course.id)))
+        for _ in range(existing, courses):
+            course_id = conn.execute(insert(Course).values(
+                title=paragraph(rng, 4).title(),
+                description=paragraph(rng, 30),
+                level="beginner",
+                estimated_time=60,
+                is_published=True,
+            )).inserted_primary_key[0]
+            for module_order in range(modules):
+                module_id = conn.execute(insert(Module).values(
+                    title=paragraph(rng, 3).title(),
+                    description=paragraph(rng, 20),
+                    order=module_order,
+                    course_id=course_id,
+                )).inserted_primary_key[0]
+                conn.execute(insert(Lesson), [
+                    {
+                        "title": paragraph(rng, 4).title(),
+                        "content": paragraph(rng, PARAGRAPH_WORDS),
+                        "order": lesson_order,
+                        "module_id": module_id,
+                    }
+                    for lesson_order in range(lessons)
+                ])
+
+def substring_query(q: str):
+    """
+    What search looked like without an index: every word as a substring of
+    title or text, across all three tables. Ranking needs every match, so
+    there is no LIMIT to stop the scan early.
+    """
+    words = q.split()
+
+    def matches(*columns):
+        return and_(*(or_(*(column.ilike(f"%{word}%") for column in columns)) for word in words))
+    return union_all(
+        select(literal("course"), Course.id).where(matches(Course.title, Course.description)),
+        select(literal("module"), Module.id).where(matches(Module.title, Module.description)),
+        select(literal("lesson"), Lesson.id).where(matches(Lesson.title, Lesson.content)),
+    )
+
+async def time_query(run, repeats: int) -> float:
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        await run()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--courses", type=int, default=2_000)
+    parser.add_argument("--modules", type=int, default=5)
+    parser.add_argument("--lessons", type=int, default=10)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    seed(args.courses, args.modules, args.lessons)
+    async with AsyncSessionLocal() as db:
+        print(f"lessons={await db.scalar(select(func.count(Lesson.id)))}")
+        for q in QUERIES:
+            hits = await search_repo.search_catalogue(db, q, limit=args.limit)
+            index_time = await time_query(
+                lambda: search_repo.search_catalogue(db, q, limit=args.limit), args.repeats
+            )
+            scan_time = await time_query(
+                lambda: db.execute(substring_query(q)), args.repeats
+            )
+            print(
+                f"{q!r:<26} hits={len(hits):<3} index={index_time * 1000:8.2f} ms  "
+                f"scan={scan_time * 1000:9.2f} ms"
+            )
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,47 @@
+"""
+Time ``import app.main`` in a fresh interpreter, as every uvicorn worker does.
+
+``--with-create-all`` also runs ``Base.metadata.create_all`` after the import,
+reproducing what each worker paid when the schema was created at import time.
+
+    python scripts/benchmarks/bench_startup.py --runs 10
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+IMPORT_APP = "import app.main"
+CREATE_ALL = (
+    "import app.main; from app.db.session import engine; from app.models import Base; "
+    "Base.metadata.create_all(bind=engine)"
+)
+
+def time_run(code: str) -> float:
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", code], cwd=SERVER_DIR, check=True)
+    return time.perf_counter() - start
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--with-create-all", action="store_true")
+    args = parser.parse_args()
+
+    cases = [("import app.main", IMPORT_APP)]
+    if args.with_create_all:
+        cases.append(("import + create_all", CREATE_ALL))
+    for label, code in cases:
+        time_run(code)  # warm the bytecode cache
+        samples = sorted(time_run(code) for _ in range(args.runs))
+        print(
+            f"{label:<22} median={statistics.median(samples) * 1000:7.1f} ms  "
+            f"min={samples[0] * 1000:7.1f} ms  max={samples[-1] * 1000:7.1f} ms"
+        )
+
+if __name__ == "__main__":
+    main()
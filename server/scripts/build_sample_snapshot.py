@@ -0,0 +1,21 @@
+"""
+Precompile the sample courses to JSON so API workers can serve them without
+importing or validating the course modules.
+
+    python scripts/build_sample_snapshot.py
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.data.sample_courses import SNAPSHOT_DIR, SampleCourseRegistry
+
+def main() -> None:
+    # Build from the modules, never from a snapshot that may be stale
+    registry = SampleCourseRegistry(snapshot_dir=None)
+    registry.write_snapshot(SNAPSHOT_DIR)
+    print(f"Wrote {len(registry.course_ids())} sample courses to {SNAPSHOT_DIR}")
+
+if __name__ == "__main__":
+    main()
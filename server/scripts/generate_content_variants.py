@@ -0,0 +1,75 @@
+"""
+Generate the accessibility variants of every lesson.
+
+Each lesson gets one variant per key in VARIANT_KEYS (simplified language,
+chunked steps, larger code font and their combinations), rendered in a
+process pool. Lessons whose variants already match their content_hash and
+VARIANT_VERSION are skipped, so run this after content changes, a
+VARIANT_VERSION bump, or scripts/render_lessons.py.
+
+    python scripts/generate_content_variants.py [--workers N] [--batch-size 200]
+"""
+import argparse
+import asyncio
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.rendering import content_hash
+from app.core.variants import render_variants
+from app.db.session import AsyncSessionLocal, async_engine
+from app.repositories import content_variants as variant_repo
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--batch-size", type=int, default=200)
+    args = parser.parse_args()
+
+    loop = asyncio.get_running_loop()
+    generated = checked = unrendered = 0
+    last_id = 0
+    generated_at = datetime.utcnow()
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        async with AsyncSessionLocal() as db:
+            while True:
+                lessons = await variant_repo.lesson_batches(db, last_id, args.batch_size)
+                if not lessons:
+                    break
+                last_id = lessons[-1][0]
+                checked += len(lessons)
+                # Variants are served against the stored hash; a lesson whose
+                # HTML is out of date waits for scripts/render_lessons.py
+                rendered = [
+                    (lesson_id, content or "", stored_hash)
+                    for lesson_id, content, stored_hash in lessons
+                    if stored_hash == content_hash(content or "")
+                ]
+                unrendered += len(lessons) - len(rendered)
+                current = await variant_repo.current_lesson_ids(
+                    db, [(lesson_id, stored_hash) for lesson_id, _, stored_hash in rendered]
+                ) if rendered else set()
+                stale = [lesson for lesson in rendered if lesson[0] not in current]
+                results = await asyncio.gather(*(
+                    loop.run_in_executor(pool, render_variants, content)
+                    for _, content, _ in stale
+                ))
+                await variant_repo.replace_variants(
+                    db,
+                    {
+                        lesson_id: (stored_hash, variants)
+                        for (lesson_id, _, stored_hash), variants in zip(stale, results)
+                    },
+                    generated_at=generated_at,
+                )
+                generated += len(stale)
+    await async_engine.dispose()
+    print(f"Generated variants for {generated} of {checked} lessons")
+    if unrendered:
+        print(f"Skipped {unrendered} lessons with stale HTML; run scripts/render_lessons.py first")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,48 @@
+"""
+Refresh the precomputed "next course" suggestions.
+
+Without ``--every`` this rebuilds every learner's suggestions once and exits
+(e.g. from cron). With ``--every SECONDS`` it keeps running: the first pass
+is a full rebuild, later passes only rescore learners with new completions.
+Use this instead of RECOMMENDATION_REFRESH_SECONDS when the API runs
+several workers, so the work is done once.
+
+    python scripts/refresh_recommendations.py [--every 900]
+"""
+import argparse
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.config import settings
+from app.db.session import async_engine
+from app.services.recommendations import RecommendationRefresher
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--every", type=float, default=0, help="seconds between refreshes")
+    parser.add_argument("--top-k", type=int, default=settings.RECOMMENDATION_TOP_K)
+    args = parser.parse_args()
+
+    refresher = RecommendationRefresher(
+        top_k=args.top_k,
+        interval_seconds=args.every,
+        full_refresh_seconds=settings.RECOMMENDATION_FULL_REFRESH_SECONDS,
+    )
+    try:
+        while True:
+            result = await refresher.refresh()
+            print(
+                f"{'Full' if result['full'] else 'Incremental'} refresh: "
+                f"{result['users']} learners in {result['seconds']}s"
+            )
+            if not args.every:
+                break
+            await asyncio.sleep(args.every)
+    finally:
+        await async_engine.dispose()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,59 @@
+"""
+Render lesson content to HTML ahead of time.
+
+Lessons saved through the API are rendered when written and the rest on
+first view; run this after a migration, a bulk import or a RENDERER_VERSION
+bump so no learner waits for a render. Only lessons whose stored hash does
+not match their content are rewritten.
+
+    python scripts/render_lessons.py [--batch-size 500]
+"""
+import argparse
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import select, update
+
+from app.core.rendering import content_hash, render_html
+from app.db.session import AsyncSessionLocal, async_engine
+from app.models import Lesson
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    rendered = checked = 0
+    last_id = 0
+    async with AsyncSessionLocal() as db:
+        while True:
+            rows = (await db.execute(
+                select(Lesson.id, Lesson.content, Lesson.content_hash)
+                .where(Lesson.id > last_id)
+                .order_by(Lesson.id)
+                .limit(args.batch_size)
+            )).all()
+            if not rows:
+                break
+            last_id = rows[-1].id
+            checked += len(rows)
+            stale = [row for row in rows if row.content_hash != content_hash(row.content or "")]
+            for row in stale:
+                await db.execute(
+                    update(Lesson)
+                    .where(Lesson.id == row.id)
+                    .values(
+                        content_html=render_html(row.content or ""),
+                        content_hash=content_hash(row.content or ""),
+                    )
+                )
+            await db.commit()
+            rendered += len(stale)
+    await async_engine.dispose()
+    print(f"Rendered {rendered} of {checked} lessons")
+
+if __name__ == "__main__":
+    asyncio.run(main())
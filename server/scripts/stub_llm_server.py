@@ -0,0 +1,71 @@
+"""
+Local stand-in for an OpenAI-compatible chat completions API.
+
+Streams a fixed reply word by word so the tutor's real HTTP path (pooling,
+backpressure, retries) can be exercised without an API key:
+
+    python scripts/stub_llm_server.py --port 8100 --delay 0.02 --fail-every 5
+    AI_BASE_URL=http://localhost:8100/v1 uvicorn app.main:app
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import StreamingResponse
+
+def create_app(delay: float = 0.0, fail_every: int = 0) -> FastAPI:
+    stub = FastAPI()
+    stub.state.requests = 0
+    stub.state.in_flight = 0
+    stub.state.max_in_flight = 0
+
+    @stub.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        stub.state.requests += 1
+        if fail_every and stub.state.requests % fail_every == 0:
+            return Response(status_code=503, content="stub: simulated overload")
+        question = body["messages"][-1]["content"]
+
+        async def events():
+            stub.state.in_flight += 1
+            stub.state.max_in_flight = max(stub.state.max_in_flight, stub.state.in_flight)
+            try:
+                for word in f"Stub answer to: {question}".split(" "):
+                    await asyncio.sleep(delay)
+                    chunk = {
+                        "created": int(time.time()),
+                        "model": body.get("model"),
+                        "choices": [{"index": 0, "delta": {"content": f"{word} "}}],
+                    }
+                    yield f"data: {json.dumps(chunk)}\n\n"
+                yield "data: [DONE]\n\n"
+            finally:
+                stub.state.in_flight -= 1
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    @stub.get("/stats")
+    async def stats():
+        return {
+            "requests": stub.state.requests,
+            "in_flight": stub.state.in_flight,
+            "max_in_flight": stub.state.max_in_flight,
+        }
+
+    return stub
+
+def main() -> None:
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--delay", type=float, default=0.02, help="seconds between chunks")
+    parser.add_argument("--fail-every", type=int, default=0, help="answer every Nth request with a 503")
+    args = parser.parse_args()
+    uvicorn.run(create_app(args.delay, args.fail_every), host="127.0.0.1", port=args.port)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+import itertools
+import os
+import tempfile
+from typing import Dict
+
+# Point the app at a throwaway SQLite database and the offline tutor before
+# anything under app/ reads the settings
+_data_dir = tempfile.mkdtemp(prefix="lms-tests-")
+os.environ["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{_data_dir}/test.db"
+os.environ.setdefault("AI_PROVIDER", "fake")
+
+import httpx
+import pytest
+
+from app.core.security import create_access_token
+from app.core.user_cache import user_cache
+from app.db.session import SessionLocal, engine
+from app.main import app
+from app.models import Base, Category, Course, Lesson, Module, User
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+@pytest.fixture(autouse=True)
+def database():
+    """
+    A fresh schema for every test
+    """
+    Base.metadata.create_all(bind=engine)
+    yield
+    Base.metadata.drop_all(bind=engine)
+    user_cache.local.clear()
+
+@pytest.fixture
+async def client():
+    async with httpx.AsyncClient(app=app, base_url="http://test") as client:
+        yield client
+
+_category_numbers = itertools.count(1)
+
+def create_user(email: str = "learner@example.com", *, is_superuser: bool = False) -> User:
+    # Tests authenticate with a token, so the password hash is never checked
+    with SessionLocal() as db:
+        user = User(email=email, hashed_password="unused", is_superuser=is_superuser)
+        db.add(user)
+        db.commit()
+        db.refresh(user)
+        return user
+
+def auth_headers(user: User) -> Dict[str, str]:
+    return {"Authorization": f"Bearer {create_access_token(user.id)}"}
+
+@pytest.fixture
+def user_headers() -> Dict[str, str]:
+    return auth_headers(create_user())
+
+def seed_courses(db, courses: int, modules: int, lessons: int) -> Category:
+    """
+    ``courses`` courses with ``modules`` modules of ``lessons`` lessons each
+    """
+    category = Category(name=f"Category {next(_category_numbers)}")
+    for course_number in range(courses):
+        course = Course(
+            title=f"Course {course_number}",
+            description="Description",
+            level="beginner",
+            estimated_time=10,
+            categories=[category],
+        )
+        for module_number in range(modules):
+            module = Module(title=f"Module {module_number}", order=module_number + 1, course=course)
+            for lesson_number in range(lessons):
+                Lesson(
+                    title=f"Lesson {lesson_number}",
+                    content=f"Lesson {lesson_number} content",
+                    order=lesson_number + 1,
+                    module=module,
+                )
+        db.add(course)
+    db.commit()
+    return category
@@ -0,0 +1,131 @@
+import asyncio
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import select
+
+from app.core.batching import BatchBuffer
+from app.db.session import SessionLocal
+from app.models.tutor_log import TutorLog
+from app.services import tutor_log
+from tests.conftest import create_user
+
+pytestmark = pytest.mark.anyio
+
+class SlowFlush:
+    """Records each batch after ``seconds``; ``started`` is set once one is under way"""
+
+    def __init__(self, seconds: float) -> None:
+        self.seconds = seconds
+        self.batches = []
+        self.started = asyncio.Event()
+
+    async def __call__(self, batch):
+        self.started.set()
+        await asyncio.sleep(self.seconds)
+        self.batches.append([record["n"] for record in batch])
+
+def _buffer(flush, **options) -> BatchBuffer:
+    return BatchBuffer(flush, **{"max_size": 100, "flush_size": 3, "flush_seconds": 60, **options})
+
+async def test_stop_waits_for_the_flush_in_progress():
+    flush = SlowFlush(0.05)
+    buffer = _buffer(flush)
+    buffer.start()
+    for n in range(7):
+        buffer.add({"n": n})
+    await flush.started.wait()
+
+    await buffer.stop()
+
+    assert sum(flush.batches, []) == list(range(7))
+    stats = buffer.stats()
+    assert (stats["written"], stats["failed"], stats["dropped"], stats["pending"]) == (7, 0, 0, 0)
+
+async def test_a_cancelled_flush_keeps_its_batch():
+    flush = SlowFlush(0.05)
+    buffer = _buffer(flush)
+    buffer.start()
+    for n in range(4):
+        buffer.add({"n": n})
+    await flush.started.wait()
+
+    buffer._task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await buffer._task
+    buffer._task = None
+    assert buffer.stats()["pending"] == 4
+
+    await buffer.stop()
+    assert sum(flush.batches, []) == [0, 1, 2, 3]
+
+async def test_a_failed_flush_is_counted():
+    async def failing(batch):
+        raise RuntimeError("database unavailable")
+
+    buffer = _buffer(failing)
+    for n in range(4):
+        buffer.add({"n": n})
+    await buffer.stop()
+    assert (buffer.stats()["failed"], buffer.stats()["written"]) == (4, 0)
+
+async def test_records_over_the_limit_are_dropped():
+    buffer = _buffer(SlowFlush(0), max_size=2)
+    assert [buffer.add({"n": n}) for n in range(3)] == [True, True, False]
+    assert buffer.stats()["dropped"] == 1
+
+def _record(user_id: int, **fields):
+    return {
+        "user_id": user_id,
+        "session_id": "session",
+        "kind": "chat",
+        "context": {"lesson_id": 1},
+        "user_message": "question",
+        "ai_response": "answer",
+        "feedback_rating": None,
+        "feedback_comment": None,
+        "latency_ms": 12,
+        "created_at": datetime(2026, 1, 1),
+        **fields,
+    }
+
+async def test_tutor_logs_are_inserted():
+    user = create_user()
+    await tutor_log.write_tutor_logs([_record(user.id), _record(user.id, context=None, kind="feedback")])
+    with SessionLocal() as db:
+        rows = db.execute(select(TutorLog.kind, TutorLog.context).order_by(TutorLog.id)).all()
+    assert [tuple(row) for row in rows] == [("chat", {"lesson_id": 1}), ("feedback", None)]
+
+async def test_tutor_logs_are_copied_on_asyncpg(monkeypatch):
+    copied = []
+
+    class DriverConnection:
+        async def copy_records_to_table(self, table, *, columns, records):
+            copied.append((table, columns, records))
+
+    class Connection:
+        committed = False
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc):
+            return False
+
+        async def get_raw_connection(self):
+            return SimpleNamespace(driver_connection=DriverConnection())
+
+        async def commit(self):
+            Connection.committed = True
+
+    engine = SimpleNamespace(dialect=SimpleNamespace(driver="asyncpg"), connect=Connection)
+    monkeypatch.setattr(tutor_log, "async_engine", engine)
+
+    await tutor_log.write_tutor_logs([_record(5), _record(6, context=None)])
+
+    [(table, columns, records)] = copied
+    assert (table, columns) == ("tutor_logs", tutor_log.COLUMNS)
+    assert records[0] == (5, "session", "chat", '{"lesson_id": 1}', "question", "answer", None, None, 12, datetime(2026, 1, 1))
+    assert records[1][:4] == (6, "session", "chat", None)
+    assert Connection.committed
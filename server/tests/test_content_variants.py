@@ -0,0 +1,85 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy import text
+
+from app.core.variants import PREFERENCE_FEATURES, render_variants
+from app.db.session import AsyncSessionLocal, SessionLocal, engine
+from app.models import Lesson, UserPreference
+from app.repositories import content_variants as variant_repo
+from app.schemas.preferences import AccessibilitySettings
+from app.services.content_variants import variant_preferences
+from tests.conftest import auth_headers, create_user, seed_courses
+
+pytestmark = pytest.mark.anyio
+
+@pytest.fixture(autouse=True)
+def clear_preferences():
+    yield
+    variant_preferences.local.clear()
+
+@pytest.fixture
+async def lesson_id() -> int:
+    with SessionLocal() as db:
+        seed_courses(db, 1, 1, 1)
+        lesson = db.query(Lesson).one()
+        lesson_id, content, content_hash = lesson.id, lesson.content, lesson.content_hash
+    async with AsyncSessionLocal() as db:
+        await variant_repo.replace_variants(
+            db,
+            {lesson_id: (content_hash, render_variants(content))},
+            generated_at=datetime.utcnow(),
+        )
+    return lesson_id
+
+def test_schema_covers_every_preference_flag():
+    assert set(AccessibilitySettings.__fields__) == set(PREFERENCE_FEATURES)
+
+async def test_settings_pick_the_served_variant(client, lesson_id):
+    headers = auth_headers(create_user())
+
+    response = await client.get(f"/api/v1/courses/lessons/{lesson_id}", headers=headers)
+    assert response.status_code == 200
+    assert response.json()["variant"] is None
+
+    response = await client.get("/api/v1/preferences/me/accessibility", headers=headers)
+    assert response.json() == {"simplified_language": False, "chunked_steps": False, "large_code_font": False}
+
+    response = await client.put(
+        "/api/v1/preferences/me/accessibility",
+        json={"large_code_font": True, "simplified_language": True},
+        headers=headers,
+    )
+    assert response.status_code == 200
+
+    # The cached standard presentation is dropped by the write
+    response = await client.get(f"/api/v1/courses/lessons/{lesson_id}", headers=headers)
+    assert response.json()["variant"] == "simplified+large_code"
+
+async def test_update_keeps_other_stored_settings(client):
+    user = create_user()
+    with SessionLocal() as db:
+        db.add(UserPreference(user_id=user.id, accessibility_settings={"captions": True}))
+        db.commit()
+
+    response = await client.put(
+        "/api/v1/preferences/me/accessibility", json={"chunked_steps": True}, headers=auth_headers(user)
+    )
+    assert response.json()["chunked_steps"] is True
+    with SessionLocal() as db:
+        stored = db.query(UserPreference).filter_by(user_id=user.id).one().accessibility_settings
+    assert stored == {"captions": True, "simplified_language": False, "chunked_steps": True, "large_code_font": False}
+
+async def test_unreadable_settings_serve_the_standard_lesson(client, lesson_id):
+    # As on a database migrated before the column existed
+    with engine.begin() as connection:
+        connection.execute(text("ALTER TABLE user_preferences DROP COLUMN accessibility_settings"))
+
+    response = await client.get(f"/api/v1/courses/lessons/{lesson_id}", headers=auth_headers(create_user()))
+    assert response.status_code == 200
+    assert response.json()["variant"] is None
+    assert response.json()["content_html"]
+
+async def test_settings_require_sign_in(client):
+    response = await client.get("/api/v1/preferences/me/accessibility")
+    assert response.status_code == 401
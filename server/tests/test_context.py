@@ -0,0 +1,41 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.db.session import AsyncSessionLocal, SessionLocal
+from app.models import Message
+from app.services import context as context_service
+from tests.conftest import create_user
+
+pytestmark = pytest.mark.anyio
+
+async def test_overlapping_turns_are_each_summarized_or_recent_exactly_once():
+    user = create_user()
+    start = datetime(2026, 1, 1)
+    with SessionLocal() as db:
+        # The second turn was asked first but saved last, so created_at and
+        # id disagree; several messages also share a timestamp
+        for index, minutes in enumerate([0, 0, 5, 5, 1, 1, 7, 7, 7, 7]):
+            db.add(Message(
+                user_id=user.id,
+                lesson_id=None,
+                role="user" if index % 2 == 0 else "assistant",
+                content=f"message {index}",
+                created_at=start + timedelta(minutes=minutes),
+            ))
+        db.commit()
+
+    async with AsyncSessionLocal() as db:
+        for keep in (8, 5, 2):
+            await context_service.fold_old_turns(
+                db, user_id=user.id, lesson_id=None, conversation_id="general",
+                keep=keep, max_summary_tokens=10_000,
+            )
+        summary = await context_service.get_summary(db, user_id=user.id, conversation_id="general")
+        recent = await context_service.recent_messages(
+            db, user_id=user.id, lesson_id=None, after_id=summary.summarized_through_id, limit=10
+        )
+    seen = [line.rsplit(" ", 1)[-1] for line in summary.summary.splitlines()]
+    seen += [message.content.rsplit(" ", 1)[-1] for message in recent]
+
+    assert seen == [str(index) for index in range(10)]
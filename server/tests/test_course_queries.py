@@ -0,0 +1,57 @@
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+import pytest
+from sqlalchemy import event
+
+from app.db.session import SessionLocal, async_engine
+from tests.conftest import seed_courses
+
+pytestmark = pytest.mark.anyio
+
+@contextmanager
+def count_queries() -> Iterator[List[str]]:
+    statements: List[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", record)
+
+def seed(courses: int, modules: int, lessons: int) -> None:
+    with SessionLocal() as db:
+        seed_courses(db, courses, modules, lessons)
+
+async def queries_for(client, url: str, headers: Optional[Dict[str, str]] = None) -> int:
+    with count_queries() as statements:
+        response = await client.get(url, headers=headers)
+    assert response.status_code == 200
+    return len(statements)
+
+async def test_list_courses_query_count_does_not_grow_with_the_tree(client):
+    seed(courses=2, modules=1, lessons=1)
+    small = await queries_for(client, "/api/v1/courses/?limit=100")
+
+    seed(courses=20, modules=3, lessons=4)
+    response = await client.get("/api/v1/courses/?limit=100")
+    assert len(response.json()) == 22
+    assert sum(len(module["lessons"]) for module in response.json()[-1]["modules"]) == 12
+    large = await queries_for(client, "/api/v1/courses/?limit=100")
+
+    assert large == small
+    # The course page plus one batched load per level: categories, modules, lessons
+    assert large <= 4
+
+async def test_get_course_query_count_does_not_grow_with_the_tree(client):
+    seed(courses=1, modules=1, lessons=1)
+    seed(courses=1, modules=6, lessons=8)
+
+    small = await queries_for(client, "/api/v1/courses/1")
+    large = await queries_for(client, "/api/v1/courses/2")
+
+    assert large == small
+    assert large <= 4
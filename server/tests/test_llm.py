@@ -0,0 +1,51 @@
+import json
+from typing import List
+
+import httpx
+import pytest
+
+from app.services.llm import BoundedProvider, OpenAIProvider, ProviderError
+
+pytestmark = pytest.mark.anyio
+
+def stub_server(lines: List[str]) -> httpx.AsyncClient:
+    """
+    A client whose /chat/completions answers with the given SSE data lines
+    """
+    def handle(request: httpx.Request) -> httpx.Response:
+        body = "".join(f"data: {line}\n\n" for line in lines)
+        return httpx.Response(200, text=body, headers={"content-type": "text/event-stream"})
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handle), base_url="http://provider")
+
+def provider(lines: List[str]) -> BoundedProvider:
+    return BoundedProvider(
+        OpenAIProvider(stub_server(lines), api_key=None, model="test", temperature=0, max_tokens=10),
+        max_concurrency=1,
+        max_queue=1,
+        max_retries=2,
+        retry_base_seconds=0,
+    )
+
+def chunk(content: str) -> str:
+    return json.dumps({"choices": [{"delta": {"content": content}}]})
+
+async def collect(provider: BoundedProvider) -> str:
+    return "".join([part async for part in provider.stream([{"role": "user", "content": "Hi"}])])
+
+async def test_chunks_without_choices_are_skipped():
+    usage = json.dumps({"choices": [], "usage": {"total_tokens": 3}})
+    reply = await collect(provider([chunk("Hel"), usage, chunk("lo"), "[DONE]"]))
+
+    assert reply == "Hello"
+
+async def test_malformed_chunk_is_a_provider_error():
+    bounded = provider([chunk("Hel"), "{not json", "[DONE]"])
+
+    with pytest.raises(ProviderError):
+        await collect(bounded)
+    assert bounded.stats()["failed"] == 1
+
+async def test_non_object_chunk_is_a_provider_error():
+    with pytest.raises(ProviderError):
+        await collect(provider(["[1, 2]", "[DONE]"]))
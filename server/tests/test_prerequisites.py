@@ -0,0 +1,94 @@
+import asyncio
+import random
+from typing import Dict
+
+import pytest
+
+from app.db.session import SessionLocal
+from app.models.course import course_prerequisites
+from app.services.prerequisites import PrerequisiteCycle, PrerequisiteGraph, prerequisite_graph
+from tests.conftest import auth_headers, create_user, seed_courses
+
+def assert_consistent(graph: PrerequisiteGraph) -> None:
+    """
+    Prerequisites come first in the order, and each closure matches a
+    from-scratch build
+    """
+    position = {course_id: index for index, course_id in enumerate(graph.order)}
+    assert sorted(position) == sorted(graph._direct)
+    for course_id, prerequisites in graph._direct.items():
+        assert all(position[prerequisite] < position[course_id] for prerequisite in prerequisites)
+    rebuilt = PrerequisiteGraph.build(
+        graph._direct,
+        [(course_id, prerequisite) for course_id, prerequisites in graph._direct.items() for prerequisite in prerequisites],
+    )
+    for course_id in graph._direct:
+        assert set(graph.all_prerequisites(course_id)) == set(rebuilt.all_prerequisites(course_id))
+
+def test_incremental_writes_keep_order_and_closures_consistent():
+    rng = random.Random(22)
+    graph = PrerequisiteGraph.build(range(1, 31), [])
+    for _ in range(300):
+        course_id = rng.randint(1, 30)
+        prerequisites = rng.sample(range(1, 31), rng.randint(0, 3))
+        try:
+            graph.set_prerequisites(course_id, prerequisites)
+        except PrerequisiteCycle:
+            continue
+        assert_consistent(graph)
+
+def test_prerequisite_added_after_the_course_moves_it_and_its_dependents():
+    graph = PrerequisiteGraph.build([1, 2, 3], [(2, 1)])
+    graph.set_prerequisites(1, [3])
+
+    assert graph.order.index(3) < graph.order.index(1) < graph.order.index(2)
+    assert graph.all_prerequisites(2) == [3, 1]
+
+def test_stored_cycle_is_dropped_instead_of_failing_the_build(caplog):
+    graph = PrerequisiteGraph.build([1, 2, 3, 4], [(2, 1), (3, 2), (2, 3), (4, 3)])
+
+    assert len(graph.dropped_edges) == 1
+    assert graph.dropped_edges[0] in {(2, 3), (3, 2)}
+    assert "cycle" in caplog.text
+    assert_consistent(graph)
+    # 3 -> 2 closed the cycle, so 3 no longer needs anything
+    assert graph.unlocked([]) == [1, 3]
+
+@pytest.fixture
+def admin_headers() -> Dict[str, str]:
+    return auth_headers(create_user("admin@example.com", is_superuser=True))
+
+@pytest.fixture(autouse=True)
+def courses():
+    prerequisite_graph._graph = None
+    with SessionLocal() as db:
+        seed_courses(db, courses=3, modules=0, lessons=0)
+    yield
+    prerequisite_graph._graph = None
+
+@pytest.mark.anyio
+async def test_concurrent_writes_cannot_commit_a_cycle_together(client, admin_headers):
+    responses = await asyncio.gather(
+        client.put("/api/v1/courses/1/prerequisites", json={"prerequisite_ids": [2]}, headers=admin_headers),
+        client.put("/api/v1/courses/2/prerequisites", json={"prerequisite_ids": [1]}, headers=admin_headers),
+    )
+
+    assert sorted(response.status_code for response in responses) == [200, 409]
+    with SessionLocal() as db:
+        assert len(db.execute(course_prerequisites.select()).all()) == 1
+
+@pytest.mark.anyio
+async def test_reads_survive_a_cycle_already_in_the_database(client, user_headers):
+    with SessionLocal() as db:
+        db.execute(course_prerequisites.insert(), [
+            {"course_id": 1, "prerequisite_id": 2},
+            {"course_id": 2, "prerequisite_id": 1},
+        ])
+        db.commit()
+
+    unlocked = await client.get("/api/v1/courses/unlocked/me", headers=user_headers)
+    prerequisites = await client.get("/api/v1/courses/3/prerequisites")
+
+    assert unlocked.status_code == 200
+    assert 3 in unlocked.json()["unlocked_course_ids"]
+    assert prerequisites.status_code == 200
@@ -0,0 +1,284 @@
+import asyncio
+import os
+import subprocess
+import sys
+from datetime import datetime
+
+import pytest
+from sqlalchemy import func, select, update
+
+from app.db.session import AsyncSessionLocal, SessionLocal
+from app.models import Course, CourseProgress, Lesson, LessonCompletion, Module
+from app.repositories import progress as progress_repo
+from tests.conftest import auth_headers, create_user, seed_courses
+from tests.test_course_queries import queries_for
+
+pytestmark = pytest.mark.anyio
+
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+@pytest.fixture
+def course():
+    """
+    A course with three lessons: ``(course_id, [lesson ids])``
+    """
+    with SessionLocal() as db:
+        seed_courses(db, 1, 1, 3)
+        course_id = db.scalars(select(Course.id)).one()
+        lesson_ids = list(db.scalars(select(Lesson.id).order_by(Lesson.id)))
+    return course_id, lesson_ids
+
+def _progress(user_id: int, course_id: int) -> CourseProgress:
+    with SessionLocal() as db:
+        return db.scalars(
+            select(CourseProgress).where(
+                CourseProgress.user_id == user_id, CourseProgress.course_id == course_id
+            )
+        ).one()
+
+def _counters(progress: CourseProgress):
+    return progress.completed_lessons, progress.total_lessons, round(progress.percent, 1)
+
+async def test_completions_keep_the_counters_up_to_date(client, course):
+    course_id, lesson_ids = course
+    user = create_user()
+    headers = auth_headers(user)
+
+    assert (await client.post(f"/api/v1/courses/{course_id}/start", headers=headers)).status_code == 200
+    assert _counters(_progress(user.id, course_id)) == (0, 3, 0.0)
+
+    response = await client.post(f"/api/v1/courses/lessons/{lesson_ids[0]}/complete", headers=headers)
+    assert response.status_code == 200
+    progress = _progress(user.id, course_id)
+    assert _counters(progress) == (1, 3, 33.3)
+    assert progress.completed_at is None
+
+    response = await client.post(
+        "/api/v1/courses/lessons/complete",
+        json={"completions": [{"lesson_id": lesson_ids[1]}, {"lesson_id": lesson_ids[2]}]},
+        headers=headers,
+    )
+    assert response.status_code == 200
+    progress = _progress(user.id, course_id)
+    assert _counters(progress) == (3, 3, 100.0)
+    assert progress.completed_at is not None
+
+    # A repeat completion leaves the first completion time alone
+    completed_at = progress.completed_at
+    await client.post(f"/api/v1/courses/lessons/{lesson_ids[2]}/complete", headers=headers)
+    assert _progress(user.id, course_id).completed_at == completed_at
+
+async def test_backfill_recomputes_stale_counters(client, course):
+    course_id, lesson_ids = course
+    finished, halfway = create_user("finished@example.com"), create_user("halfway@example.com")
+    for user, lessons in ((finished, lesson_ids), (halfway, lesson_ids[:1])):
+        headers = auth_headers(user)
+        await client.post(f"/api/v1/courses/{course_id}/start", headers=headers)
+        await client.post(
+            "/api/v1/courses/lessons/complete",
+            json={"completions": [{"lesson_id": lesson_id} for lesson_id in lessons]},
+            headers=headers,
+        )
+    last_accessed = datetime(2026, 1, 1)
+    with SessionLocal() as db:
+        # As if written before the counters were maintained, then a lesson added
+        db.execute(
+            update(CourseProgress).values(
+                completed_lessons=0, total_lessons=0, percent=0.0, last_accessed=last_accessed
+            )
+        )
+        module = db.scalars(select(Module)).one()
+        db.add(Lesson(title="Added", content="More", order=4, module=module))
+        db.commit()
+
+    async with AsyncSessionLocal() as db:
+        assert await progress_repo.backfill_progress(db, batch_size=1) == 2
+
+    progress = _progress(finished.id, course_id)
+    assert _counters(progress) == (3, 4, 75.0)
+    # The course grew, so it is no longer complete
+    assert progress.completed_at is None
+    assert progress.last_accessed == last_accessed
+    assert _counters(_progress(halfway.id, course_id)) == (1, 4, 25.0)
+
+async def test_backfill_script_limits_itself_to_one_course(client):
+    with SessionLocal() as db:
+        seed_courses(db, 2, 1, 2)
+        course_ids = list(db.scalars(select(Course.id).order_by(Course.id)))
+    user = create_user()
+    for course_id in course_ids:
+        await client.post(f"/api/v1/courses/{course_id}/start", headers=auth_headers(user))
+    with SessionLocal() as db:
+        db.execute(update(CourseProgress).values(total_lessons=0))
+        db.commit()
+
+    result = subprocess.run(
+        [sys.executable, "scripts/backfill_course_progress.py", "--course-id", str(course_ids[0])],
+        cwd=SERVER_DIR,
+        env=os.environ.copy(),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert "Recomputed 1 course progress rows" in result.stdout
+    assert _progress(user.id, course_ids[0]).total_lessons == 2
+    assert _progress(user.id, course_ids[1]).total_lessons == 0
+
+async def test_batch_completion_reports_each_item(client):
+    with SessionLocal() as db:
+        seed_courses(db, 2, 1, 2)
+        started_id, other_id = db.scalars(select(Course.id).order_by(Course.id)).all()
+        started_lessons = list(db.scalars(
+            select(Lesson.id).join(Module).where(Module.course_id == started_id).order_by(Lesson.id)
+        ))
+        other_lesson = db.scalars(select(Lesson.id).join(Module).where(Module.course_id == other_id)).first()
+    user = create_user()
+    headers = auth_headers(user)
+    await client.post(f"/api/v1/courses/{started_id}/start", headers=headers)
+
+    body = {"completions": [
+        {"lesson_id": started_lessons[0], "completed_at": "2026-03-01T12:00:00+02:00"},
+        {"lesson_id": other_lesson},
+        {"lesson_id": 999_999},
+        {"lesson_id": started_lessons[1], "completed_at": "2999-01-01T00:00:00"},
+        {"lesson_id": started_lessons[0], "completed_at": "2026-03-02T00:00:00"},
+    ]}
+    before = datetime.utcnow()
+    response = await client.post("/api/v1/courses/lessons/complete", json=body, headers=headers)
+    after = datetime.utcnow()
+    assert response.status_code == 200
+    results = response.json()["results"]
+
+    assert [(result["lesson_id"], result["status"]) for result in results] == [
+        (started_lessons[0], "completed"),
+        (other_lesson, "course_not_started"),
+        (999_999, "lesson_not_found"),
+        (started_lessons[1], "completed"),
+        (started_lessons[0], "already_completed"),
+    ]
+    # Converted to naive UTC; the repeat's later time is not used
+    assert results[0]["completed_at"] == "2026-03-01T10:00:00"
+    assert results[4]["completion_id"] == results[0]["completion_id"]
+    # Times in the future are clamped to the time of upload
+    assert before <= datetime.fromisoformat(results[3]["completed_at"]) <= after
+
+    # Replaying the upload changes nothing
+    response = await client.post("/api/v1/courses/lessons/complete", json=body, headers=headers)
+    replay = response.json()["results"]
+    assert [result["status"] for result in replay] == [
+        "already_completed", "course_not_started", "lesson_not_found", "already_completed", "already_completed",
+    ]
+    assert [result["completion_id"] for result in replay[::3]] == [results[0]["completion_id"], results[3]["completion_id"]]
+    assert _counters(_progress(user.id, started_id)) == (2, 2, 100.0)
+
+async def test_progress_overview_shows_the_last_lesson_per_course(client):
+    with SessionLocal() as db:
+        seed_courses(db, 3, 1, 2)
+        course_ids = list(db.scalars(select(Course.id).order_by(Course.id)))
+        lessons = {
+            course_id: list(db.scalars(
+                select(Lesson.id).join(Module).where(Module.course_id == course_id).order_by(Lesson.id)
+            ))
+            for course_id in course_ids
+        }
+    user, other = create_user(), create_user("other@example.com")
+    headers = auth_headers(user)
+    for course_id in course_ids[:2]:
+        await client.post(f"/api/v1/courses/{course_id}/start", headers=headers)
+    # Finished in the opposite order to their ids: the latest time wins
+    await client.post(
+        "/api/v1/courses/lessons/complete",
+        json={"completions": [
+            {"lesson_id": lessons[course_ids[0]][0], "completed_at": "2026-05-02T09:00:00"},
+            {"lesson_id": lessons[course_ids[0]][1], "completed_at": "2026-05-01T09:00:00"},
+        ]},
+        headers=headers,
+    )
+    # Someone else's later completion of the same course is not theirs
+    await client.post(f"/api/v1/courses/{course_ids[0]}/start", headers=auth_headers(other))
+    await client.post(f"/api/v1/courses/lessons/{lessons[course_ids[0]][1]}/complete", headers=auth_headers(other))
+
+    response = await client.get("/api/v1/courses/progress/me", headers=headers)
+    assert response.status_code == 200
+    overview = {row["course_id"]: row for row in response.json()}
+    assert list(overview) == [course_ids[0], course_ids[1]]
+
+    first = overview[course_ids[0]]
+    assert (first["completed_lessons"], first["total_lessons"], first["percent"]) == (2, 2, 100.0)
+    assert first["last_lesson_id"] == lessons[course_ids[0]][0]
+    assert first["last_lesson_title"] == "Lesson 0"
+    assert first["last_lesson_completed_at"] == "2026-05-02T09:00:00"
+
+    second = overview[course_ids[1]]
+    assert (second["completed_lessons"], second["total_lessons"]) == (0, 2)
+    assert second["last_lesson_id"] is None
+
+async def test_progress_overview_query_count_does_not_grow_with_courses(client):
+    with SessionLocal() as db:
+        seed_courses(db, 12, 2, 3)
+        course_ids = list(db.scalars(select(Course.id).order_by(Course.id)))
+        lesson_ids = list(db.scalars(select(Lesson.id).order_by(Lesson.id)))
+    user = create_user()
+    headers = auth_headers(user)
+    await client.post(f"/api/v1/courses/{course_ids[0]}/start", headers=headers)
+    await client.post(f"/api/v1/courses/lessons/{lesson_ids[0]}/complete", headers=headers)
+    # The first request also loads the user into the cache
+    await client.get("/api/v1/courses/progress/me", headers=headers)
+    small = await queries_for(client, "/api/v1/courses/progress/me", headers)
+
+    for course_id in course_ids[1:]:
+        await client.post(f"/api/v1/courses/{course_id}/start", headers=headers)
+    await client.post(
+        "/api/v1/courses/lessons/complete",
+        json={"completions": [{"lesson_id": lesson_id} for lesson_id in lesson_ids]},
+        headers=headers,
+    )
+    response = await client.get("/api/v1/courses/progress/me", headers=headers)
+    assert len(response.json()) == 12
+    large = await queries_for(client, "/api/v1/courses/progress/me", headers)
+
+    assert large == small == 1
+
+async def _start(user_id: int, course_id: int) -> int:
+    async with AsyncSessionLocal() as db:
+        return (await progress_repo.start_course(db, user_id=user_id, course_id=course_id)).id
+
+async def _complete(user_id: int, lesson_id: int) -> int:
+    async with AsyncSessionLocal() as db:
+        return (await progress_repo.complete_lesson(db, user_id=user_id, lesson_id=lesson_id)).id
+
+async def test_start_and_complete_are_idempotent(course):
+    course_id, lesson_ids = course
+    user = create_user()
+
+    progress_id = await _start(user.id, course_id)
+    assert await _start(user.id, course_id) == progress_id
+    completion_id = await _complete(user.id, lesson_ids[0])
+    assert await _complete(user.id, lesson_ids[0]) == completion_id
+
+    with SessionLocal() as db:
+        assert db.scalar(select(func.count(CourseProgress.id))) == 1
+        assert db.scalar(select(func.count(LessonCompletion.id))) == 1
+    assert _counters(_progress(user.id, course_id)) == (1, 3, 33.3)
+
+async def test_concurrent_starts_and_completions_make_one_row(course):
+    course_id, lesson_ids = course
+    user = create_user()
+
+    progress_ids = await asyncio.gather(*(_start(user.id, course_id) for _ in range(8)))
+    assert len(set(progress_ids)) == 1
+    completion_ids = await asyncio.gather(*(_complete(user.id, lesson_ids[1]) for _ in range(8)))
+    assert len(set(completion_ids)) == 1
+
+    with SessionLocal() as db:
+        assert db.scalars(select(CourseProgress.id)).all() == [progress_ids[0]]
+        assert db.scalars(select(LessonCompletion.id)).all() == [completion_ids[0]]
+    assert _counters(_progress(user.id, course_id)) == (1, 3, 33.3)
+
+async def test_start_and_complete_report_what_is_missing(client, course):
+    course_id, lesson_ids = course
+    headers = auth_headers(create_user())
+    assert (await client.post("/api/v1/courses/999999/start", headers=headers)).status_code == 404
+    response = await client.post(f"/api/v1/courses/lessons/{lesson_ids[0]}/complete", headers=headers)
+    assert response.status_code == 400
+    assert (await client.post("/api/v1/courses/lessons/999999/complete", headers=headers)).status_code == 404
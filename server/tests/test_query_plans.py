@@ -0,0 +1,69 @@
+"""
+The hot progress, completion, course tree and message lookups must be
+served by their indexes, not table scans.
+
+SQLite plans come from EXPLAIN QUERY PLAN. On PostgreSQL, sequential
+scans are disabled for the connection, so tiny test tables don't mask a
+missing index.
+"""
+import pytest
+from sqlalchemy import select, text
+
+from app.db.session import engine, is_sqlite
+from app.models import ConversationSummary, CourseProgress, Lesson, LessonCompletion, Message, Module
+
+HOT_QUERIES = {
+    "start_course: progress by user and course": (
+        select(CourseProgress.id).where(CourseProgress.user_id == 1, CourseProgress.course_id == 1),
+        "ix_course_progresses_user_id_course_id",
+    ),
+    "complete_lesson: completion by user and lesson": (
+        select(LessonCompletion.id).where(LessonCompletion.user_id == 1, LessonCompletion.lesson_id == 1),
+        "ix_lesson_completions_user_id_lesson_id",
+    ),
+    "course tree: modules by course": (
+        select(Module.id).where(Module.course_id == 1),
+        "ix_modules_course_id",
+    ),
+    "course tree: lessons by module": (
+        select(Lesson.id).where(Lesson.module_id == 1),
+        "ix_lessons_module_id",
+    ),
+    "tutor: latest messages of a conversation": (
+        select(Message.id)
+        .where(Message.user_id == 1, Message.lesson_id == 1, Message.id > 0)
+        .order_by(Message.id.desc())
+        .limit(10),
+        "ix_messages_user_id_lesson_id_id",
+    ),
+    # Backed by a unique constraint, which SQLite names itself
+    "tutor: conversation summary": (
+        select(ConversationSummary.id).where(
+            ConversationSummary.user_id == 1, ConversationSummary.conversation_id == "lesson-1"
+        ),
+        None,
+    ),
+}
+
+def query_plan(query) -> str:
+    sql = str(query.compile(engine, compile_kwargs={"literal_binds": True}))
+    with engine.connect() as conn:
+        if not is_sqlite:
+            conn.execute(text("SET enable_seqscan = off"))
+        explain = "EXPLAIN QUERY PLAN " if is_sqlite else "EXPLAIN "
+        return "\n".join(str(row[-1]) for row in conn.execute(text(explain + sql)))
+
+def uses_index(plan: str) -> bool:
+    if is_sqlite:
+        return "USING INDEX" in plan or "USING COVERING INDEX" in plan
+    return "Index Scan" in plan or "Index Only Scan" in plan or "Bitmap Index Scan" in plan
+
+@pytest.mark.parametrize("name", list(HOT_QUERIES))
+def test_hot_query_uses_index(name: str) -> None:
+    query, index_name = HOT_QUERIES[name]
+    plan = query_plan(query)
+    assert uses_index(plan), plan
+    # The index also provides the order, so nothing is sorted
+    assert "TEMP B-TREE" not in plan and "Sort" not in plan, plan
+    if index_name is not None:
+        assert index_name in plan, plan
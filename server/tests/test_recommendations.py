@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from app.core.config import settings
+from app.main import app
+from app.services.recommendations import CompletionModel, recommend
+
+# Three two-lesson courses: lessons 0-1, 2-3 and 4-5
+LESSON_COURSES = [(0, 0), (1, 0), (2, 1), (3, 1), (4, 2), (5, 2)]
+
+def _model(completions):
+    model = CompletionModel()
+    model.add(
+        np.array([user_id for user_id, _ in completions], dtype=np.int64),
+        np.array([lesson_id for _, lesson_id in completions], dtype=np.int64),
+    )
+    return model
+
+def test_incremental_cooccurrence_matches_a_full_build():
+    rng = np.random.default_rng(7)
+    # Repeats included: a completion seen twice still counts once
+    user_ids = rng.integers(0, 60, size=2_000)
+    lesson_ids = rng.integers(0, 40, size=2_000)
+
+    incremental = CompletionModel()
+    for start in range(0, len(user_ids), 150):
+        changed = incremental.add(user_ids[start:start + 150], lesson_ids[start:start + 150])
+        assert changed.tolist() == sorted(set(user_ids[start:start + 150].tolist()))
+    full = CompletionModel()
+    full.add(user_ids, lesson_ids)
+
+    dense = np.zeros((60, 40), dtype=np.float32)
+    dense[user_ids, lesson_ids] = 1
+    assert (incremental.completions.toarray() == dense).all()
+    assert (incremental.cooccurrence.toarray() == full.cooccurrence.toarray()).all()
+    assert (full.cooccurrence.toarray() == dense.T @ dense).all()
+
+def test_recommend_ranks_courses_by_shared_completions():
+    model = _model([(0, 0), (0, 2), (1, 0), (1, 2), (1, 4), (2, 0)])
+    suggestions = dict(recommend(model, np.array([2]), LESSON_COURSES, started=[], k=5))
+    # Lesson 0 was completed alongside lesson 2 twice and lesson 4 once;
+    # course 0, which learner 2 is taking, is left out
+    assert [course_id for course_id, _ in suggestions[2]] == [1, 2]
+
+def test_recommend_leaves_out_started_courses():
+    model = _model([(0, 0), (0, 2), (1, 0), (1, 2), (1, 4), (2, 0)])
+    suggestions = dict(recommend(model, np.array([2]), LESSON_COURSES, started=[(2, 1)], k=5))
+    assert [course_id for course_id, _ in suggestions[2]] == [2]
+
+def test_recommend_keeps_the_top_k():
+    model = _model([(0, 0), (0, 2), (1, 0), (1, 2), (1, 4), (2, 0)])
+    suggestions = dict(recommend(model, np.array([0, 2]), LESSON_COURSES, started=[], k=1))
+    assert [course_id for course_id, _ in suggestions[2]] == [1]
+    assert [course_id for course_id, _ in suggestions[0]] == [2]
+
+@pytest.mark.anyio
+async def test_app_runs_the_refresher_only_when_enabled(monkeypatch):
+    from app.services.recommendations import recommendation_refresher
+
+    async with app.router.lifespan_context(app):
+        assert recommendation_refresher._task is None
+
+    monkeypatch.setattr(settings, "RECOMMENDATION_REFRESH_SECONDS", 3600)
+    monkeypatch.setattr(recommendation_refresher, "interval_seconds", 3600)
+    async with app.router.lifespan_context(app):
+        assert recommendation_refresher._task is not None
+    assert recommendation_refresher._task is None
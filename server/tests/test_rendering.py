@@ -0,0 +1,93 @@
+import pytest
+from sqlalchemy import insert, select, update
+
+from app.core.rendering import content_hash, render_html
+from app.db.session import SessionLocal
+from app.models import Lesson, Module
+from tests.conftest import seed_courses
+
+pytestmark = pytest.mark.anyio
+
+def test_scripts_and_event_handlers_are_stripped():
+    html = render_html(
+        'Hello <script>alert("x")</script>\n\n<img src="/a.png" onerror="alert(1)">'
+    )
+    assert "<script" not in html
+    assert "onerror" not in html
+    assert '<img src="/a.png">' in html
+
+def test_javascript_links_lose_their_href():
+    html = render_html("[click](javascript:alert(1)) and <a href=\"javascript:alert(2)\">me</a>")
+    assert "javascript:" not in html
+    assert "<a>click</a>" in html
+
+def test_fenced_code_is_highlighted():
+    html = render_html("""
+        Some code:
+
+        ```python
+        def greet():
+            return "hi"
+        ```
+    """)
+    assert '<div class="highlight">' in html
+    assert '<span class="k">def</span>' in html
+
+def test_lists_right_under_a_paragraph_are_lists():
+    assert "<li>one</li>" in render_html("Steps:\n- one\n- two")
+
+def _lesson() -> Lesson:
+    with SessionLocal() as db:
+        seed_courses(db, 1, 1, 1)
+        return db.scalars(select(Lesson)).one()
+
+def _stored(lesson_id: int):
+    with SessionLocal() as db:
+        return db.execute(
+            select(Lesson.content_html, Lesson.content_hash).where(Lesson.id == lesson_id)
+        ).one()
+
+def _set_html(lesson_id: int, html: str) -> None:
+    with SessionLocal() as db:
+        db.execute(update(Lesson).where(Lesson.id == lesson_id).values(content_html=html))
+        db.commit()
+
+def test_orm_writes_render_on_insert():
+    lesson = _lesson()
+    assert _stored(lesson.id) == (render_html(lesson.content), content_hash(lesson.content))
+
+def test_orm_writes_rerender_only_when_content_changes():
+    lesson = _lesson()
+    _set_html(lesson.id, "<p>stored</p>")
+
+    with SessionLocal() as db:
+        stored = db.get(Lesson, lesson.id)
+        stored.title = "Renamed"
+        stored.content = lesson.content
+        db.commit()
+    assert _stored(lesson.id).content_html == "<p>stored</p>"
+
+    with SessionLocal() as db:
+        db.get(Lesson, lesson.id).content = "New **content**"
+        db.commit()
+    assert _stored(lesson.id) == ("<p>New <strong>content</strong></p>", content_hash("New **content**"))
+
+async def test_rows_written_without_the_orm_render_on_first_read(client):
+    with SessionLocal() as db:
+        seed_courses(db, 1, 1, 0)
+        module_id = db.scalars(select(Module.id)).one()
+        lesson_id = db.execute(
+            insert(Lesson).values(title="Imported", content="# Imported", order=1, module_id=module_id)
+        ).inserted_primary_key[0]
+        db.commit()
+    assert _stored(lesson_id) == (None, None)
+
+    response = await client.get(f"/api/v1/courses/lessons/{lesson_id}")
+    assert response.status_code == 200
+    assert response.json()["content_html"] == "<h1>Imported</h1>"
+    assert _stored(lesson_id) == ("<h1>Imported</h1>", content_hash("# Imported"))
+
+    # Later reads serve the stored HTML
+    _set_html(lesson_id, "<h1>Stored</h1>")
+    response = await client.get(f"/api/v1/courses/lessons/{lesson_id}")
+    assert response.json()["content_html"] == "<h1>Stored</h1>"
@@ -0,0 +1,163 @@
+import importlib.util
+import os
+import subprocess
+import sys
+import tempfile
+
+import pytest
+from sqlalchemy import create_engine, delete, text, update
+
+from app.db.search import weighted_tsvector
+from app.db.session import SessionLocal, engine
+from app.models import Course, Lesson, Module
+
+pytestmark = pytest.mark.anyio
+
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SEARCH_MIGRATION = os.path.join(SERVER_DIR, "alembic", "versions", "20261017_search.py")
+
+def add_course(title: str, description: str = "", lessons=()) -> Course:
+    """
+    A course with one module holding ``(title, content)`` lessons
+    """
+    with SessionLocal() as db:
+        course = Course(title=title, description=description, level="beginner", estimated_time=10)
+        module = Module(title="Unit 1", order=1, course=course)
+        for order, (lesson_title, content) in enumerate(lessons, start=1):
+            Lesson(title=lesson_title, content=content, order=order, module=module)
+        db.add(course)
+        db.commit()
+        db.refresh(course)
+        return course
+
+async def search(client, q: str, **params):
+    response = await client.get("/api/v1/courses/search", params={"q": q, **params})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+def titles(hits):
+    return [(hit["kind"], hit["title"]) for hit in hits]
+
+async def test_index_follows_inserts_updates_and_deletes(client):
+    course = add_course("Photosynthesis", "How plants eat light", [("Chlorophyll", "The green pigment")])
+    assert titles(await search(client, "chlorophyll")) == [("lesson", "Chlorophyll")]
+    assert titles(await search(client, "plants")) == [("course", "Photosynthesis")]
+
+    with SessionLocal() as db:
+        db.execute(update(Course).where(Course.id == course.id).values(title="Plant energy"))
+        db.execute(update(Lesson).values(content="The pigment that absorbs red light"))
+        db.commit()
+    assert await search(client, "photosynthesis") == []
+    assert titles(await search(client, "energy")) == [("course", "Plant energy")]
+    assert await search(client, "green") == []
+    assert titles(await search(client, "absorbs")) == [("lesson", "Chlorophyll")]
+
+    other = add_course("Botany")
+    with SessionLocal() as db:
+        db.execute(update(Module).values(course_id=other.id))
+        db.commit()
+    [hit] = await search(client, "chlorophyll")
+    assert (hit["course_id"], hit["course_title"]) == (other.id, "Botany")
+
+    with SessionLocal() as db:
+        db.execute(delete(Lesson))
+        db.commit()
+    assert await search(client, "chlorophyll") == []
+
+async def test_title_matches_rank_above_body_matches(client):
+    add_course("Geology", lessons=[
+        ("Rocks", "Basalt forms when lava from a volcano cools"),
+        ("Volcanoes", "How mountains form"),
+    ])
+    hits = await search(client, "volcano")
+    assert titles(hits) == [("lesson", "Volcanoes"), ("lesson", "Rocks")]
+    assert hits[0]["rank"] > hits[1]["rank"]
+
+async def test_every_word_must_match_and_the_last_is_a_prefix(client):
+    add_course("Geology", lessons=[("Volcanoes", "Lava and ash"), ("Glaciers", "Ice and ash")])
+    assert titles(await search(client, "volc")) == [("lesson", "Volcanoes")]
+    assert titles(await search(client, "ash lav")) == [("lesson", "Volcanoes")]
+    assert titles(await search(client, "ash", kind="course")) == []
+
+@pytest.mark.parametrize("q", [
+    '"volcanoes', 'volcanoes"', "volcanoes'", "volcanoes*", "volcanoes OR", "-volcanoes",
+    "title:volcanoes", "NEAR(volcanoes)", "(volcanoes", "volcanoes AND NOT",
+])
+async def test_query_syntax_is_read_as_words(client, q):
+    add_course("Geology", lessons=[("Volcanoes", "Lava and ash")])
+    # Operators become ordinary words that must match, never FTS5 syntax errors
+    hits = await search(client, q)
+    assert all(hit["title"] == "Volcanoes" for hit in hits)
+    if q.strip("\"'*-(") == "volcanoes":
+        assert titles(hits) == [("lesson", "Volcanoes")]
+
+async def test_punctuation_only_queries_find_nothing(client):
+    add_course("Geology", lessons=[("Volcanoes", "Lava and ash")])
+    assert await search(client, '"*') == []
+
+async def test_snippets_escape_the_text_and_mark_matches(client):
+    add_course("Web", lessons=[("Scripts", "Never paste <script>alert(1)</script> into a volcano page")])
+    [hit] = await search(client, "volcano")
+    assert "<mark>volcano</mark>" in hit["snippet"]
+    assert "<script>" not in hit["snippet"]
+    assert "&lt;script&gt;" in hit["snippet"]
+
+def _load_search_migration():
+    spec = importlib.util.spec_from_file_location("search_migration", SEARCH_MIGRATION)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def test_migration_tsvector_matches_the_models():
+    migration = _load_search_migration()
+    for _, title, body, *_ in migration.SEARCHABLE:
+        assert migration.weighted_tsvector(title, body) == weighted_tsvector(title, body)
+
+# Run against both schemas; raw SQL so only the triggers keep the index in sync
+SEARCH_WRITES = [
+    "INSERT INTO courses (id, title, description) VALUES (1, 'Geology', 'Rocks and minerals')",
+    "INSERT INTO courses (id, title, description) VALUES (2, 'Botany', NULL)",
+    "INSERT INTO modules (id, title, description, course_id, \"order\") VALUES (1, 'Volcanoes', 'Lava', 1, 1)",
+    "INSERT INTO lessons (id, title, content, module_id, \"order\") VALUES (1, 'Basalt', 'Cooled lava', 1, 1)",
+    "INSERT INTO lessons (id, title, content, module_id, \"order\") VALUES (2, 'Ash', NULL, 1, 2)",
+    "UPDATE courses SET description = 'Rocks' WHERE id = 1",
+    "UPDATE lessons SET content = 'Fine particles' WHERE id = 2",
+    "UPDATE modules SET course_id = 2 WHERE id = 1",
+    "UPDATE lessons SET title = 'Basalt columns' WHERE id = 1",
+    "DELETE FROM lessons WHERE id = 2",
+    "DELETE FROM courses WHERE id = 1",
+]
+
+def _index_after_writes(bind) -> list:
+    with bind.begin() as connection:
+        for statement in SEARCH_WRITES:
+            connection.execute(text(statement))
+        return [
+            tuple(row)
+            for row in connection.execute(text(
+                "SELECT rowid, title, body, kind, entity_id, course_id FROM search_index ORDER BY rowid"
+            ))
+        ]
+
+def test_migrated_and_model_built_databases_index_the_same_text():
+    with tempfile.TemporaryDirectory() as directory:
+        url = f"sqlite:///{directory}/migrated.db"
+        subprocess.run(
+            [sys.executable, "-m", "alembic", "upgrade", "head"],
+            cwd=SERVER_DIR,
+            env={**os.environ, "SQLALCHEMY_DATABASE_URI": url},
+            capture_output=True,
+            check=True,
+        )
+        migrated = create_engine(url)
+        try:
+            expected = _index_after_writes(migrated)
+        finally:
+            migrated.dispose()
+
+    assert _index_after_writes(engine) == expected
+    assert expected == [
+        (6, "Volcanoes", "Lava", "module", 1, 2),
+        (7, "Basalt columns", "Cooled lava", "lesson", 1, 2),
+        (9, "Botany", "", "course", 2, 2),
+    ]
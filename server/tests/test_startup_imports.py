@@ -0,0 +1,33 @@
+import json
+import os
+import subprocess
+import sys
+from typing import Set
+
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def modules_after_importing_app() -> Set[str]:
+    # A fresh interpreter: this one has loaded everything the other tests used
+    result = subprocess.run(
+        [sys.executable, "-c", "import json, sys, app.main; print(json.dumps(sorted(sys.modules)))"],
+        cwd=SERVER_DIR,
+        env=os.environ.copy(),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return set(json.loads(result.stdout.splitlines()[-1]))
+
+def test_app_starts_without_the_recommendation_stack():
+    # Only the refresher needs them, and it is off by default
+    modules = modules_after_importing_app()
+    assert "numpy" not in modules
+    assert "scipy" not in modules
+
+def test_app_starts_without_the_rendering_stack():
+    modules = modules_after_importing_app()
+    assert "markdown" not in modules
+    assert "bleach" not in modules
+    # httpx tries to import its optional command line, which loads Pygments'
+    # lexers even when the attempt fails; only rendering loads a formatter
+    assert "pygments.formatters" not in modules
@@ -0,0 +1,204 @@
+import json
+from typing import AsyncIterator, Dict, List, Optional
+
+import pytest
+from sqlalchemy import select
+
+from app.db.session import SessionLocal
+from app.main import app
+from app.models import Message, TutorLog
+from app.services.explain_cache import explanation_cache
+from app.services.llm import ChatMessages, ProviderError, get_llm_provider
+from app.services.tutor_log import tutor_log_buffer
+from tests.conftest import seed_courses
+
+pytestmark = pytest.mark.anyio
+
+# A concept defined by the web development sample course
+CONCEPT_ID = "html_basics"
+
+class StubProvider:
+    """
+    Replies with fixed chunks and records every prompt; with ``fail_after``
+    it raises once that many chunks have been sent
+    """
+
+    def __init__(self, chunks: List[str], fail_after: Optional[int] = None) -> None:
+        self.chunks = chunks
+        self.fail_after = fail_after
+        self.prompts: List[ChatMessages] = []
+
+    async def stream(self, messages: ChatMessages) -> AsyncIterator[str]:
+        self.prompts.append(messages)
+        for index, chunk in enumerate(self.chunks):
+            if index == self.fail_after:
+                raise ProviderError("Connection reset by the provider")
+            yield chunk
+
+@pytest.fixture
+def provider():
+    stub = StubProvider(["Variables ", "hold ", "values."])
+    app.dependency_overrides[get_llm_provider] = lambda: stub
+    yield stub
+    app.dependency_overrides.pop(get_llm_provider, None)
+
+@pytest.fixture(autouse=True)
+async def tutor_state():
+    explanation_cache.local.clear()
+    yield
+    # Write out what the endpoints logged while this test's schema exists
+    await tutor_log_buffer.stop()
+
+@pytest.fixture
+def lesson_id() -> int:
+    with SessionLocal() as db:
+        seed_courses(db, courses=1, modules=1, lessons=1)
+    return 1
+
+def sse_events(body: str) -> List[Dict]:
+    events = []
+    for block in body.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.split("\n"))
+        events.append({"event": fields.get("event", "message"), "data": json.loads(fields["data"])})
+    return events
+
+def stored_messages() -> List[Message]:
+    with SessionLocal() as db:
+        return list(db.scalars(select(Message).order_by(Message.id)))
+
+async def test_chat_streams_chunks_as_events_then_saves_the_exchange(client, user_headers, provider, lesson_id):
+    response = await client.post(
+        "/api/v1/tutor/chat",
+        json={"message": "What is a variable?", "context": {"lessonId": lesson_id}},
+        headers={**user_headers, "Accept": "text/event-stream"},
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = sse_events(response.text)
+    assert [event["data"]["content"] for event in events[:-1]] == provider.chunks
+    assert events[-1]["event"] == "done"
+    assert events[-1]["data"]["conversation_id"] == f"lesson-{lesson_id}"
+
+    messages = stored_messages()
+    assert [(message.role, message.content) for message in messages] == [
+        ("user", "What is a variable?"),
+        ("assistant", "Variables hold values."),
+    ]
+    assert events[-1]["data"]["message_id"] == messages[-1].id
+
+async def test_chat_without_event_stream_answers_with_json(client, user_headers, provider):
+    response = await client.post("/api/v1/tutor/chat", json={"message": "Hello"}, headers=user_headers)
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "message": "Variables hold values.",
+        "conversation_id": "general",
+        "suggestions": [],
+    }
+    assert provider.prompts[0][-1] == {"role": "user", "content": "Hello"}
+
+async def test_chat_sends_earlier_turns_with_the_question(client, user_headers, provider, lesson_id):
+    chat = {"message": "First question", "context": {"lessonId": lesson_id}}
+    await client.post("/api/v1/tutor/chat", json=chat, headers=user_headers)
+    await client.post("/api/v1/tutor/chat", json={**chat, "message": "Second question"}, headers=user_headers)
+
+    turns = [message for message in provider.prompts[1] if message["role"] != "system"]
+    assert turns == [
+        {"role": "user", "content": "First question"},
+        {"role": "assistant", "content": "Variables hold values."},
+        {"role": "user", "content": "Second question"},
+    ]
+
+async def test_chat_about_an_unknown_lesson_is_rejected_before_the_provider_is_called(
+    client, user_headers, provider
+):
+    response = await client.post(
+        "/api/v1/tutor/chat",
+        json={"message": "Hello", "context": {"lessonId": 999}},
+        headers={**user_headers, "Accept": "text/event-stream"},
+    )
+
+    assert response.status_code == 404
+    assert provider.prompts == []
+    assert stored_messages() == []
+
+async def test_provider_failure_mid_stream_ends_with_an_error_event(client, user_headers, provider, lesson_id):
+    provider.fail_after = 2
+    response = await client.post(
+        "/api/v1/tutor/chat",
+        json={"message": "What is a loop?", "context": {"lessonId": lesson_id}},
+        headers={**user_headers, "Accept": "text/event-stream"},
+    )
+
+    events = sse_events(response.text)
+    assert [event["event"] for event in events] == ["message", "message", "error"]
+    assert "unavailable" in events[-1]["data"]["detail"]
+    # What was said before the failure is kept
+    assert [message.content for message in stored_messages()] == ["What is a loop?", "Variables hold "]
+
+async def test_provider_failure_without_streaming_is_a_503(client, user_headers, provider):
+    provider.fail_after = 0
+    response = await client.post("/api/v1/tutor/chat", json={"message": "Hello"}, headers=user_headers)
+
+    assert response.status_code == 503
+    assert stored_messages() == []
+
+async def test_conversation_history_is_returned_oldest_first(client, user_headers, provider, lesson_id):
+    for question in ("One", "Two"):
+        await client.post(
+            "/api/v1/tutor/chat",
+            json={"message": question, "context": {"lessonId": lesson_id}},
+            headers=user_headers,
+        )
+
+    response = await client.get(f"/api/v1/tutor/conversations/lesson-{lesson_id}", headers=user_headers)
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["id"] == f"lesson-{lesson_id}"
+    assert [(message["role"], message["content"]) for message in body["messages"]] == [
+        ("user", "One"),
+        ("assistant", "Variables hold values."),
+        ("user", "Two"),
+        ("assistant", "Variables hold values."),
+    ]
+    response = await client.get("/api/v1/tutor/conversations/lesson-x", headers=user_headers)
+    assert response.status_code == 404
+
+async def test_explain_answers_once_then_from_the_cache(client, user_headers, provider):
+    request = {"conceptId": CONCEPT_ID, "style": "example"}
+    first = await client.post("/api/v1/tutor/explain", json=request, headers=user_headers)
+    second = await client.post("/api/v1/tutor/explain", json=request, headers=user_headers)
+
+    assert first.status_code == second.status_code == 200
+    assert first.json()["message"] == second.json()["message"] == "Variables hold values."
+    assert "X-Cache" not in first.headers
+    assert second.headers["X-Cache"] == "HIT"
+    assert len(provider.prompts) == 1
+    # Explanations are not part of the conversation history
+    assert stored_messages() == []
+
+async def test_explain_unknown_concept_is_a_404(client, user_headers, provider):
+    response = await client.post("/api/v1/tutor/explain", json={"conceptId": "nope"}, headers=user_headers)
+
+    assert response.status_code == 404
+    assert provider.prompts == []
+
+async def test_feedback_is_logged_with_a_rating(client, user_headers, lesson_id):
+    response = await client.post(
+        "/api/v1/tutor/feedback",
+        json={"lessonId": lesson_id, "feedback": {"understanding": "clear", "pacing": "good", "comments": "Thanks"}},
+        headers=user_headers,
+    )
+
+    assert response.status_code == 204
+    await tutor_log_buffer.stop()
+    with SessionLocal() as db:
+        log = db.scalars(select(TutorLog).where(TutorLog.kind == "feedback")).one()
+    assert (log.session_id, log.feedback_rating, log.feedback_comment) == (f"lesson-{lesson_id}", 3, "Thanks")
+
+async def test_tutor_requires_authentication(client, provider):
+    response = await client.post("/api/v1/tutor/chat", json={"message": "Hello"})
+
+    assert response.status_code == 401